@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Account Worker
+One long-running process serving transfer jobs for many users
+
+Each account has its own directory under ACCOUNTS_DIR (default accounts/)
+holding its credentials (youtube_token.enc, spotify_token.enc and
+optionally headers_auth.enc), journals, sync state, review queue and
+metrics report:
+
+    accounts/alice/account.json     {"quota_budget": 3000, "search_workers": 2}
+
+- AccountContext: an account's settings and quota budget, plus one pooled
+  SpotifyToYouTubeTransfer (clients, limiters, search workers) created on
+  the account's first job, reused by every later one and closed after
+  ACCOUNT_IDLE_TTL seconds without jobs
+- AccountWorker: job queue drained by ACCOUNT_WORKERS threads; accounts
+  take turns (round robin) and run one job at a time, so a user with many
+  queued jobs can't starve the others
+
+All accounts use the same Google Cloud project, so they share its daily
+quota (QuotaLedger) and the search cache. quota_budget caps what one
+account may spend of it per day; a job that finds its account's budget
+(or the project quota) exhausted waits for the Pacific-time reset, and a
+job stopped by the quota is re-queued for then (it resumes from its
+journals).
+
+Jobs are batch job specs (see batch_jobs.py) with an "account" field and
+an optional "id", one JSON object per line:
+
+    {"account": "alice", "playlists": ["37i9dQZF1DXcBWIGoYBM5M"]}
+    {"account": "bob", "id": "bob-sync", "mode": "sync", "playlists": "all"}
+
+    python3 account_worker.py --enroll alice          # authorize an account
+    python3 account_worker.py --jobs jobs.jsonl
+    tail -f queue.jsonl | python3 account_worker.py --jobs -
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import queue
+import argparse
+import threading
+from collections import defaultdict, deque
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Optional, Tuple
+
+import event_log
+from batch_jobs import BatchJob, JobError, EXIT_ERROR, EXIT_QUOTA
+from console_output import label, prefixed_stdout
+from quota_scheduler import QuotaLedger, ADD_COST
+from search_cache import SearchCache
+from spotify_to_youtube import SpotifyToYouTubeTransfer
+
+DEFAULT_ACCOUNTS_DIR = 'accounts'
+DEFAULT_WORKERS = 2
+DEFAULT_IDLE_TTL = 1800  # seconds an unused account keeps its clients
+ACCOUNT_ID = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_.-]*$')
+ACCOUNT_FIELDS = ('quota_budget', 'search_workers', 'search_rate')
+
+
+def accounts_dir(root: str = None) -> Path:
+    return Path(root or os.getenv('ACCOUNTS_DIR', DEFAULT_ACCOUNTS_DIR))
+
+
+def check_account_id(account_id: Any) -> str:
+    """Account IDs are directory names: letters, digits, '_', '.', '-'"""
+    if not isinstance(account_id, str) or not ACCOUNT_ID.match(account_id):
+        raise JobError(f"invalid account ID: {account_id!r}")
+    return account_id
+
+
+class AccountContext:
+    """Settings, quota budget and pooled transfer of one account"""
+
+    def __init__(self, account_id: Optional[str], root: Path, project_ledger: QuotaLedger,
+                 search_cache: SearchCache):
+        """account_id None: the default account (the usual files in the working directory)"""
+        self.id = account_id
+        self.directory = None
+        self.settings = {}
+        self.ledger = project_ledger
+
+        if account_id is not None:
+            self.directory = root / check_account_id(account_id)
+            if not self.directory.is_dir():
+                raise JobError(f"unknown account {account_id!r} "
+                               f"(run: python3 account_worker.py --enroll {account_id})")
+
+            settings_file = self.directory / 'account.json'
+            self.settings = json.loads(settings_file.read_text()) if settings_file.exists() else {}
+            unknown = set(self.settings) - set(ACCOUNT_FIELDS)
+            if unknown:
+                raise JobError(f"unknown fields {sorted(unknown)} in {settings_file}")
+
+            self.ledger = QuotaLedger(
+                self.directory / 'quota_ledger.json',
+                daily_limit=self.settings.get('quota_budget') or project_ledger.daily_limit,
+                parent=project_ledger
+            )
+        self.search_cache = search_cache
+        self.lock = threading.Lock()  # Held while a job runs
+        self.last_used = time.monotonic()
+        self._transfer: Optional[SpotifyToYouTubeTransfer] = None
+
+    @property
+    def transfer(self) -> SpotifyToYouTubeTransfer:
+        """The account's transfer engine, created on first use and then reused"""
+        if self._transfer is None:
+            self._transfer = SpotifyToYouTubeTransfer(
+                search_workers=self.settings.get('search_workers'),
+                search_rate=self.settings.get('search_rate'),
+                quota_ledger=self.ledger,
+                data_dir=str(self.directory) if self.directory else None,
+                search_cache=self.search_cache
+            )
+        return self._transfer
+
+    @property
+    def name(self) -> str:
+        return self.id or 'default'
+
+    @property
+    def pooled(self) -> bool:
+        return self._transfer is not None
+
+    def close(self) -> None:
+        """Release the pooled clients and search workers"""
+        if self._transfer is not None:
+            self._transfer.close()
+            self._transfer = None
+
+
+class AccountWorker:
+    """Job queue for many accounts, drained by a fixed set of threads"""
+
+    def __init__(self, root: str = None, workers: int = None, idle_ttl: float = None):
+        self.root = accounts_dir(root)
+        self.workers = workers or int(os.getenv('ACCOUNT_WORKERS', DEFAULT_WORKERS))
+        self.idle_ttl = float(os.getenv('ACCOUNT_IDLE_TTL', DEFAULT_IDLE_TTL)
+                              if idle_ttl is None else idle_ttl)
+        self.project_ledger = QuotaLedger()
+        self.search_cache = SearchCache()
+        self.accounts: Dict[str, AccountContext] = {}
+        self.results: Dict[str, int] = {}  # job ID -> exit code
+
+        # One entry per account in _ready while it has jobs and none running;
+        # requeued at the back after each job, so accounts take turns
+        self._pending: Dict[str, Deque[Tuple[str, BatchJob]]] = defaultdict(deque)
+        self._active = set()  # accounts in _ready, running or deferred
+        self._ready: queue.Queue = queue.Queue()
+        self._outstanding = 0
+        self._lock = threading.Condition()
+        self._threads = []
+        self._stopping = threading.Event()
+        self._job_count = 0
+
+    def account(self, account_id: Optional[str]) -> AccountContext:
+        """Context of an account (loaded on first use; None: the default account)"""
+        with self._lock:
+            context = self.accounts.get(account_id)
+            if context is None:
+                context = AccountContext(account_id, self.root, self.project_ledger,
+                                         self.search_cache)
+                self.accounts[account_id] = context
+            return context
+
+    def submit(self, account_id: str, job: BatchJob, job_id: str = None) -> str:
+        """Queue a job for an account; returns its job ID"""
+        self.account(account_id)  # Fail fast on unknown accounts
+        with self._lock:
+            self._job_count += 1
+            job_id = job_id or f"{account_id}-{self._job_count}"
+            job.path = job.path or job_id
+            self._pending[account_id].append((job_id, job))
+            self._outstanding += 1
+            if account_id not in self._active:
+                self._active.add(account_id)
+                self._ready.put(account_id)
+        print(f"📥 Job {job_id} queued for {account_id}")
+        return job_id
+
+    def submit_spec(self, spec: Dict[str, Any]) -> str:
+        """Queue a job line: a batch job spec plus "account" and optional "id" """
+        if not isinstance(spec, dict):
+            raise JobError("job must be an object")
+        spec = dict(spec)
+        account_id = check_account_id(spec.pop('account', None))
+        job_id = spec.pop('id', None)
+        return self.submit(account_id, BatchJob(spec, path=job_id), job_id)
+
+    def start(self) -> None:
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f'account-worker-{index}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def join(self) -> None:
+        """Wait until every submitted job (including deferred ones) has finished"""
+        with self._lock:
+            while self._outstanding:
+                self._lock.wait()
+
+    def stop(self) -> None:
+        """Stop the threads after their current job and release every account"""
+        self._stopping.set()
+        for _ in self._threads:
+            self._ready.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        for context in list(self.accounts.values()):
+            context.close()
+        self.project_ledger.save()
+
+    def _work(self) -> None:
+        while True:
+            try:
+                account_id = self._ready.get(timeout=min(60.0, self.idle_ttl or 60.0))
+            except queue.Empty:
+                self._evict_idle()
+                continue
+            if account_id is None or self._stopping.is_set():
+                return
+
+            context = self.accounts[account_id]
+            with self._lock:
+                job_id, job = self._pending[account_id][0]
+
+            wait = self._quota_wait(context)
+            if wait:
+                self._defer(account_id, wait, f"quota budget exhausted, job {job_id} waits")
+                continue
+
+            code = self._run_job(context, job_id, job)
+            if code == EXIT_QUOTA:
+                # Re-running resumes from the journals once the quota is back
+                self._defer(account_id, QuotaLedger.seconds_until_reset(),
+                            f"job {job_id} stopped by the quota, resumes")
+                continue
+
+            with self._lock:
+                self._pending[account_id].popleft()
+                self.results[job_id] = code
+                self._outstanding -= 1
+                if self._pending[account_id]:
+                    self._ready.put(account_id)
+                else:
+                    self._active.discard(account_id)
+                self._lock.notify_all()
+
+    @staticmethod
+    def _quota_wait(context: AccountContext) -> float:
+        """Seconds until the account may spend quota again (0: now)"""
+        if context.ledger.remaining() >= ADD_COST:
+            return 0.0
+        return QuotaLedger.seconds_until_reset()
+
+    def _defer(self, account_id: str, delay: float, reason: str) -> None:
+        """Put the account back in turn after delay seconds (its job stays first)"""
+        hours, minutes = divmod(int(delay) // 60, 60)
+        print(f"⏸️  [{account_id}] {reason} after the quota reset (in {hours}h{minutes:02d}m)")
+        timer = threading.Timer(delay + 60, self._ready.put, args=(account_id,))
+        timer.daemon = True
+        timer.start()
+
+    def _run_job(self, context: AccountContext, job_id: str, job: BatchJob) -> int:
+        """Run one job on the account's pooled transfer; returns its exit code"""
+        started = time.perf_counter()
+        context.last_used = time.monotonic()
+        with context.lock, label(context.name):
+            try:
+                transfer = context.transfer
+                transfer.metrics.reset()
+                if job.parallel:
+                    transfer.playlist_workers = job.parallel
+                code = job.run(transfer)
+            except SystemExit as e:
+                # Missing or revoked credentials: drop the clients, fail the job
+                print(f"❌ Job {job_id}: account credentials unavailable")
+                context.close()
+                code = e.code if isinstance(e.code, int) and e.code else EXIT_ERROR
+            except Exception as e:
+                print(f"❌ Job {job_id} failed: {e}")
+                code = EXIT_ERROR
+        context.last_used = time.monotonic()
+
+        event_log.emit('job_done', job=job_id, account=context.id, exit_code=code,
+                       elapsed_s=round(time.perf_counter() - started, 2),
+                       budget_remaining=context.ledger.remaining())
+        return code
+
+    def _evict_idle(self) -> None:
+        """Close the clients of accounts without jobs for idle_ttl seconds"""
+        if not self.idle_ttl:
+            return
+        now = time.monotonic()
+        with self._lock:
+            idle = [context for account_id, context in self.accounts.items()
+                    if account_id not in self._active and context.pooled
+                    and now - context.last_used > self.idle_ttl]
+        for context in idle:
+            if context.lock.acquire(blocking=False):  # Not if a job just started
+                try:
+                    print(f"💤 Releasing idle account {context.name}")
+                    context.close()
+                finally:
+                    context.lock.release()
+
+    def print_summary(self) -> None:
+        print(f"\n📊 Account worker: {len(self.results)} jobs")
+        for job_id, code in self.results.items():
+            print(f"   {'✅' if code == 0 else '⚠️ '} {job_id}: exit {code}")
+
+
+def read_jobs(worker: AccountWorker, lines: Iterable[str]) -> int:
+    """Queue job lines as they arrive; returns the number of rejected lines"""
+    rejected = 0
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            worker.submit_spec(json.loads(line))
+        except (JobError, ValueError, OSError) as e:
+            print(f"❌ Job line {number} rejected: {e}")
+            rejected += 1
+    return rejected
+
+
+def enroll(account_id: str, root: str = None) -> None:
+    """Authorize YouTube and Spotify for an account (interactive, once per account)"""
+    from spotipy.oauth2 import SpotifyOAuth
+    import setup_youtube_oauth
+    from security_manager import spotify_cache_handler
+    from spotify_to_youtube import SPOTIFY_SCOPE
+
+    directory = accounts_dir(root) / check_account_id(account_id)
+    directory.mkdir(parents=True, exist_ok=True)
+    os.chmod(directory, 0o700)
+
+    print(f"\n🔐 YouTube: sign in with {account_id}'s Google account")
+    setup_youtube_oauth.TOKEN_FILE = str(directory / 'youtube_token.enc')
+    setup_youtube_oauth.get_authenticated_service()
+
+    print(f"\n🔐 Spotify: sign in with {account_id}'s Spotify account")
+    auth_manager = SpotifyOAuth(
+        client_id=os.getenv('SPOTIFY_CLIENT_ID'),
+        client_secret=os.getenv('SPOTIFY_CLIENT_SECRET'),
+        redirect_uri=os.getenv('SPOTIFY_REDIRECT_URI'),
+        scope=SPOTIFY_SCOPE,
+        cache_handler=spotify_cache_handler(directory / 'spotify_token.enc')
+    )
+    auth_manager.get_access_token(as_dict=False)
+    print(f"\n✅ Account {account_id} ready: {directory}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve transfer jobs for many accounts in one process")
+    parser.add_argument('--enroll', metavar='ACCOUNT', help="authorize YouTube and Spotify for an account")
+    parser.add_argument('--jobs', metavar='FILE',
+                        help="JSON-lines job file; '-' reads jobs from stdin until it closes")
+    parser.add_argument('--workers', type=int, metavar='N',
+                        help="jobs running at once (env: ACCOUNT_WORKERS)")
+    parser.add_argument('--accounts-dir', metavar='DIR', help="account directories (env: ACCOUNTS_DIR)")
+    parser.add_argument('--output', choices=('text', 'json'), default='text',
+                        help="json: JSON-lines events on stdout, progress text on stderr")
+    args = parser.parse_args()
+
+    if args.enroll:
+        try:
+            enroll(args.enroll, args.accounts_dir)
+        except JobError as e:
+            print(f"❌ {e}")
+            sys.exit(EXIT_ERROR)
+        return
+    if not args.jobs:
+        parser.error("--jobs or --enroll is required")
+
+    with event_log.json_output() if args.output == 'json' else nullcontext(), prefixed_stdout():
+        worker = AccountWorker(args.accounts_dir, args.workers)
+        worker.start()
+        try:
+            if args.jobs == '-':
+                rejected = read_jobs(worker, sys.stdin)
+            else:
+                with open(args.jobs, 'r', encoding='utf-8') as f:
+                    rejected = read_jobs(worker, f)
+            worker.join()
+        except KeyboardInterrupt:
+            print("\n\n👋 Stopping after the running jobs (interrupted transfers resume later)")
+            rejected = 0
+        finally:
+            worker.stop()
+        worker.print_summary()
+
+    failed = rejected or any(code != 0 for code in worker.results.values())
+    sys.exit(EXIT_ERROR if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
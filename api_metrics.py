@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+API Metrics
+Live accounting of quota units, latency and errors for every API call
+
+Unlike SpotifyToYouTubeTransfer.estimate_quota_usage (a worst-case estimate
+made before the run), these numbers come from the calls actually made,
+including failures and retries.
+"""
+
+import sys
+import json
+import time
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+import event_log
+
+# YouTube Data API v3 cost per call. Searches go through ytmusicapi (the
+# YouTube Music web endpoint), which does not consume Data API quota.
+UNIT_COSTS = {
+    'search': 0,
+    'channels.list': 1,
+    'playlists.insert': 50,
+    'playlistItems.insert': 50,
+    'playlistItems.list': 1,
+    'playlistItems.update': 50,
+    'playlistItems.delete': 50,
+}
+
+
+def is_http_error(error: Exception) -> bool:
+    """
+    isinstance(error, googleapiclient.errors.HttpError) without importing
+    googleapiclient: if it was never imported, no HttpError can exist
+    """
+    errors = sys.modules.get('googleapiclient.errors')
+    return errors is not None and isinstance(error, errors.HttpError)
+
+
+def error_code(error: Exception) -> str:
+    """Stable label for an error: HTTP status + reason, or exception type"""
+    if is_http_error(error):
+        reason = ''
+        try:
+            details = json.loads(error.content.decode())['error']['errors'][0]
+            reason = details.get('reason', '')
+        except (ValueError, KeyError, IndexError, AttributeError):
+            pass
+        return f"{error.resp.status} {reason}".strip()
+    return type(error).__name__
+
+
+class ApiMetrics:
+    """
+    Thread-safe per-operation counters
+
+    Every call records: units spent, latency and (on failure) an error code.
+    If a QuotaLedger is given, spent units are also added to it.
+    """
+
+    def __init__(self, ledger=None):
+        self.ledger = ledger
+        self.started_at = datetime.now()
+        self._lock = threading.Lock()
+        self._calls = Counter()
+        self._units = Counter()
+        self._latencies = defaultdict(list)
+        self._errors = defaultdict(Counter)
+
+    def record(self, operation: str, latency: float, error: Exception = None,
+               units: int = None) -> None:
+        """Record one call of an operation"""
+        if units is None:
+            units = UNIT_COSTS.get(operation, 0)
+
+        with self._lock:
+            self._calls[operation] += 1
+            self._units[operation] += units
+            self._latencies[operation].append(latency)
+            if error is not None:
+                self._errors[operation][error_code(error)] += 1
+
+        if self.ledger and units:
+            self.ledger.record(units)
+
+        event_log.emit('api_call', operation=operation, latency_ms=round(latency * 1000, 1),
+                       units=units, error=error_code(error) if error is not None else None)
+
+    @contextmanager
+    def track(self, operation: str, units: int = None):
+        """Time the wrapped call and record it (errors are re-raised)"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.record(operation, time.perf_counter() - start, error=e, units=units)
+            raise
+        self.record(operation, time.perf_counter() - start, units=units)
+
+    def reset(self) -> None:
+        """Start a new measurement period (long-running processes, one per job)"""
+        with self._lock:
+            self.started_at = datetime.now()
+            self._calls.clear()
+            self._units.clear()
+            self._latencies.clear()
+            self._errors.clear()
+
+    def total_units(self) -> int:
+        with self._lock:
+            return sum(self._units.values())
+
+    @staticmethod
+    def _percentile(values, fraction: float) -> float:
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+    def summary(self) -> Dict[str, Any]:
+        """Machine-readable per-operation summary"""
+        with self._lock:
+            operations = {}
+            for operation, calls in self._calls.items():
+                latencies = self._latencies[operation]
+                errors = self._errors[operation]
+                operations[operation] = {
+                    'calls': calls,
+                    'errors': sum(errors.values()),
+                    'error_codes': dict(errors),
+                    'units': self._units[operation],
+                    'latency_avg_ms': round(sum(latencies) / len(latencies) * 1000, 1),
+                    'latency_p95_ms': round(self._percentile(latencies, 0.95) * 1000, 1),
+                    'latency_max_ms': round(max(latencies) * 1000, 1),
+                }
+
+            return {
+                'started_at': self.started_at.isoformat(timespec='seconds'),
+                'finished_at': datetime.now().isoformat(timespec='seconds'),
+                'total_units': sum(self._units.values()),
+                'total_calls': sum(self._calls.values()),
+                'operations': operations,
+            }
+
+    def print_summary(self) -> None:
+        """Print per-run summary table"""
+        summary = self.summary()
+        if not summary['operations']:
+            return
+
+        print(f"\n📊 API usage this run: {summary['total_units']:,} quota units, "
+              f"{summary['total_calls']:,} calls")
+        for operation, stats in sorted(summary['operations'].items()):
+            line = (f"   {operation:<22} {stats['calls']:>6} calls  {stats['units']:>7,} units  "
+                    f"avg {stats['latency_avg_ms']:.0f}ms  p95 {stats['latency_p95_ms']:.0f}ms")
+            if stats['errors']:
+                codes = ', '.join(f"{code}×{n}" for code, n in stats['error_codes'].items())
+                line += f"  ⚠️  {stats['errors']} errors ({codes})"
+            print(line)
+
+    def write_report(self, path: str, extra: Optional[Dict[str, Any]] = None) -> None:
+        """Write the summary (plus any extra fields) as JSON"""
+        report = self.summary()
+        if extra:
+            report.update(extra)
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
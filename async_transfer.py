@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Async Transfer
+asyncio engine for transfers, for embedding in an async service
+
+AsyncTransfer drives a SpotifyToYouTubeTransfer (clients, cache, limiters,
+quota ledger, journal format) from the event loop. The orchestration is
+asyncio-native - page prefetch, concurrent searches, ordered writes
+through an asyncio.Queue - and only the blocking client calls (spotipy,
+ytmusicapi, googleapiclient, journal fsyncs) run in a thread pool. A
+transfer waiting on the network therefore holds no thread, and one
+process can run many users' transfers side by side.
+
+    async def handle_transfer(request):             # aiohttp handler
+        engine = request.app['transfers']            # AsyncTransfer
+        playlist_id = request.match_info['playlist_id']
+        done = await engine.transfer_playlist(playlist_id)
+        return web.json_response({'done': done})
+
+Pass one shared executor to every AsyncTransfer of a process to bound the
+total number of threads, and one QuotaLedger (SpotifyToYouTubeTransfer's
+quota_ledger argument) to every transfer using the same Google Cloud
+project, since they draw on one daily quota. Nobody can answer a prompt
+inside a service, so quota_policy 'ask' is treated as 'limit'.
+
+Writes go through the sync engine's PlaylistWriter (one writer thread per
+running transfer): batching, budget and quota stops and the final order
+check are the same code for both engines.
+"""
+
+import time
+import asyncio
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import event_log
+from spotify_to_youtube import SpotifyToYouTubeTransfer, PlaylistWriter
+from track_record import Track
+from transfer_journal import TransferJournal
+
+
+class AsyncTransfer:
+    """Awaitable transfers on top of a SpotifyToYouTubeTransfer"""
+
+    def __init__(self, transfer: SpotifyToYouTubeTransfer = None, executor: Executor = None):
+        """
+        Args:
+            transfer: Configured sync engine (default: a new one from .env)
+            executor: Thread pool for blocking calls (default: a private one
+                      sized for the transfer's search workers)
+        """
+        self.transfer = transfer or SpotifyToYouTubeTransfer()
+        if self.transfer.quota_policy == 'ask':
+            self.transfer.quota_policy = 'limit'
+        self._own_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=self.transfer.search_workers + 2, thread_name_prefix='async-transfer')
+
+    async def __aenter__(self) -> 'AsyncTransfer':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Shut down the private executor (a shared one is left running)"""
+        if self._own_executor:
+            await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown)
+
+    async def _call(self, fn: Callable, *args, **kwargs):
+        """Run a blocking call in the executor"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, partial(fn, *args, **kwargs))
+
+    async def get_spotify_playlists(self) -> List[Dict]:
+        return await self._call(self.transfer.get_spotify_playlists)
+
+    async def _fetch_page(self, playlist_id: str, offset: int) -> Dict:
+        start_time = time.perf_counter()
+        page = await self._call(lambda: self.transfer.spotify.playlist_tracks(
+            playlist_id, fields=self.transfer.PLAYLIST_TRACK_FIELDS,
+            limit=self.transfer.PLAYLIST_PAGE_SIZE, offset=offset))
+        page['latency_ms'] = round((time.perf_counter() - start_time) * 1000, 1)
+        return page
+
+    async def stream_playlist_tracks(self, playlist_id: str) -> Tuple[int, AsyncIterator[Track]]:
+        """
+        Stream a Spotify playlist (next page prefetched while one is consumed)
+
+        Returns:
+            (total items reported by Spotify, async track iterator)
+        """
+        first_page = await self._fetch_page(playlist_id, 0)
+        total = first_page['total']
+        page_size = self.transfer.PLAYLIST_PAGE_SIZE
+
+        async def generate(page: Dict) -> AsyncIterator[Track]:
+            offset, next_page = 0, None
+            try:
+                while page:
+                    offset += page_size
+                    next_page = (asyncio.ensure_future(self._fetch_page(playlist_id, offset))
+                                 if offset < total else None)
+                    for item in page['items']:
+                        track = item['track']
+                        if track:
+                            event_log.emit('track_fetched', playlist=playlist_id, track=track['id'],
+                                           page_latency_ms=page['latency_ms'])
+                            yield Track.from_spotify(track)
+                    page = await next_page if next_page else None
+            finally:
+                if next_page and not next_page.done():
+                    next_page.cancel()  # Consumer stopped early (track limit)
+
+        return total, generate(first_page)
+
+    async def transfer_playlist(self, spotify_playlist_id: str, spotify_playlist_name: str = None,
+                                max_tracks: int = None, title: str = None,
+                                privacy_status: str = "PRIVATE", yt_playlist_id: str = None) -> bool:
+        """
+        Transfer a playlist; same arguments and journal as
+        SpotifyToYouTubeTransfer.transfer_playlist (interrupted transfers
+        can be continued with resume_transfer or --resume)
+
+        Returns:
+            True when the whole playlist is transferred
+        """
+        transfer = self.transfer
+        if spotify_playlist_name is None:
+            spotify_playlist_name = (await self._call(
+                lambda: transfer.spotify.playlist(spotify_playlist_id, fields='name')))['name']
+
+        total, tracks = await self.stream_playlist_tracks(spotify_playlist_id)
+        limit = transfer._apply_quota_policy(spotify_playlist_id, total, max_tracks)
+        if max_tracks and total > max_tracks:
+            total = max_tracks  # The caller's limit: the transfer is the first max_tracks tracks
+            limit = None
+        elif not limit or total <= limit:
+            limit = None  # Otherwise a quota slice: the whole playlist is journaled
+
+        yt_playlist_id, existing = await self._call(
+            transfer._open_target, title or spotify_playlist_name, total, privacy_status, yt_playlist_id)
+
+        journal = transfer.journal(spotify_playlist_id)
+        await self._call(journal.start, spotify_playlist_name, yt_playlist_id, [],
+                         total=total, existing=existing)
+        state = await self._call(journal.load)
+        return await self._run(journal, state, tracks, total, limit)
+
+    async def transfer_playlists(self, playlists: List[Dict]) -> Dict[str, object]:
+        """
+        Transfer several playlists concurrently
+
+        Each playlist is a dict with 'id' and optionally 'name',
+        'max_tracks', 'title', 'privacy' and 'target' (as in job files).
+        Returns {playlist ID: True (done), False (unfinished) or the exception}
+        """
+        results = await asyncio.gather(*(
+            self.transfer_playlist(playlist['id'], playlist.get('name'),
+                                   max_tracks=playlist.get('max_tracks'), title=playlist.get('title'),
+                                   privacy_status=playlist.get('privacy', 'PRIVATE'),
+                                   yt_playlist_id=playlist.get('target'))
+            for playlist in playlists), return_exceptions=True)
+        return {playlist['id']: result for playlist, result in zip(playlists, results)}
+
+    async def resume_transfer(self, journal: TransferJournal) -> bool:
+        """Resume an interrupted transfer (runs the sync engine in the executor)"""
+        return await self._call(self.transfer.resume_transfer, journal)
+
+    async def _run(self, journal: TransferJournal, state: Dict,
+                   incoming: AsyncIterator[Track], total: int, limit: Optional[int]) -> bool:
+        """
+        Search and add streamed tracks, journaled like run_journal
+
+        The first `total` tracks are journaled; only the first `limit` of
+        them (quota slice) are searched and added, the rest on --resume.
+        """
+        transfer = self.transfer
+        tracks = state['tracks']
+        resolved = state['resolved']
+        units_before = transfer.metrics.total_units()
+        started = time.perf_counter()
+
+        searches = asyncio.Semaphore(transfer.search_workers)
+        writer = PlaylistWriter(transfer, journal, state)
+
+        async def resolve(track: Track) -> Optional[str]:
+            async with searches:
+                return await self._call(transfer.resolve_track, track)
+
+        async def search() -> None:
+            # Results are collected in playlist order (bounded read-ahead)
+            window = transfer.search_workers * 4
+            in_flight = deque()
+
+            async def collect_next() -> None:
+                index, task = in_flight.popleft()
+                video_id = await task
+                resolved[index] = video_id
+                await self._call(journal.record_resolved, index, video_id)
+                if video_id:
+                    # Blocks (in the executor) while the writer's queue is full
+                    await self._call(writer.submit, index, video_id)
+
+            try:
+                async for track in incoming:
+                    if len(tracks) >= total:
+                        break
+                    index = len(tracks)
+                    tracks.append(track)
+                    await self._call(journal.record_track, track)
+                    if limit is not None and index >= limit:
+                        continue
+                    in_flight.append((index, asyncio.ensure_future(resolve(track))))
+                    if len(in_flight) >= window:
+                        await collect_next()
+                while in_flight:
+                    await collect_next()
+                await self._call(journal.record_fetched)
+                state['fetch_complete'] = True
+            finally:
+                for _, task in in_flight:
+                    task.cancel()
+                await incoming.aclose()
+
+        try:
+            await search()
+        finally:
+            await self._call(writer.close)
+        return await self._call(transfer._finish_journal, journal, state, started, units_before)
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Batch Jobs
+Non-interactive transfers described by a job file (JSON, or YAML with PyYAML)
+
+Example job (JSON):
+
+    {
+      "mode": "transfer",
+      "playlists": [
+        "37i9dQZF1DXcBWIGoYBM5M",
+        {"id": "5ABHKGoOzxkaa28ttQV9sE", "title": "Road trip",
+         "privacy": "unlisted", "max_tracks": 200},
+        {"id": "1h0CEZCm6IbFTbxThn6Xcs", "target": "PLxxxxxxxx"}
+      ],
+      "privacy": "private",
+      "parallel": 2,
+      "search_workers": 4,
+      "search_rate": 5,
+      "on_quota": "limit"
+    }
+
+- mode:      "transfer" (default), "sync" (incremental, see --sync) or
+             "continue" (resume interrupted transfers, see --resume)
+- playlists: Spotify playlist IDs or objects, or "all" (the default for
+             continue: every unfinished journal)
+- title / privacy / max_tracks / target (existing YouTube playlist ID) can
+  be set per playlist; top-level privacy and max_tracks are the defaults
+  (transfer mode only: sync keeps each playlist's existing target)
+- on_quota:  what to do when a transfer exceeds today's remaining quota:
+             "limit" (transfer what fits), "ignore" (run until the API
+             stops it) or "fail" (don't start)
+
+Re-running a job is safe: finished playlists are skipped and interrupted
+ones are resumed from their transfer journal.
+
+Exit codes (see EXIT_*): 0 all done, 1 unexpected error, 2 invalid job
+file, 3 some playlists failed or are unfinished, 4 stopped by the daily
+quota (run again after the Pacific-time reset).
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Any
+
+from rate_limiter import QuotaExceededError
+from quota_scheduler import ADD_COST
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_INVALID_JOB = 2
+EXIT_PARTIAL = 3
+EXIT_QUOTA = 4
+
+MODES = ('transfer', 'sync', 'continue')
+PRIVACY = ('PRIVATE', 'UNLISTED', 'PUBLIC')
+QUOTA_POLICIES = ('limit', 'ignore', 'fail')
+PLAYLIST_FIELDS = ('id', 'name', 'title', 'privacy', 'max_tracks', 'target')
+
+
+class JobError(ValueError):
+    """The job file is missing, unreadable or invalid"""
+
+
+class BatchJob:
+    """A validated job file, run headlessly against a SpotifyToYouTubeTransfer"""
+
+    def __init__(self, spec: Dict[str, Any], path: str = None):
+        self.path = path
+        self.mode = spec.get('mode', 'transfer')
+        self.parallel = spec.get('parallel')
+        self.search_workers = spec.get('search_workers')
+        self.search_rate = spec.get('search_rate')
+        self.on_quota = spec.get('on_quota', 'limit')
+        self.all_playlists = spec.get('playlists', 'all' if self.mode == 'continue' else None) == 'all'
+        self.playlists = [] if self.all_playlists else self._playlists(spec)
+        self.results: Dict[str, object] = {}  # Playlist ID -> outcome of the last run
+
+        if self.mode not in MODES:
+            raise JobError(f"mode must be one of {', '.join(MODES)}")
+        if self.on_quota not in QUOTA_POLICIES:
+            raise JobError(f"on_quota must be one of {', '.join(QUOTA_POLICIES)}")
+        for name in ('parallel', 'search_workers'):
+            value = getattr(self, name)
+            if value is not None and (not isinstance(value, int) or value < 1):
+                raise JobError(f"{name} must be a positive integer")
+        if self.search_rate is not None and (
+                not isinstance(self.search_rate, (int, float)) or self.search_rate <= 0):
+            raise JobError("search_rate must be a positive number")
+
+    @staticmethod
+    def _playlists(spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+        entries = spec.get('playlists')
+        if not isinstance(entries, list) or not entries:
+            raise JobError("'playlists' must be a non-empty list or \"all\"")
+
+        defaults = {key: spec[key] for key in ('privacy', 'max_tracks') if key in spec}
+        playlists = []
+        for entry in entries:
+            playlist = dict(defaults, **({'id': entry} if isinstance(entry, str) else entry))
+            if not isinstance(playlist.get('id'), str):
+                raise JobError(f"playlist entry without an 'id': {entry!r}")
+            unknown = set(playlist) - set(PLAYLIST_FIELDS)
+            if unknown:
+                raise JobError(f"unknown playlist fields {sorted(unknown)} in {entry!r}")
+            playlist['privacy'] = str(playlist.get('privacy', 'PRIVATE')).upper()
+            if playlist['privacy'] not in PRIVACY:
+                raise JobError(f"privacy must be one of {', '.join(PRIVACY)}")
+            max_tracks = playlist.get('max_tracks')
+            if max_tracks is not None and (not isinstance(max_tracks, int) or max_tracks < 1):
+                raise JobError("max_tracks must be a positive integer")
+            playlists.append(playlist)
+        return playlists
+
+    @classmethod
+    def load(cls, path: str) -> 'BatchJob':
+        """Read and validate a .json, .yaml or .yml job file"""
+        file = Path(path)
+        try:
+            text = file.read_text(encoding='utf-8')
+        except OSError as e:
+            raise JobError(f"cannot read job file: {e}")
+
+        try:
+            if file.suffix in ('.yaml', '.yml'):
+                try:
+                    import yaml
+                except ImportError:
+                    raise JobError("YAML job files need PyYAML: pip install pyyaml")
+                spec = yaml.safe_load(text)
+            else:
+                spec = json.loads(text)
+        except JobError:
+            raise
+        except Exception as e:
+            raise JobError(f"cannot parse {file.name}: {e}")
+
+        if not isinstance(spec, dict):
+            raise JobError("job file must contain an object")
+        return cls(spec, path=str(file))
+
+    def transfer_options(self) -> Dict[str, Any]:
+        """Keyword arguments for SpotifyToYouTubeTransfer"""
+        return {
+            'search_workers': self.search_workers,
+            'search_rate': self.search_rate,
+            'playlist_workers': self.parallel
+        }
+
+    def run(self, transfer) -> int:
+        """Run the job without prompts and return the process exit code"""
+        transfer.quota_policy = self.on_quota
+        print(f"\n🗂️  Batch job: {self.path or 'inline'} ({self.mode})")
+
+        if self.mode == 'sync':
+            # An empty ID list makes sync read the (snapshot-carrying) listing itself
+            results = transfer.sync_playlists([playlist['id'] for playlist in self.playlists])
+            expected = set(results) if self.all_playlists else {p['id'] for p in self.playlists}
+        elif self.mode == 'continue':
+            results = self._continue(transfer)
+            transfer.print_run_summary()
+            expected = set(results) if self.all_playlists else {p['id'] for p in self.playlists}
+        else:
+            if self.all_playlists:
+                print("\n📋 Fetching your Spotify playlists...")
+                self.playlists = [{'id': playlist['id'], 'name': playlist['name'], 'privacy': 'PRIVATE'}
+                                  for playlist in transfer.get_spotify_playlists()]
+            results = self._transfer(transfer)
+            transfer.print_run_summary()
+            expected = {playlist['id'] for playlist in self.playlists}
+
+        self.results = results
+        return self.exit_code(expected, results, transfer.quota_ledger.remaining())
+
+    def _continue(self, transfer) -> Dict[str, object]:
+        """Resume the unfinished journals (all, or those of the listed playlists)"""
+        if self.all_playlists:
+            journals = transfer.pending_journals()
+        else:
+            journals = [transfer.journal(playlist['id']) for playlist in self.playlists]
+
+        results: Dict[str, object] = {}
+        for journal in journals:
+            playlist_id = journal.spotify_playlist_id
+            if not journal.exists():
+                print(f"   ⚠️  No interrupted transfer for {playlist_id}")
+                results[playlist_id] = False
+                continue
+            try:
+                results[playlist_id] = journal.load()['done'] or transfer.resume_transfer(journal)
+            except Exception as e:
+                print(f"❌ Playlist {playlist_id} failed: {e}")
+                results[playlist_id] = e
+        if not journals:
+            print("✅ No interrupted transfers to resume")
+        return results
+
+    def _transfer(self, transfer) -> Dict[str, object]:
+        """Skip finished playlists, resume interrupted ones, transfer the rest"""
+        results: Dict[str, object] = {}
+        new = []
+
+        for playlist in self.playlists:
+            journal = transfer.journal(playlist['id'])
+            if not journal.exists():
+                if 'name' not in playlist:
+                    playlist['name'] = transfer.spotify.playlist(playlist['id'], fields='name')['name']
+                new.append(playlist)
+                continue
+
+            state = journal.load()
+            if state['done']:
+                print(f"   ⏭️  Already transferred: {state['playlist_name']}")
+                results[playlist['id']] = True
+                continue
+
+            try:
+                results[playlist['id']] = transfer.resume_transfer(journal)
+            except Exception as e:
+                print(f"❌ Playlist '{state['playlist_name']}' failed: {e}")
+                results[playlist['id']] = e
+
+        if new:
+            try:
+                results.update(transfer.transfer_playlists(new))
+            except QuotaExceededError as e:
+                print(f"🛑 Not started: {e}")
+                results.update({playlist['id']: e for playlist in new})
+
+        return results
+
+    @staticmethod
+    def exit_code(expected: set, results: Dict[str, object], quota_remaining: int) -> int:
+        """Map per-playlist results to an EXIT_* status"""
+        unfinished = [playlist_id for playlist_id in expected if results.get(playlist_id) is not True]
+
+        if not unfinished:
+            print(f"\n✅ Batch job complete: {len(expected)} playlists")
+            return EXIT_OK
+
+        quota_stopped = (any(isinstance(results.get(playlist_id), QuotaExceededError)
+                             for playlist_id in unfinished)
+                         or quota_remaining < ADD_COST)
+        print(f"\n⚠️  {len(unfinished)}/{len(expected)} playlists not finished"
+              + (" (daily quota exhausted)" if quota_stopped else ""))
+        return EXIT_QUOTA if quota_stopped else EXIT_PARTIAL
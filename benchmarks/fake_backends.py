@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Fake Backends
+Local stand-ins for the Spotify Web API, ytmusicapi search and the YouTube
+Data API, used by offline_benchmark.py
+
+Only the transport is fake: SpotifyToYouTubeTransfer, the YouTube wrapper
+(batching, retries, metrics) and the rate limiters run unchanged. Every
+backend has a configurable latency and error rate; the Data API also
+charges quota units and answers quotaExceeded once the daily limit is hit.
+
+Synthetic track i is "Song i" by "Artist (i % artists)", with ISRC
+BENCH000000i; its YouTube Music match is videoId vid000000i (unless it
+falls in the configured miss rate).
+"""
+
+import re
+import sys
+import json
+import time
+import random
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Tuple, Optional, Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from api_metrics import UNIT_COSTS
+from spotify_to_youtube import YouTubeOAuthWrapper
+
+_SONG = re.compile(r'Song (\d+) ')
+
+
+class FakeBackend:
+    """Latency, error injection and call counting shared by the fakes"""
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0,
+                 retry_after: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.calls = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def round_trip(self, operation: str) -> bool:
+        """Count and delay one call; True if it should fail"""
+        with self._lock:
+            self.calls[operation] += 1
+            fail = self._random.random() < self.error_rate
+            jitter = self._random.uniform(0.5, 1.5)
+        if self.latency:
+            time.sleep(self.latency * jitter)
+        return fail
+
+
+class FakeSpotifyError(Exception):
+    """Looks like spotipy.SpotifyException to rate_limiter.classify_error"""
+
+    def __init__(self, status: int, retry_after: float):
+        super().__init__(f"http status: {status}")
+        self.http_status = status
+        self.headers = {'Retry-After': str(retry_after)}
+
+
+class FakeSpotify(FakeBackend):
+    """Spotify Web API: synthetic playlists of any size"""
+
+    def __init__(self, playlists: Dict[str, int], artists: int = 500, **kwargs):
+        super().__init__(**kwargs)
+        self.playlists = playlists  # playlist ID -> track count
+        self.artists = artists
+
+    def track(self, index: int) -> Dict[str, Any]:
+        return {
+            'id': f"trk{index:09d}",
+            'name': f"Song {index}",
+            'duration_ms': 180000 + index % 60000,
+            'external_ids': {'isrc': f"BENCH{index:09d}"},
+            'artists': [{'name': f"Artist {index % self.artists}"}],
+            'album': {'name': f"Album {index // 12}"}
+        }
+
+    def _check(self, operation: str) -> None:
+        if self.round_trip(operation):
+            raise FakeSpotifyError(self._random.choice((429, 503)), self.retry_after)
+
+    def current_user_playlists(self, limit: int = 50) -> Dict[str, Any]:
+        self._check('current_user_playlists')
+        return {
+            'items': [{'id': playlist_id, 'name': playlist_id, 'snapshot_id': 'bench',
+                       'tracks': {'total': total}}
+                      for playlist_id, total in self.playlists.items()],
+            'next': None
+        }
+
+    def playlist(self, playlist_id: str, fields: str = None) -> Dict[str, Any]:
+        self._check('playlist')
+        return {'id': playlist_id, 'name': playlist_id, 'snapshot_id': 'bench'}
+
+    def playlist_tracks(self, playlist_id: str, fields: str = None, limit: int = 100,
+                        offset: int = 0) -> Dict[str, Any]:
+        self._check('playlist_tracks')
+        total = self.playlists[playlist_id]
+        return {
+            'items': [{'track': self.track(index)}
+                      for index in range(offset, min(total, offset + limit))],
+            'total': total
+        }
+
+
+class FakeYTMusic(FakeBackend):
+    """ytmusicapi search: the catalog knows every synthetic track but a miss rate"""
+
+    def __init__(self, spotify: FakeSpotify, miss_rate: float = 0.05, **kwargs):
+        super().__init__(**kwargs)
+        self.spotify = spotify
+        self.miss_rate = miss_rate
+
+    def search(self, query: str, filter: str = None, limit: int = 1) -> List[Dict[str, Any]]:
+        if self.round_trip('search'):
+            raise Exception("Server returned HTTP 503: Service Unavailable")
+
+        match = _SONG.match(query)
+        if not match:
+            return []
+        index = int(match.group(1))
+        if (index * 2654435761) % 1000 < self.miss_rate * 1000:
+            return []
+
+        track = self.spotify.track(index)
+        return [{
+            'videoId': f"vid{index:09d}",
+            'title': track['name'],
+            'artists': track['artists'],
+            'duration_seconds': track['duration_ms'] // 1000
+        }][:limit]
+
+
+def _http_error(status: int, reason: str, retry_after: float = None) -> HttpError:
+    headers = {'status': str(status)}
+    if retry_after is not None:
+        headers['retry-after'] = str(retry_after)
+    content = json.dumps({'error': {'code': status, 'errors': [{'reason': reason}]}})
+    return HttpError(httplib2.Response(headers), content.encode())
+
+
+class FakeDataAPI(FakeBackend):
+    """YouTube Data API v3 playlists / playlistItems with quota accounting"""
+
+    def __init__(self, daily_quota: Optional[int] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.daily_quota = daily_quota
+        self.units = 0
+        self.items: Dict[str, List[Tuple[str, str]]] = {}  # (item ID, videoId)
+        self._next_id = 0
+
+    def handle(self, operation: str, kwargs: Dict[str, Any], fail: bool) -> Dict[str, Any]:
+        """Apply one API method (the round trip was already paid)"""
+        cost = UNIT_COSTS.get(operation, 0)
+        with self._lock:
+            if self.daily_quota is not None and self.units + cost > self.daily_quota:
+                raise _http_error(403, 'quotaExceeded')
+            self.units += cost
+            self._next_id += 1
+            new_id = f"{self._next_id:x}"
+        if fail:
+            status, reason = self._random.choice(((503, 'backendError'),
+                                                  (403, 'rateLimitExceeded')))
+            raise _http_error(status, reason, self.retry_after)
+
+        body = kwargs.get('body', {})
+        snippet = body.get('snippet', {})
+        with self._lock:
+            if operation == 'playlists.insert':
+                self.items[new_id] = []
+                return {'id': new_id}
+            if operation == 'playlistItems.insert':
+                item = (new_id, snippet['resourceId']['videoId'])
+                playlist = self.items[snippet['playlistId']]
+                playlist.insert(snippet.get('position', len(playlist)), item)
+                return {'id': new_id}
+            if operation == 'playlistItems.list':
+                playlist = self.items[kwargs['playlistId']]
+                start = int(kwargs.get('pageToken') or 0)
+                end = start + kwargs.get('maxResults', 5)
+                page = {'items': [{'id': item_id, 'snippet': {'resourceId': {'videoId': video_id}}}
+                                  for item_id, video_id in playlist[start:end]]}
+                if end < len(playlist):
+                    page['nextPageToken'] = str(end)
+                return page
+            if operation == 'playlistItems.delete':
+                for playlist in self.items.values():
+                    playlist[:] = [item for item in playlist if item[0] != kwargs['id']]
+                return {}
+            if operation == 'playlistItems.update':
+                playlist = self.items[snippet['playlistId']]
+                item = next(item for item in playlist if item[0] == body['id'])
+                playlist.remove(item)
+                playlist.insert(snippet['position'], item)
+                return {'id': item[0]}
+        raise _http_error(400, 'unsupported')
+
+
+class _FakeRequest:
+    def __init__(self, api: FakeDataAPI, operation: str, kwargs: Dict[str, Any]):
+        self.api = api
+        self.operation = operation
+        self.kwargs = kwargs
+
+    def execute(self, http=None) -> Dict[str, Any]:
+        fail = self.api.round_trip(self.operation)
+        return self.api.handle(self.operation, self.kwargs, fail)
+
+
+class _FakeBatch:
+    """One round trip for up to 50 requests, answered through the callback"""
+
+    def __init__(self, api: FakeDataAPI, callback):
+        self.api = api
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request: _FakeRequest, request_id: str) -> None:
+        self.requests.append((request_id, request))
+
+    def execute(self, http=None) -> None:
+        if self.api.round_trip('batch'):
+            raise _http_error(503, 'backendError', self.api.retry_after)
+        for request_id, request in self.requests:
+            fail = self.api._random.random() < self.api.error_rate
+            try:
+                response = self.api.handle(request.operation, request.kwargs, fail)
+            except HttpError as e:
+                self.callback(request_id, None, e)
+            else:
+                self.callback(request_id, response, None)
+
+
+class _FakeResource:
+    def __init__(self, api: FakeDataAPI, name: str):
+        self.api = api
+        self.name = name
+
+    def __getattr__(self, method: str):
+        return lambda **kwargs: _FakeRequest(self.api, f"{self.name}.{method}", kwargs)
+
+
+class FakeYouTubeService:
+    """Stands in for googleapiclient's youtube v3 service object"""
+
+    def __init__(self, api: FakeDataAPI):
+        self.api = api
+
+    def playlists(self) -> _FakeResource:
+        return _FakeResource(self.api, 'playlists')
+
+    def playlistItems(self) -> _FakeResource:
+        return _FakeResource(self.api, 'playlistItems')
+
+    def new_batch_http_request(self, callback) -> _FakeBatch:
+        return _FakeBatch(self.api, callback)
+
+
+class _FakeCredentials:
+    token = 'bench'
+
+
+class FakeYouTubeWrapper(YouTubeOAuthWrapper):
+    """The real YouTube wrapper over fake transports (no credentials or files)"""
+
+    def __init__(self, ytmusic: FakeYTMusic, api: FakeDataAPI, metrics,
+                 search_limiter=None, write_limiter=None):
+        self.metrics = metrics
+        self.search_limiter = search_limiter
+        self.write_limiter = write_limiter
+        self.creds = _FakeCredentials()
+        self.token_manager = None
+        self._service = FakeYouTubeService(api)
+        self._local = threading.local()
+        self.ytmusic = ytmusic
+
+    def _thread_http(self):
+        return None
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Offline Benchmark
+End-to-end transfer throughput against fake Spotify / YouTube backends
+
+Drives SpotifyToYouTubeTransfer.transfer_playlist over synthetic playlists
+(see fake_backends.py): only the network is replaced, so streaming,
+matching, caching, journaling, batching, retries and rate limiting all run
+for real. Each playlist size runs in a fresh interpreter and a temporary
+directory, so peak RSS is per size and no cache/journal carries over.
+
+Reports tracks/sec, API round trips and quota units per track and peak
+memory (RSS; with --tracemalloc also the Python heap peak, slower).
+
+    python3 benchmarks/offline_benchmark.py
+    python3 benchmarks/offline_benchmark.py --sizes 100 1000 10000 50000
+    python3 benchmarks/offline_benchmark.py --search-latency 0.05 --error-rate 0.02
+    python3 benchmarks/offline_benchmark.py --quota 10000 --json
+    python3 benchmarks/offline_benchmark.py --engine async
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import resource
+import tempfile
+import tracemalloc
+import subprocess
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Dict, Any
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCHMARK_DIR.parent
+UNLIMITED_QUOTA = 10 ** 9
+
+
+def run_scenario(tracks: int, args: argparse.Namespace) -> Dict[str, Any]:
+    """Transfer one synthetic playlist of `tracks` tracks in this process"""
+    workdir = tempfile.TemporaryDirectory(prefix='offline-benchmark-')
+    os.chdir(workdir.name)
+    os.environ.update({
+        'QUOTA_LEDGER_PATH': 'quota_ledger.json',
+        'QUOTA_DAILY_LIMIT': str(args.quota or UNLIMITED_QUOTA),
+        'SEARCH_CACHE_PATH': 'search_cache.db',
+        'JOURNAL_DIR': 'journals',
+        'WRITE_RATE': str(args.write_rate),
+        'SPOTIFY_RATE': str(args.spotify_rate),
+    })
+
+    from fake_backends import FakeSpotify, FakeYTMusic, FakeDataAPI, FakeYouTubeWrapper
+    from rate_limiter import RateLimitedClient, QuotaExceededError
+    from spotify_to_youtube import SpotifyToYouTubeTransfer
+
+    faults = {'error_rate': args.error_rate, 'retry_after': args.retry_after, 'seed': args.seed}
+    spotify = FakeSpotify({'bench': tracks}, latency=args.spotify_latency, **faults)
+    search = FakeYTMusic(spotify, miss_rate=args.miss_rate, latency=args.search_latency, **faults)
+    data_api = FakeDataAPI(daily_quota=args.quota, latency=args.write_latency, **faults)
+
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    transfer = SpotifyToYouTubeTransfer(search_workers=args.search_workers,
+                                        search_rate=args.search_rate)
+    transfer.quota_policy = args.on_quota
+    transfer._spotify = RateLimitedClient(spotify, transfer.spotify_limiter)
+    transfer._ytmusic = FakeYouTubeWrapper(search, data_api, transfer.metrics,
+                                           transfer.search_limiter, transfer.write_limiter)
+
+    start_time = time.perf_counter()
+    outcome = 'complete'
+    with open(os.devnull, 'w') as quiet, redirect_stdout(quiet):
+        try:
+            if args.engine == 'async':
+                from async_transfer import AsyncTransfer
+
+                async def run_async() -> bool:
+                    async with AsyncTransfer(transfer) as engine:
+                        return await engine.transfer_playlist('bench', f"Benchmark {tracks}")
+                done = asyncio.run(run_async())
+            else:
+                done = transfer.transfer_playlist('bench', f"Benchmark {tracks}")
+            if not done:
+                outcome = 'incomplete'
+        except QuotaExceededError:
+            outcome = 'quota'
+    elapsed = time.perf_counter() - start_time
+
+    heap_peak = tracemalloc.get_traced_memory()[1] if args.tracemalloc else None
+    added = sum(len(items) for items in data_api.items.values())
+    calls = {
+        'spotify': sum(spotify.calls.values()),
+        'search': sum(search.calls.values()),
+        'data_api': sum(data_api.calls.values()),
+    }
+    summary = transfer.metrics.summary()
+    workdir.cleanup()
+
+    return {
+        'tracks': tracks,
+        'outcome': outcome,
+        'added': added,
+        'elapsed_s': round(elapsed, 3),
+        'tracks_per_s': round(tracks / elapsed, 1),
+        'calls': calls,
+        'calls_per_track': round(sum(calls.values()) / tracks, 3),
+        'units': data_api.units,
+        'units_per_track': round(data_api.units / tracks, 1),
+        'api_errors': sum(op['errors'] for op in summary['operations'].values()),
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                             / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1),
+        'heap_peak_mb': round(heap_peak / 1024 / 1024, 1) if heap_peak is not None else None,
+    }
+
+
+def run_isolated(tracks: int, argv) -> Dict[str, Any]:
+    """Run one size in a fresh interpreter (clean RSS, imports and caches)"""
+    result = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), '--single', str(tracks)] + argv,
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{tracks} tracks failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end transfer benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000],
+                        help="synthetic playlist sizes (tracks)")
+    parser.add_argument('--spotify-latency', type=float, default=0.02, help="seconds per Spotify call")
+    parser.add_argument('--search-latency', type=float, default=0.005, help="seconds per search")
+    parser.add_argument('--write-latency', type=float, default=0.02,
+                        help="seconds per Data API round trip (a batch is one)")
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help="fraction of calls answered with 429/503")
+    parser.add_argument('--retry-after', type=float, default=0.0,
+                        help="Retry-After sent with injected errors (seconds)")
+    parser.add_argument('--miss-rate', type=float, default=0.05,
+                        help="fraction of tracks missing from the fake catalog")
+    parser.add_argument('--quota', type=int, help="daily Data API units (default: unlimited)")
+    parser.add_argument('--on-quota', choices=['limit', 'ignore', 'fail'], default='ignore',
+                        help="quota policy when a playlist exceeds --quota")
+    parser.add_argument('--engine', choices=['sync', 'async'], default='sync',
+                        help="SpotifyToYouTubeTransfer or AsyncTransfer")
+    parser.add_argument('--search-workers', type=int, default=4)
+    parser.add_argument('--search-rate', type=float, default=1000.0, help="searches per second")
+    parser.add_argument('--write-rate', type=float, default=100.0, help="write batches per second")
+    parser.add_argument('--spotify-rate', type=float, default=100.0, help="Spotify calls per second")
+    parser.add_argument('--seed', type=int, default=0, help="error injection seed")
+    parser.add_argument('--tracemalloc', action='store_true', help="also report the Python heap peak")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    parser.add_argument('--single', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        sys.path[:0] = [str(REPO_ROOT), str(BENCHMARK_DIR)]
+        print(json.dumps(run_scenario(args.single, args)))
+        return
+
+    # Forward everything but the sizes to each isolated run
+    argv = sys.argv[1:]
+    if '--sizes' in argv:
+        start = argv.index('--sizes')
+        end = start + 1
+        while end < len(argv) and not argv[end].startswith('--'):
+            end += 1
+        del argv[start:end]
+
+    results = []
+    for tracks in args.sizes:
+        if not args.json:
+            print(f"⏳ {tracks:,} tracks...", flush=True)
+        results.append(run_isolated(tracks, argv))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n📊 Offline transfer benchmark ({args.engine} engine, "
+          f"latency: spotify {args.spotify_latency}s, search {args.search_latency}s, "
+          f"write {args.write_latency}s; errors {args.error_rate:.0%})")
+    print(f"   {'tracks':>8} {'added':>8} {'time s':>8} {'tracks/s':>9} "
+          f"{'calls/track':>11} {'units/track':>11} {'peak RSS MB':>11}  outcome")
+    for result in results:
+        print(f"   {result['tracks']:>8,} {result['added']:>8,} {result['elapsed_s']:>8.1f} "
+              f"{result['tracks_per_s']:>9,.1f} {result['calls_per_track']:>11.3f} "
+              f"{result['units_per_track']:>11.1f} {result['peak_rss_mb']:>11.1f}  "
+              f"{result['outcome']}"
+              + (f" (heap peak {result['heap_peak_mb']} MB)" if result['heap_peak_mb'] else ""))
+
+
+if __name__ == '__main__':
+    main()
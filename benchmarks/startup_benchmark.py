@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Measures cold-start import time of the CLI with `python -X importtime`
+
+Each run starts a fresh interpreter, imports the module and parses the
+importtime report (cumulative microseconds per module). Reports the median
+total and the heaviest imports; with --max-ms it exits with status 1 when
+the median exceeds the budget, so cron/CI can guard cold-start time.
+
+    python3 benchmarks/startup_benchmark.py
+    python3 benchmarks/startup_benchmark.py --runs 10 --max-ms 150
+"""
+
+import re
+import sys
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$')
+
+
+def measure(module: str) -> Tuple[int, Dict[str, int]]:
+    """
+    Import module in a fresh interpreter
+
+    Returns (cumulative µs of module, {top-level import: cumulative µs})
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    total = 0
+    direct: Dict[str, int] = {}
+    depth_of_module = None
+    for line in reversed(result.stderr.splitlines()):
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative, depth, name = int(match.group(2)), len(match.group(3)), match.group(4)
+        if name == module and depth_of_module is None:
+            total, depth_of_module = cumulative, depth
+        elif depth_of_module is not None and depth == depth_of_module + 2:
+            # Imports made directly by the module (listed before it, one level deeper)
+            direct[name] = cumulative
+        elif depth_of_module is not None and depth <= depth_of_module:
+            break
+    return total, direct
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import time benchmark")
+    parser.add_argument('--module', default='spotify_to_youtube', help="module to import")
+    parser.add_argument('--runs', type=int, default=5, help="fresh interpreters to start")
+    parser.add_argument('--top', type=int, default=10, help="heaviest imports to list")
+    parser.add_argument('--max-ms', type=float, help="fail if the median exceeds this")
+    args = parser.parse_args()
+
+    totals: List[int] = []
+    imports: Dict[str, List[int]] = {}
+    for _ in range(args.runs):
+        total, direct = measure(args.module)
+        totals.append(total)
+        for name, micros in direct.items():
+            imports.setdefault(name, []).append(micros)
+
+    median_ms = statistics.median(totals) / 1000
+    print(f"\n⏱️  import {args.module}: median {median_ms:.1f} ms "
+          f"(min {min(totals) / 1000:.1f}, max {max(totals) / 1000:.1f}, {args.runs} runs)")
+
+    print(f"\n📦 Heaviest direct imports:")
+    heaviest = sorted(imports.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for name, micros in heaviest[:args.top]:
+        print(f"   {statistics.median(micros) / 1000:7.1f} ms  {name}")
+
+    if args.max_ms is not None and median_ms > args.max_ms:
+        print(f"\n❌ Startup budget exceeded: {median_ms:.1f} ms > {args.max_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Console Output
+Per-thread line prefixes so parallel playlist transfers stay readable
+
+While installed, every line printed from a labelled thread is written as
+"[label] line" in one piece; unlabelled threads print unchanged.
+"""
+
+import sys
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable
+
+_local = threading.local()
+
+
+def current_label() -> str:
+    return getattr(_local, 'label', None)
+
+
+@contextmanager
+def label(name: str):
+    """Label console output of the current thread"""
+    previous = current_label()
+    _local.label = name
+    try:
+        yield
+    finally:
+        _local.label = previous
+
+
+def with_label(fn: Callable, name: str) -> Callable:
+    """Wrap fn so it runs (e.g. in a pool worker) under the given label"""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        with label(name):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+class PrefixedStream:
+    """File-like wrapper that prefixes complete lines with the thread's label"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def write(self, text: str) -> int:
+        name = current_label()
+        if name is None:
+            with self._lock:
+                return self.stream.write(text)
+
+        # Buffer per thread until a full line is available
+        buffer = getattr(_local, 'buffer', '') + text
+        *lines, _local.buffer = buffer.split('\n')
+        if lines:
+            with self._lock:
+                self.stream.write(''.join(f"[{name}] {line}\n" if line else "\n"
+                                          for line in lines))
+        return len(text)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+    def __getattr__(self, attr):
+        return getattr(self.stream, attr)
+
+
+@contextmanager
+def prefixed_stdout():
+    """Install PrefixedStream on sys.stdout for the duration of the block"""
+    original = sys.stdout
+    sys.stdout = PrefixedStream(original)
+    try:
+        yield
+    finally:
+        sys.stdout = original
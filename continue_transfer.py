@@ -1,128 +1,254 @@
 #!/usr/bin/env python3
-"""Continue adding remaining tracks to an existing YouTube Music playlist"""
+"""
+Continue adding remaining tracks to an existing YouTube Music playlist
+
+The existing playlist is read completely (every page, any size) and
+indexed by videoId, with a normalized "title|primary artist" key as the
+fallback for tracks that were added by hand or by another tool. Each
+Spotify track claims at most one existing item, so duplicates on either
+side are matched one-to-one and nothing already present is added again.
+
+Reconciliation, in Spotify order and linear in playlist size:
+1. videoId already known (search/ISRC cache) and present → keep
+2. normalized key present → keep
+3. otherwise search; the best result is scored like in
+   spotify_to_youtube.py (below MATCH_MIN_CONFIDENCE it goes to the review
+   queue and is neither added nor cached) and checked against the videoId
+   index again before it is added (catches translated / differently
+   credited titles that the key fallback misses)
+"""
 
 import os
 import sys
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 import spotipy
 from spotipy.oauth2 import SpotifyOAuth
 from ytmusicapi import YTMusic
-
-load_dotenv()
-
-# Initialize APIs
-spotify = spotipy.Spotify(auth_manager=SpotifyOAuth(
-    client_id=os.getenv('SPOTIFY_CLIENT_ID'),
-    client_secret=os.getenv('SPOTIFY_CLIENT_SECRET'),
-    redirect_uri=os.getenv('SPOTIFY_REDIRECT_URI'),
-    scope='playlist-read-private playlist-read-collaborative'
-))
-
-ytmusic = YTMusic('oauth.json') if os.path.exists('oauth.json') else YTMusic('headers_auth.json')
-
-# Get Spotify playlists
-playlists = spotify.current_user_playlists(limit=50)['items']
-
-print("📋 Your Spotify playlists:\n")
-for i, pl in enumerate(playlists, 1):
-    print(f"  {i}. {pl['name']} ({pl['tracks']['total']} tracks)")
-
-choice = input("\nSelect Spotify playlist number: ").strip()
-spotify_playlist = playlists[int(choice) - 1]
-
-print(f"\n📥 Fetching tracks from Spotify playlist: {spotify_playlist['name']}")
-
-# Get all tracks from Spotify
-all_tracks = []
-results = spotify.playlist_tracks(spotify_playlist['id'])
-while results:
-    for item in results['items']:
-        if item['track']:
-            track = item['track']
-            all_tracks.append({
-                'name': track['name'],
-                'artist': ', '.join([artist['name'] for artist in track['artists']]),
-            })
-    results = spotify.next(results) if results['next'] else None
-
-print(f"   Found {len(all_tracks)} tracks in Spotify")
-
-# Get YouTube Music playlists
-yt_playlists = ytmusic.get_library_playlists(limit=50)
-
-print(f"\n📋 Your YouTube Music playlists:\n")
-for i, pl in enumerate(yt_playlists, 1):
-    print(f"  {i}. {pl['title']} ({pl.get('count', '?')} tracks)")
-
-choice = input("\nSelect YouTube Music playlist number to add to: ").strip()
-yt_playlist = yt_playlists[int(choice) - 1]
-yt_playlist_id = yt_playlist['playlistId']
-
-print(f"\n📥 Getting current tracks in YouTube Music playlist: {yt_playlist['title']}")
-
-# Get existing tracks in YouTube playlist
-existing_playlist = ytmusic.get_playlist(yt_playlist_id, limit=1000)
-existing_tracks = set()
-
-if 'tracks' in existing_playlist and existing_playlist['tracks']:
-    for track in existing_playlist['tracks']:
-        if track:
-            track_name = track.get('title', '').lower()
-            artists = track.get('artists', [])
-            if artists:
-                artist_name = artists[0].get('name', '').lower()
-                existing_tracks.add(f"{track_name}|{artist_name}")
-
-print(f"   Currently has {len(existing_tracks)} tracks")
-
-# Find tracks that need to be added
-print(f"\n🔍 Finding tracks that need to be added...")
-tracks_to_add = []
-
-for track in all_tracks:
-    track_key = f"{track['name'].lower()}|{track['artist'].split(',')[0].strip().lower()}"
-    if track_key not in existing_tracks:
-        tracks_to_add.append(track)
-
-print(f"   Need to add {len(tracks_to_add)} more tracks")
-
-if not tracks_to_add:
-    print("\n✅ All tracks are already in the playlist!")
-    sys.exit(0)
-
-confirm = input(f"\nAdd {len(tracks_to_add)} remaining tracks? (yes/no): ").strip().lower()
-if confirm != 'yes':
-    print("❌ Cancelled")
-    sys.exit(0)
-
-# Search and add remaining tracks
-print(f"\n🔍 Searching for tracks on YouTube Music...")
-added_count = 0
-not_found_count = 0
-
-for i, track in enumerate(tracks_to_add, 1):
-    query = f"{track['name']} {track['artist']}"
-    print(f"   [{i}/{len(tracks_to_add)}] {track['name']} - {track['artist']}", end="")
-    
-    try:
-        results = ytmusic.search(query, filter='songs', limit=1)
-        if results:
-            video_id = results[0]['videoId']
+from search_cache import SearchCache
+from match_scoring import normalize_text, normalize_title, rank_candidates, ReviewQueue
+from track_record import Track
+
+ADD_BATCH_SIZE = 50
+DEFAULT_MATCH_CANDIDATES = 5  # same defaults as SpotifyToYouTubeTransfer
+DEFAULT_MIN_CONFIDENCE = 0.6
+
+
+def primary_artist(artists: str) -> str:
+    """First credited artist ("A, B" / "A & B" / "A feat. B" → "a")"""
+    for separator in (',', ' & ', ' feat. ', ' ft. ', ' x '):
+        artists = artists.split(separator)[0]
+    return normalize_text(artists)
+
+
+def track_key(title: str, artists: str) -> str:
+    """Normalized identity of a song, independent of (feat. ...) and remaster suffixes"""
+    return f"{normalize_title(title)}|{primary_artist(artists)}"
+
+
+class ExistingPlaylistIndex:
+    """Items of a YouTube playlist indexed by videoId and normalized key"""
+
+    def __init__(self, items: List[Dict]):
+        self.size = 0
+        self._by_video = defaultdict(deque)
+        self._by_key = defaultdict(deque)
+        self._claimed = set()
+
+        for item in items:
+            if not item or not item.get('videoId'):
+                continue
+            artists = ', '.join(artist['name'] for artist in item.get('artists') or [])
+            self._by_video[item['videoId']].append(self.size)
+            self._by_key[track_key(item.get('title') or '', artists)].append(self.size)
+            self.size += 1
+
+    def _claim(self, positions: deque) -> bool:
+        # Skip items already claimed through the other index (amortized O(1))
+        while positions:
+            position = positions.popleft()
+            if position not in self._claimed:
+                self._claimed.add(position)
+                return True
+        return False
+
+    def claim_video(self, video_id: Optional[str]) -> bool:
+        """Mark one unclaimed item with this videoId as matched"""
+        return bool(video_id) and self._claim(self._by_video.get(video_id, deque()))
+
+    def claim_key(self, track: Track) -> bool:
+        """Mark one unclaimed item with the track's normalized key as matched"""
+        return self._claim(self._by_key.get(track_key(track.name, track.artist), deque()))
+
+
+def all_pages(spotify: spotipy.Spotify, page: Dict) -> List[Dict]:
+    """Items of a Spotify paging object and all of its following pages"""
+    items = []
+    while page:
+        items.extend(page['items'])
+        page = spotify.next(page) if page['next'] else None
+    return items
+
+
+def cached_video_id(search_cache: SearchCache, track: Track) -> Tuple[bool, Optional[str]]:
+    """
+    Search result known without a search call (ISRC index or search cache)
+
+    Returns (found, video_id) like SearchCache.get: video_id is None with
+    found True for a cached "not found", which is not searched again.
+    """
+    video_id = search_cache.get_isrc(track.isrc) if track.isrc else None
+    if video_id:
+        return True, video_id
+    return search_cache.get(f"{track.name} {track.artist}")
+
+
+def reconcile(tracks: List[Track], index: ExistingPlaylistIndex,
+              search_cache: SearchCache) -> Tuple[int, List[Tuple[Track, Optional[str]]]]:
+    """
+    Match Spotify tracks to existing items without any search call
+
+    Returns (tracks already present, [(track, cached, videoId or None)] missing)
+    where cached tells a known result (possibly "not found") from a cache miss
+    """
+    present = 0
+    missing = []
+    for track in tracks:
+        cached, video_id = cached_video_id(search_cache, track)
+        if index.claim_video(video_id) or index.claim_key(track):
+            present += 1
+        else:
+            missing.append((track, cached, video_id))
+    return present, missing
+
+
+def choose(items: List[Dict], label, prompt: str) -> Dict:
+    for i, item in enumerate(items, 1):
+        print(f"  {i}. {label(item)}")
+    choice = input(f"\n{prompt}").strip()
+    return items[int(choice) - 1]
+
+
+def main():
+    load_dotenv()
+
+    # Initialize APIs
+    spotify = spotipy.Spotify(auth_manager=SpotifyOAuth(
+        client_id=os.getenv('SPOTIFY_CLIENT_ID'),
+        client_secret=os.getenv('SPOTIFY_CLIENT_SECRET'),
+        redirect_uri=os.getenv('SPOTIFY_REDIRECT_URI'),
+        scope='playlist-read-private playlist-read-collaborative'
+    ))
+
+    ytmusic = YTMusic('oauth.json') if os.path.exists('oauth.json') else YTMusic('headers_auth.json')
+    search_cache = SearchCache()
+    review_queue = ReviewQueue()
+    match_candidates = int(os.getenv('MATCH_CANDIDATES', DEFAULT_MATCH_CANDIDATES))
+    min_confidence = float(os.getenv('MATCH_MIN_CONFIDENCE', DEFAULT_MIN_CONFIDENCE))
+
+    # Get Spotify playlists (all pages)
+    playlists = all_pages(spotify, spotify.current_user_playlists(limit=50))
+
+    print("📋 Your Spotify playlists:\n")
+    spotify_playlist = choose(playlists, lambda pl: f"{pl['name']} ({pl['tracks']['total']} tracks)",
+                              "Select Spotify playlist number: ")
+
+    print(f"\n📥 Fetching tracks from Spotify playlist: {spotify_playlist['name']}")
+    all_tracks = [Track.from_spotify(item['track'])
+                  for item in all_pages(spotify, spotify.playlist_tracks(spotify_playlist['id']))
+                  if item['track']]
+    print(f"   Found {len(all_tracks)} tracks in Spotify")
+
+    # Get YouTube Music playlists (limit=None: every page)
+    yt_playlists = ytmusic.get_library_playlists(limit=None)
+
+    print(f"\n📋 Your YouTube Music playlists:\n")
+    yt_playlist = choose(yt_playlists, lambda pl: f"{pl['title']} ({pl.get('count', '?')} tracks)",
+                         "Select YouTube Music playlist number to add to: ")
+    yt_playlist_id = yt_playlist['playlistId']
+
+    print(f"\n📥 Getting current tracks in YouTube Music playlist: {yt_playlist['title']}")
+    existing_playlist = ytmusic.get_playlist(yt_playlist_id, limit=None)
+    index = ExistingPlaylistIndex(existing_playlist.get('tracks') or [])
+    print(f"   Currently has {index.size} tracks")
+
+    # Find tracks that need to be added
+    print(f"\n🔍 Finding tracks that need to be added...")
+    present, tracks_to_add = reconcile(all_tracks, index, search_cache)
+    print(f"   {present} already in the playlist, need to add up to {len(tracks_to_add)} more tracks")
+
+    if not tracks_to_add:
+        print("\n✅ All tracks are already in the playlist!")
+        sys.exit(0)
+
+    confirm = input(f"\nAdd {len(tracks_to_add)} remaining tracks? (yes/no): ").strip().lower()
+    if confirm != 'yes':
+        print("❌ Cancelled")
+        sys.exit(0)
+
+    # Search the remaining tracks
+    print(f"\n🔍 Searching for tracks on YouTube Music...")
+    video_ids = []
+    not_found_count = 0
+    review_count = 0
+    already_count = 0
+
+    for i, (track, cached, video_id) in enumerate(tracks_to_add, 1):
+        print(f"   [{i}/{len(tracks_to_add)}] {track.name} - {track.artist}", end="")
+
+        if not cached:
+            query = f"{track.name} {track.artist}"
             try:
-                ytmusic.add_playlist_items(yt_playlist_id, [video_id])
-                added_count += 1
-                print(" ✓")
+                results = ytmusic.search(query, filter='songs', limit=match_candidates)
             except Exception as e:
-                print(f" ✗ Error adding: {str(e)[:30]}")
-        else:
+                print(f" ✗ Search error: {str(e)[:30]}")
+                continue
+            candidate = {'name': track.name, 'artist': track.artist, 'duration_ms': track.duration_ms}
+            ranked = rank_candidates(candidate, results[:match_candidates])
+            if ranked and ranked[0][0] < min_confidence:
+                # Not cached: the cache (and ISRC index) is shared with spotify_to_youtube.py
+                if review_queue.add(candidate, ranked):
+                    review_count += 1
+                    print(f" ✗ Low confidence ({ranked[0][0]:.2f}), queued for review")
+                else:
+                    print(f" ✗ Low confidence ({ranked[0][0]:.2f}), already queued for review")
+                continue
+            video_id = ranked[0][1]['videoId'] if ranked else None
+            search_cache.set(query, video_id)
+            if video_id and track.isrc:
+                search_cache.set_isrc(track.isrc, video_id)
+
+        if not video_id:
             not_found_count += 1
             print(" ✗ Not found")
-    except Exception as e:
-        print(f" ✗ Search error: {str(e)[:30]}")
-    
-    # Show progress every 10 tracks
-    if i % 10 == 0:
-        print(f"   Progress: {added_count} added, {not_found_count} not found")
-
-print(f"\n✅ Done! Added {added_count}/{len(tracks_to_add)} remaining tracks")
-print(f"   Total in playlist now: {len(existing_tracks) + added_count} tracks")
+        elif index.claim_video(video_id):
+            # Listed under another title/artist (translation, credits)
+            already_count += 1
+            print(" ✓ Already in playlist")
+        else:
+            video_ids.append(video_id)
+            print(" ✓")
+
+    # Add in batches, in Spotify order
+    print(f"\n➕ Adding {len(video_ids)} tracks...")
+    added_count = 0
+    for start in range(0, len(video_ids), ADD_BATCH_SIZE):
+        batch = video_ids[start:start + ADD_BATCH_SIZE]
+        try:
+            ytmusic.add_playlist_items(yt_playlist_id, batch, duplicates=True)
+            added_count += len(batch)
+        except Exception as e:
+            print(f"   ✗ Error adding tracks {start + 1}-{start + len(batch)}: {str(e)[:60]}")
+        print(f"   Progress: {added_count}/{len(video_ids)} added")
+
+    print(f"\n✅ Done! Added {added_count}/{len(tracks_to_add)} remaining tracks")
+    print(f"   {already_count} were already in the playlist, {not_found_count} not found")
+    if review_count:
+        print(f"   🔎 {review_count} low-confidence matches queued for review in {review_queue.path}")
+    print(f"   Total in playlist now: {index.size + added_count} tracks")
+    search_cache.print_summary()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Event Log
+Structured progress events, one JSON object per line
+
+Disabled by default (emit() is a no-op). With `--output json` events are
+written to stdout and the usual emoji progress goes to stderr, so stdout
+can be piped straight into a log pipeline.
+
+Every event has "ts" (Unix time), "event" and event-specific fields:
+- track_fetched:  playlist, track, page_latency_ms
+- cache_hit:      source ("search" or "isrc"), query / isrc, video_id
+- search_hit / search_miss / search_review / search_error:
+                  query, video_id, score, latency_ms, error
+- add_ok / add_failed: playlist, video_id, position, batch_latency_ms,
+                  units, error
+- api_call:       operation, latency_ms, units, error
+- playlist_done:  playlist, tracks, found, added, elapsed_s, units
+- run_summary:    ApiMetrics.summary() plus cache statistics
+- job_done:       job, account, exit_code, elapsed_s, budget_remaining
+                  (account_worker.py)
+"""
+
+import sys
+import json
+import time
+import threading
+from contextlib import contextmanager
+from typing import Any, TextIO
+
+_lock = threading.Lock()
+_stream: TextIO = None
+
+
+def enabled() -> bool:
+    return _stream is not None
+
+
+def enable(stream: TextIO) -> None:
+    """Send events to stream (None disables)"""
+    global _stream
+    _stream = stream
+
+
+def emit(event: str, **fields: Any) -> None:
+    """Write one event line (thread-safe; no-op when disabled)"""
+    if _stream is None:
+        return
+    record = {'ts': round(time.time(), 3), 'event': event}
+    record.update((key, value) for key, value in fields.items() if value is not None)
+    line = json.dumps(record, ensure_ascii=False, default=str) + '\n'
+    with _lock:
+        _stream.write(line)
+        _stream.flush()
+
+
+@contextmanager
+def json_output():
+    """Events on stdout, human-readable output moved to stderr"""
+    original = sys.stdout
+    enable(original)
+    sys.stdout = sys.stderr
+    try:
+        yield
+    finally:
+        sys.stdout = original
+        enable(None)
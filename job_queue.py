@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+Job Queue
+Durable queue of transfer, sync and continue jobs in a local SQLite database
+
+Jobs survive restarts: each row keeps its state (queued, running, done,
+failed, cancelled), priority (higher first), attempt count and the time it
+becomes eligible again. A job stopped by the daily quota (or its account's
+budget, see account_worker.py) waits for the Pacific-time reset without
+using up an attempt; other failures are retried with backoff up to
+max_attempts. Transfers resume from their journals, so a retried or
+interrupted job never adds a track twice.
+
+    python3 job_queue.py submit 37i9dQZF1DXcBWIGoYBM5M 5ABHKGoOzxkaa28ttQV9sE
+    python3 job_queue.py submit --kind sync --account alice --priority 5 1h0CEZCm6IbFTbxThn6Xcs
+    python3 job_queue.py submit --file jobs.jsonl      # {"kind": ..., "account": ..., batch job spec}
+    python3 job_queue.py worker --drain
+    python3 job_queue.py status
+
+The worker drains the queue with ACCOUNT_WORKERS threads, one account at a
+time per thread and accounts taking turns. Queued jobs of the same
+account, kind and options are claimed together (up to QUEUE_BATCH
+jobs) and run as one batch, so their searches share the pipeline and
+the search cache. Run one worker process per queue database: on start it
+re-queues the jobs a previous worker left running.
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import threading
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import event_log
+from account_worker import AccountWorker, accounts_dir, check_account_id
+from batch_jobs import BatchJob, JobError, MODES, EXIT_OK, EXIT_ERROR, EXIT_INVALID_JOB
+from console_output import prefixed_stdout
+from quota_scheduler import QuotaLedger, ADD_COST
+from rate_limiter import QuotaExceededError, backoff_delay
+
+STATES = ('queued', 'running', 'done', 'failed', 'cancelled')
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BATCH = 25
+RETRY_BASE = 60.0     # seconds before the first retry
+RETRY_CAP = 6 * 3600  # longest wait between retries
+POLL_INTERVAL = 5.0   # seconds an idle worker thread waits before looking again
+
+
+class JobQueue:
+    """SQLite-backed job queue (thread-safe: one connection guarded by a lock)"""
+
+    DEFAULT_PATH = "job_queue.db"
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or os.getenv('JOB_QUEUE_PATH', self.DEFAULT_PATH)
+        self.max_attempts = int(os.getenv('JOB_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS))
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id           INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind         TEXT NOT NULL,
+                account      TEXT,
+                spec         TEXT NOT NULL,
+                batch_key    TEXT,
+                state        TEXT NOT NULL DEFAULT 'queued',
+                priority     INTEGER NOT NULL DEFAULT 0,
+                attempts     INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                next_run_at  REAL NOT NULL,
+                created_at   REAL NOT NULL,
+                updated_at   REAL NOT NULL,
+                exit_code    INTEGER,
+                last_error   TEXT
+            )
+            """
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs (state, priority DESC, next_run_at)"
+        )
+        self.conn.commit()
+
+    @staticmethod
+    def parse(kind: str, spec: Dict[str, Any], account: str = None) -> BatchJob:
+        """Validate a job the way the worker will run it"""
+        if kind not in MODES:
+            raise JobError(f"kind must be one of {', '.join(MODES)}")
+        if account is not None:
+            check_account_id(account)
+            if not (accounts_dir() / account).is_dir():
+                raise JobError(f"unknown account {account!r} "
+                               f"(run: python3 account_worker.py --enroll {account})")
+        return BatchJob(dict(spec, mode=kind))
+
+    def submit(self, kind: str, spec: Dict[str, Any], account: str = None, priority: int = 0,
+               max_attempts: int = None, run_at: float = None) -> int:
+        """Queue one job; returns its ID"""
+        return self.submit_many([{'kind': kind, 'spec': spec, 'account': account,
+                                  'priority': priority, 'max_attempts': max_attempts,
+                                  'run_at': run_at}])[0]
+
+    def submit_many(self, jobs: Iterable[Dict[str, Any]]) -> List[int]:
+        """
+        Queue many jobs in one transaction (all or none)
+
+        Each job is a dict with 'kind', 'spec' (batch job spec without mode)
+        and optionally 'account', 'priority', 'max_attempts' and 'run_at'.
+        """
+        now = time.time()
+        rows = []
+        for job in jobs:
+            spec = dict(job['spec'], mode=job['kind'])
+            batch = self.parse(job['kind'], job['spec'], job.get('account'))
+            # Jobs with equal account, kind and options can run as one batch
+            options = {key: value for key, value in spec.items() if key != 'playlists'}
+            batch_key = None if batch.all_playlists else json.dumps(
+                [job.get('account'), options], sort_keys=True)
+            rows.append((job['kind'], job.get('account'), json.dumps(spec), batch_key,
+                         int(job.get('priority') or 0), job.get('max_attempts') or self.max_attempts,
+                         job.get('run_at') or now, now, now))
+
+        with self._lock:
+            with self.conn:
+                self.conn.execute("BEGIN IMMEDIATE")
+                first = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM jobs").fetchone()[0]
+                self.conn.executemany(
+                    "INSERT INTO jobs (kind, account, spec, batch_key, priority, max_attempts, "
+                    "next_run_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                ids = [row[0] for row in self.conn.execute(
+                    "SELECT id FROM jobs WHERE id > ? ORDER BY id", (first,))]
+        return ids
+
+    def claim(self, busy_accounts: Iterable[Optional[str]] = (), limit: int = 1) -> List[Dict[str, Any]]:
+        """
+        Mark the next eligible job running, plus up to limit - 1 more of the
+        same batch (account, kind and options)
+
+        Jobs of busy accounts are skipped. Returns [] when nothing is eligible.
+        """
+        busy = [account or '' for account in busy_accounts]
+        now = time.time()
+        with self._lock:
+            with self.conn:
+                self.conn.execute("BEGIN IMMEDIATE")
+                first = self.conn.execute(
+                    "SELECT * FROM jobs WHERE state = 'queued' AND next_run_at <= ? "
+                    f"AND COALESCE(account, '') NOT IN ({', '.join('?' * len(busy))}) "
+                    "ORDER BY priority DESC, next_run_at, id LIMIT 1", [now] + busy
+                ).fetchone()
+                if first is None:
+                    return []
+                rows = [first]
+                if first['batch_key'] is not None and limit > 1:
+                    rows += self.conn.execute(
+                        "SELECT * FROM jobs WHERE state = 'queued' AND next_run_at <= ? "
+                        "AND batch_key = ? AND id != ? ORDER BY priority DESC, next_run_at, id LIMIT ?",
+                        (now, first['batch_key'], first['id'], limit - 1)
+                    ).fetchall()
+                self.conn.executemany("UPDATE jobs SET state = 'running', updated_at = ? WHERE id = ?",
+                                      [(now, row['id']) for row in rows])
+        return [dict(row) for row in rows]
+
+    def _update(self, sql: str, params: Iterable) -> int:
+        with self._lock:
+            with self.conn:
+                return self.conn.execute(sql, tuple(params)).rowcount
+
+    def complete(self, job_id: int, exit_code: int = EXIT_OK) -> None:
+        self._update("UPDATE jobs SET state = 'done', exit_code = ?, last_error = NULL, "
+                     "updated_at = ? WHERE id = ?", (exit_code, time.time(), job_id))
+
+    def fail(self, job_id: int, exit_code: int, error: str, retry: bool = True) -> bool:
+        """
+        Record a failed attempt; re-queue with backoff while attempts remain
+
+        Returns True if the job will be retried.
+        """
+        with self._lock:
+            with self.conn:
+                row = self.conn.execute("SELECT attempts, max_attempts, next_run_at FROM jobs WHERE id = ?",
+                                        (job_id,)).fetchone()
+                attempts = row['attempts'] + 1
+                retry = retry and attempts < row['max_attempts']
+                now = time.time()
+                delay = RETRY_BASE + backoff_delay(attempts, base=RETRY_BASE, cap=RETRY_CAP)
+                self.conn.execute(
+                    "UPDATE jobs SET state = ?, attempts = ?, exit_code = ?, last_error = ?, "
+                    "next_run_at = ?, updated_at = ? WHERE id = ?",
+                    ('queued' if retry else 'failed', attempts, exit_code, error[:500],
+                     now + delay if retry else row['next_run_at'], now, job_id))
+        return retry
+
+    def defer(self, job_id: int, run_at: float, reason: str = None) -> None:
+        """Re-queue for later without counting an attempt (quota, budget)"""
+        self._update("UPDATE jobs SET state = 'queued', next_run_at = ?, last_error = ?, "
+                     "updated_at = ? WHERE id = ?", (run_at, reason, time.time(), job_id))
+
+    def defer_account(self, account: Optional[str], run_at: float) -> int:
+        """Hold every queued job of an account until run_at (budget exhausted)"""
+        return self._update("UPDATE jobs SET next_run_at = ?, updated_at = ? WHERE state = 'queued' "
+                            "AND COALESCE(account, '') = ? AND next_run_at < ?",
+                            (run_at, time.time(), account or '', run_at))
+
+    def requeue_running(self) -> int:
+        """Put jobs left running by a stopped worker back in the queue"""
+        return self._update("UPDATE jobs SET state = 'queued', updated_at = ? WHERE state = 'running'",
+                            (time.time(),))
+
+    def retry(self, job_ids: Iterable[int] = None) -> int:
+        """Re-queue failed or cancelled jobs now with fresh attempts (None: every failed job)"""
+        now = time.time()
+        if job_ids is None:
+            return self._update("UPDATE jobs SET state = 'queued', attempts = 0, next_run_at = ?, "
+                                "updated_at = ? WHERE state = 'failed'", (now, now))
+        job_ids = list(job_ids)
+        return self._update(
+            "UPDATE jobs SET state = 'queued', attempts = 0, next_run_at = ?, updated_at = ? "
+            f"WHERE state IN ('failed', 'cancelled') AND id IN ({', '.join('?' * len(job_ids))})",
+            [now, now] + job_ids)
+
+    def cancel(self, job_ids: Iterable[int]) -> int:
+        """Cancel queued jobs (running ones finish their current run)"""
+        job_ids = list(job_ids)
+        return self._update(
+            "UPDATE jobs SET state = 'cancelled', updated_at = ? "
+            f"WHERE state = 'queued' AND id IN ({', '.join('?' * len(job_ids))})",
+            [time.time()] + job_ids)
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self.conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        counts = dict.fromkeys(STATES, 0)
+        counts.update((state, count) for state, count in rows)
+        return counts
+
+    def eligible(self) -> int:
+        """Queued jobs that could run now"""
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM jobs WHERE state = 'queued' AND next_run_at <= ?",
+                                     (time.time(),)).fetchone()[0]
+
+    def next_run_at(self) -> Optional[float]:
+        """When the earliest queued job becomes eligible"""
+        with self._lock:
+            return self.conn.execute("SELECT MIN(next_run_at) FROM jobs WHERE state = 'queued'").fetchone()[0]
+
+    def jobs(self, state: str = None, limit: int = 50) -> List[Dict[str, Any]]:
+        with self._lock:
+            if state:
+                rows = self.conn.execute("SELECT * FROM jobs WHERE state = ? ORDER BY id LIMIT ?",
+                                         (state, limit)).fetchall()
+            else:
+                rows = self.conn.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+
+class QueueWorker(AccountWorker):
+    """AccountWorker fed from a JobQueue instead of an in-memory queue"""
+
+    def __init__(self, job_queue: JobQueue, workers: int = None, batch_size: int = None,
+                 idle_ttl: float = None, root: str = None):
+        super().__init__(root, workers, idle_ttl)
+        self.queue = job_queue
+        self.batch_size = batch_size or int(os.getenv('QUEUE_BATCH', DEFAULT_BATCH))
+
+    def idle(self) -> bool:
+        """No job running and none eligible now"""
+        with self._lock:
+            return not self._active and not self.queue.eligible()
+
+    def run(self, drain: bool = False) -> None:
+        """Work until interrupted (drain: until nothing is left to run now)"""
+        stale = self.queue.requeue_running()
+        if stale:
+            print(f"♻️  {stale} interrupted jobs re-queued")
+        counts = self.queue.counts()
+        print(f"\n🗂️  Job queue {self.queue.db_path}: {counts['queued']} queued, "
+              f"{self.workers} workers, batches of up to {self.batch_size} jobs")
+
+        self.start()
+        try:
+            while not (drain and self.idle()):
+                self._stopping.wait(POLL_INTERVAL)
+        except KeyboardInterrupt:
+            print("\n\n👋 Stopping after the running jobs (they resume on the next start)")
+        finally:
+            self.stop()
+
+        counts = self.queue.counts()
+        print(f"\n📊 Job queue: {counts['done']} done, {counts['queued']} queued, "
+              f"{counts['failed']} failed")
+        next_run = self.queue.next_run_at()
+        if counts['queued'] and next_run:
+            print(f"   ⏰ Next job eligible at {datetime.fromtimestamp(next_run):%Y-%m-%d %H:%M}")
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            with self._lock:
+                rows = self.queue.claim(self._active, self.batch_size)
+                if rows:
+                    self._active.add(rows[0]['account'])
+            if not rows:
+                self._evict_idle()
+                self._stopping.wait(POLL_INTERVAL)
+                continue
+            try:
+                self._process(rows)
+            except Exception as e:
+                # Never lose a claimed job to a worker bug: count it as a failed attempt
+                for row in rows:
+                    self.queue.fail(row['id'], EXIT_ERROR, f"worker error: {e}")
+            finally:
+                with self._lock:
+                    self._active.discard(rows[0]['account'])
+
+    def _process(self, rows: List[Dict[str, Any]]) -> None:
+        """Run claimed jobs (one account) as one batch and record each outcome"""
+        account = rows[0]['account']
+        try:
+            context = self.account(account)
+            jobs = [BatchJob(json.loads(row['spec'])) for row in rows]
+        except (JobError, ValueError, OSError) as e:
+            for row in rows:
+                self.queue.fail(row['id'], EXIT_INVALID_JOB, str(e), retry=False)
+            return
+
+        wait = self._quota_wait(context)
+        if wait:
+            run_at = time.time() + wait + 60
+            for row in rows:
+                self.queue.defer(row['id'], run_at, "quota budget exhausted")
+            held = self.queue.defer_account(account, run_at)
+            hours, minutes = divmod(int(wait) // 60, 60)
+            print(f"⏸️  [{context.name}] quota budget exhausted: {len(rows) + held} jobs wait for "
+                  f"the reset (in {hours}h{minutes:02d}m)")
+            return
+
+        batch = self._merge(jobs, rows)
+        code = self._run_job(context, batch.path, batch)
+        quota_left = context.ledger.remaining() >= ADD_COST
+
+        for row, job in zip(rows, jobs):
+            if job.all_playlists:
+                outcomes = {} if code == EXIT_OK else {'all': code}
+            else:
+                outcomes = {playlist['id']: batch.results.get(playlist['id'])
+                            for playlist in job.playlists}
+            unfinished = {playlist_id: result for playlist_id, result in outcomes.items()
+                          if result is not True}
+
+            if not unfinished:
+                self.queue.complete(row['id'])
+            elif not quota_left or any(isinstance(result, QuotaExceededError)
+                                       for result in unfinished.values()):
+                # Not a failure: resumes from the journals after the reset
+                self.queue.defer(row['id'], time.time() + QuotaLedger.seconds_until_reset() + 60,
+                                 "stopped by the daily quota")
+            else:
+                error = "; ".join(f"{playlist_id}: {'unfinished' if result in (None, False) else result}"
+                                  for playlist_id, result in unfinished.items()) or f"exit {code}"
+                retried = self.queue.fail(row['id'], code or EXIT_ERROR, error)
+                if not retried:
+                    print(f"❌ [{context.name}] job #{row['id']} failed for good: {error[:120]}")
+
+    @staticmethod
+    def _merge(jobs: List[BatchJob], rows: List[Dict[str, Any]]) -> BatchJob:
+        """One BatchJob running the playlists of several claimed jobs"""
+        batch = jobs[0]
+        if len(jobs) > 1:
+            batch = BatchJob(json.loads(rows[0]['spec']))
+            seen = {playlist['id'] for playlist in batch.playlists}
+            for job in jobs[1:]:
+                for playlist in job.playlists:
+                    if playlist['id'] not in seen:  # Same playlist twice: one journal, one run
+                        seen.add(playlist['id'])
+                        batch.playlists.append(dict(playlist))
+        ids = [row['id'] for row in rows]
+        batch.path = f"job #{ids[0]}" if len(ids) == 1 else f"{len(ids)} jobs from #{min(ids)}"
+        return batch
+
+
+def read_job_lines(lines: Iterable[str]) -> List[Dict[str, Any]]:
+    """Parse JSON-lines jobs: "kind", "account", "priority", "max_attempts" + batch job spec"""
+    jobs = []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            spec = json.loads(line)
+        except ValueError as e:
+            raise JobError(f"line {number}: {e}")
+        if not isinstance(spec, dict):
+            raise JobError(f"line {number}: job must be an object")
+        job = {key: spec.pop(key, None) for key in ('kind', 'account', 'priority', 'max_attempts')}
+        job['kind'] = job['kind'] or spec.pop('mode', 'transfer')
+        spec.pop('mode', None)
+        job['spec'] = spec
+        jobs.append(job)
+    return jobs
+
+
+def print_status(job_queue: JobQueue) -> None:
+    counts = job_queue.counts()
+    print(f"\n🗂️  Job queue {job_queue.db_path}")
+    print("   " + ", ".join(f"{state}: {count}" for state, count in counts.items()))
+    next_run = job_queue.next_run_at()
+    if counts['queued'] and next_run:
+        when = "now" if next_run <= time.time() else f"{datetime.fromtimestamp(next_run):%Y-%m-%d %H:%M}"
+        print(f"   ⏰ Next job eligible: {when}")
+    for job in job_queue.jobs('failed', limit=20):
+        print(f"   ❌ #{job['id']} {job['kind']} [{job['account'] or 'default'}] "
+              f"after {job['attempts']} attempts: {(job['last_error'] or '')[:80]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Durable transfer job queue (SQLite)")
+    parser.add_argument('--db', metavar='FILE', help="queue database (env: JOB_QUEUE_PATH)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    submit = commands.add_parser('submit', help="queue one job per playlist ID (or jobs from a file)")
+    submit.add_argument('playlists', nargs='*', metavar='PLAYLIST_ID')
+    submit.add_argument('--kind', choices=MODES, default='transfer')
+    submit.add_argument('--account', help="account directory (default: the working directory's credentials)")
+    submit.add_argument('--priority', type=int, default=0, help="higher runs first")
+    submit.add_argument('--max-attempts', type=int, help="env: JOB_MAX_ATTEMPTS")
+    submit.add_argument('--privacy', choices=('private', 'unlisted', 'public'), default='private')
+    submit.add_argument('--file', metavar='FILE', help="JSON-lines jobs ('-': stdin)")
+
+    worker = commands.add_parser('worker', help="drain the queue")
+    worker.add_argument('--workers', type=int, metavar='N', help="env: ACCOUNT_WORKERS")
+    worker.add_argument('--batch', type=int, metavar='N', help="jobs claimed per batch (env: QUEUE_BATCH)")
+    worker.add_argument('--drain', action='store_true', help="exit when nothing is eligible to run")
+    worker.add_argument('--output', choices=('text', 'json'), default='text',
+                        help="json: JSON-lines events on stdout, progress text on stderr")
+
+    commands.add_parser('status', help="job counts and failed jobs")
+    retry = commands.add_parser('retry', help="re-queue failed jobs (no IDs: all of them)")
+    retry.add_argument('ids', nargs='*', type=int)
+    cancel = commands.add_parser('cancel', help="cancel queued jobs")
+    cancel.add_argument('ids', nargs='+', type=int)
+    args = parser.parse_args()
+
+    job_queue = JobQueue(args.db)
+    try:
+        if args.command == 'submit':
+            if args.file:
+                with open(0 if args.file == '-' else args.file, 'r', encoding='utf-8') as f:
+                    jobs = read_job_lines(f)
+            elif args.playlists or args.kind == 'continue':
+                spec = {'privacy': args.privacy}
+                jobs = [{'kind': args.kind, 'account': args.account, 'priority': args.priority,
+                         'max_attempts': args.max_attempts,
+                         'spec': dict(spec, playlists=[playlist_id]) if playlist_id else spec}
+                        for playlist_id in (args.playlists or [None])]
+            else:
+                parser.error("submit needs playlist IDs or --file")
+            ids = job_queue.submit_many(jobs)
+            print(f"📥 {len(ids)} jobs queued" + (f" (#{ids[0]}..#{ids[-1]})" if len(ids) > 1 else
+                                                 f" (#{ids[0]})" if ids else ""))
+        elif args.command == 'worker':
+            with event_log.json_output() if args.output == 'json' else nullcontext(), prefixed_stdout():
+                QueueWorker(job_queue, args.workers, args.batch).run(drain=args.drain)
+        elif args.command == 'status':
+            print_status(job_queue)
+        elif args.command == 'retry':
+            print(f"♻️  {job_queue.retry(args.ids or None)} jobs re-queued")
+        elif args.command == 'cancel':
+            print(f"🚫 {job_queue.cancel(args.ids)} jobs cancelled")
+    except JobError as e:
+        print(f"❌ Invalid job: {e}")
+        sys.exit(EXIT_INVALID_JOB)
+    finally:
+        job_queue.close()
+
+
+if __name__ == '__main__':
+    main()
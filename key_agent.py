@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Key Agent
+Local process that holds the unlocked encryption key (like ssh-agent)
+
+Start it once, unlock the key once (keyring or password + PBKDF2), and
+every following run - scheduled ones included - fetches the key from a
+Unix socket instead of touching the keyring or re-running the KDF.
+
+    python3 key_agent.py             # run in the foreground (Ctrl+C stops it)
+    python3 key_agent.py --ttl 3600  # forget the key and exit after 1h
+    python3 key_agent.py --stop      # stop a running agent
+
+Security:
+- Socket lives in a private (0700) directory and is itself 0600
+- Only connections from the same user id are answered (SO_PEERCRED), and
+  clients only trust a socket and directory owned by their user (0700)
+- Set KEY_AGENT_SOCK to choose the socket path, or KEY_AGENT_SOCK=off to
+  never use an agent (platforms without Unix sockets never use one)
+"""
+
+import os
+import sys
+import stat
+import base64
+import socket
+import struct
+import tempfile
+import argparse
+import threading
+import socketserver
+from pathlib import Path
+from typing import Optional
+
+CONNECT_TIMEOUT = 1.0  # seconds
+
+
+def agent_socket_path() -> Optional[Path]:
+    """
+    Socket path from KEY_AGENT_SOCK, or the per-user default (None if
+    disabled or unsupported: no Unix sockets / user ids, e.g. Windows)
+    """
+    configured = os.getenv('KEY_AGENT_SOCK')
+    if configured == 'off' or not hasattr(os, 'getuid') or not hasattr(socket, 'AF_UNIX'):
+        return None
+    if configured:
+        return Path(configured)
+    return Path(tempfile.gettempdir()) / f"spotify-to-youtube-{os.getuid()}" / "agent.sock"
+
+
+def _trusted(path: Path) -> bool:
+    """
+    The socket and its directory belong to this user and the directory is
+    private (0700), as KeyAgentServer creates them - otherwise another user
+    could answer GET with a key of their choosing
+    """
+    try:
+        directory = os.lstat(path.parent)
+        sock = os.lstat(path)
+    except OSError:
+        return False
+    uid = os.getuid()
+    return (stat.S_ISDIR(directory.st_mode) and directory.st_uid == uid
+            and stat.S_IMODE(directory.st_mode) == 0o700
+            and stat.S_ISSOCK(sock.st_mode) and sock.st_uid == uid)
+
+
+def _request(command: bytes) -> Optional[bytes]:
+    path = agent_socket_path()
+    if path is None or not path.exists():
+        return None
+    if not _trusted(path):
+        print(f"⚠️  Ignorando agente de chave com dono ou permissões inseguras: {path}")
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(CONNECT_TIMEOUT)
+            client.connect(str(path))
+            client.sendall(command + b"\n")
+            return client.makefile('rb').readline().strip()
+    except OSError:
+        return None
+
+
+def fetch_key() -> Optional[bytes]:
+    """Encryption key held by a running agent, or None"""
+    reply = _request(b"GET")
+    if not reply:
+        return None
+    try:
+        return base64.urlsafe_b64decode(reply)
+    except ValueError:
+        return None
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        if not self.server.same_user(self.request):
+            return
+        command = self.rfile.readline().strip()
+        if command == b"GET":
+            self.wfile.write(base64.urlsafe_b64encode(self.server.key) + b"\n")
+        elif command == b"STOP":
+            self.wfile.write(b"OK\n")
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+
+class KeyAgentServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server handing out the key to processes of the same user"""
+
+    daemon_threads = True
+
+    def __init__(self, path: Path, key: bytes):
+        self.key = key
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        os.chmod(path.parent, 0o700)
+        path.unlink(missing_ok=True)
+        super().__init__(str(path), _Handler)
+        os.chmod(path, 0o600)
+
+    @staticmethod
+    def same_user(connection: socket.socket) -> bool:
+        peercred = getattr(socket, 'SO_PEERCRED', None)
+        if peercred is None:
+            return True  # Not Linux: rely on the socket's file permissions
+        creds = connection.getsockopt(socket.SOL_SOCKET, peercred, struct.calcsize('3i'))
+        _, uid, _ = struct.unpack('3i', creds)
+        return uid == os.getuid()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hold the unlocked encryption key for later runs")
+    parser.add_argument('--ttl', type=float, help="seconds until the agent forgets the key and exits")
+    parser.add_argument('--stop', action='store_true', help="stop the running agent")
+    args = parser.parse_args()
+
+    path = agent_socket_path()
+    if path is None:
+        print("❌ Agente desativado (KEY_AGENT_SOCK=off ou sistema sem sockets Unix)")
+        sys.exit(1)
+
+    if args.stop:
+        print("✅ Agente parado" if _request(b"STOP") == b"OK" else "ℹ️  Nenhum agente rodando")
+        return
+
+    if fetch_key():
+        print(f"ℹ️  Agente já está rodando em {path}")
+        return
+
+    # Unlock once (keyring or password); the agent itself must not ask an agent
+    os.environ['KEY_AGENT_SOCK'] = 'off'
+    from security_manager import SecureTokenManager
+    key = SecureTokenManager().key
+
+    server = KeyAgentServer(path, key)
+    if args.ttl:
+        timer = threading.Timer(args.ttl, server.shutdown)
+        timer.daemon = True
+        timer.start()
+
+    print(f"🔑 Agente de chave rodando em {path}")
+    print(f"   export KEY_AGENT_SOCK={path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        path.unlink(missing_ok=True)
+        server.key = b""
+        print("🔒 Agente parado, chave descartada")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Match Scoring
+Ranks YouTube Music search results against the Spotify track
+
+Instead of blindly taking the first result, every candidate from one search
+call gets a confidence score (0-1) from:
+- normalized title similarity
+- artist overlap
+- duration difference against Spotify's duration_ms
+with a penalty for live/cover/karaoke/... versions the Spotify title does
+not ask for. Low-confidence matches go to a review queue instead of the
+playlist.
+"""
+
+import re
+import json
+import threading
+import unicodedata
+from datetime import datetime
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Set, Tuple, Any
+
+# Version markers that usually mean "not the studio recording"
+VERSION_MARKERS = (
+    'live', 'karaoke', 'cover', 'instrumental', 'remix', 'acoustic',
+    'sped up', 'slowed', 'nightcore', '8d', 'tribute', 'reverb'
+)
+
+_BRACKETS = re.compile(r'[\(\[][^\)\]]*[\)\]]')
+_FEAT = re.compile(r'\s(feat|ft|featuring)\.?\s.*$')
+_SUFFIX = re.compile(r'\s-\s.*(remaster|version|edit|mono|stereo).*$')
+_NON_WORD = re.compile(r'[^\w\s]')
+
+TITLE_WEIGHT = 0.45
+ARTIST_WEIGHT = 0.35
+DURATION_WEIGHT = 0.20
+DURATION_TOLERANCE = 30  # seconds until the duration score reaches 0
+VERSION_PENALTY = 0.5
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace"""
+    text = unicodedata.normalize('NFKD', text.casefold())
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(_NON_WORD.sub(' ', text).split())
+
+
+def normalize_title(title: str) -> str:
+    """Title without (feat. ...), [Remastered], ' - 2011 Remaster' and punctuation"""
+    title = title.casefold()
+    title = _BRACKETS.sub(' ', title)
+    title = _SUFFIX.sub('', title)
+    title = _FEAT.sub('', title)
+    return normalize_text(title)
+
+
+def _version_markers(text: str) -> set:
+    words = f" {normalize_text(text)} "
+    return {marker for marker in VERSION_MARKERS if f" {marker} " in words}
+
+
+def score_candidate(track: Dict[str, Any], candidate: Dict[str, Any]) -> float:
+    """
+    Confidence (0-1) that a search result is the Spotify track
+
+    track: {'name', 'artist' (comma separated), 'duration_ms' (optional)}
+    candidate: ytmusicapi search result
+    """
+    title_score = SequenceMatcher(
+        None, normalize_title(track['name']), normalize_title(candidate.get('title') or '')
+    ).ratio()
+
+    spotify_artists = {normalize_text(a) for a in track['artist'].split(',') if a.strip()}
+    candidate_artists = {normalize_text(a['name']) for a in candidate.get('artists') or []
+                         if a.get('name')}
+    # Artists can also appear in the title ("Song (feat. X)")
+    candidate_text = normalize_text(candidate.get('title') or '')
+    matched = sum(1 for artist in spotify_artists
+                  if artist in candidate_artists or artist in candidate_text)
+    artist_score = matched / len(spotify_artists) if spotify_artists else 0.0
+
+    duration_ms = track.get('duration_ms')
+    duration_seconds = candidate.get('duration_seconds')
+    if duration_ms and duration_seconds:
+        delta = abs(duration_ms / 1000 - duration_seconds)
+        duration_score = max(0.0, 1 - delta / DURATION_TOLERANCE)
+        score = (TITLE_WEIGHT * title_score + ARTIST_WEIGHT * artist_score
+                 + DURATION_WEIGHT * duration_score)
+    else:
+        score = (TITLE_WEIGHT * title_score + ARTIST_WEIGHT * artist_score) / (
+            TITLE_WEIGHT + ARTIST_WEIGHT)
+
+    # Live/cover/karaoke/... the Spotify title does not mention
+    if _version_markers(candidate.get('title') or '') - _version_markers(track['name']):
+        score *= VERSION_PENALTY
+
+    return round(score, 3)
+
+
+def rank_candidates(track: Dict[str, Any],
+                    candidates: List[Dict[str, Any]]) -> List[Tuple[float, Dict[str, Any]]]:
+    """(score, candidate) pairs, best first; candidates without a videoId are skipped"""
+    scored = [(score_candidate(track, candidate), candidate)
+              for candidate in candidates if candidate.get('videoId')]
+    scored.sort(key=lambda pair: pair[0], reverse=True)
+    return scored
+
+
+class ReviewQueue:
+    """
+    Low-confidence matches kept for manual review (JSON Lines, thread-safe)
+
+    Low-confidence results are not cached, so the same track comes back on
+    every run: a track already in the queue file is not added again.
+    """
+
+    DEFAULT_PATH = "review_queue.jsonl"
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self.count = 0
+        self._queued: Optional[Set[Tuple]] = None  # loaded on the first add
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(track: Dict[str, Any]) -> Tuple:
+        return (track.get('id'),) if track.get('id') else (track.get('name'), track.get('artist'))
+
+    def _load_queued(self) -> Set[Tuple]:
+        queued = set()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        queued.add(self._key(json.loads(line)['track']))
+                    except (json.JSONDecodeError, KeyError):
+                        continue
+        except FileNotFoundError:
+            pass
+        return queued
+
+    def add(self, track: Dict[str, Any], ranked: List[Tuple[float, Dict[str, Any]]],
+            top: int = 3) -> bool:
+        """Queue a track's best candidates; False if the track was already queued"""
+        entry = {
+            'queued_at': datetime.now().isoformat(timespec='seconds'),
+            'track': {key: track.get(key) for key in ('id', 'name', 'artist', 'duration_ms', 'isrc')},
+            'candidates': [
+                {
+                    'videoId': candidate['videoId'],
+                    'title': candidate.get('title'),
+                    'artists': ', '.join(a['name'] for a in candidate.get('artists') or []),
+                    'duration_seconds': candidate.get('duration_seconds'),
+                    'score': score
+                }
+                for score, candidate in ranked[:top]
+            ]
+        }
+        key = self._key(entry['track'])
+        with self._lock:
+            if self._queued is None:
+                self._queued = self._load_queued()
+            if key in self._queued:
+                return False
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self._queued.add(key)
+            self.count += 1
+        return True
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Playlist Sync
+Incremental Spotify → YouTube Music sync based on Spotify's snapshot_id
+
+For every synced playlist sync_state.json stores:
+- snapshot_id: Spotify playlist version last applied
+- yt_playlist_id: target YouTube playlist
+- items: the YouTube playlist in order, one {key, video_id, item_id} entry
+  per playlistItem (key is None for items added outside the sync)
+
+A playlist whose snapshot_id did not change is skipped without any further
+call. For a changed one, plan_sync() diffs the stored YouTube order against
+the new Spotify order and returns the few deletes/inserts/moves needed.
+"""
+
+import os
+import json
+import threading
+from bisect import bisect_left
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Any
+
+Operation = Tuple[str, str, Optional[int]]  # (kind, key, position)
+
+
+def occurrence_keys(keys: List[str]) -> List[str]:
+    """Make keys unique by occurrence ('id', 'id' -> 'id#0', 'id#1')"""
+    seen = Counter()
+    unique = []
+    for key in keys:
+        unique.append(f"{key}#{seen[key]}")
+        seen[key] += 1
+    return unique
+
+
+def _stable_keys(current: List[str], desired_index: Dict[str, int]) -> set:
+    """Keys of the longest run of current items already in desired order (LIS)"""
+    sequence = [desired_index[key] for key in current]
+    tails: List[int] = []  # smallest tail value of an increasing run of each length
+    tail_at: List[int] = []  # position in sequence of that tail
+    parent = [-1] * len(sequence)
+
+    for position, value in enumerate(sequence):
+        length = bisect_left(tails, value)
+        if length == len(tails):
+            tails.append(value)
+            tail_at.append(position)
+        else:
+            tails[length] = value
+            tail_at[length] = position
+        parent[position] = tail_at[length - 1] if length else -1
+
+    stable = set()
+    position = tail_at[-1] if tail_at else -1
+    while position != -1:
+        stable.add(current[position])
+        position = parent[position]
+    return stable
+
+
+def plan_sync(current: List[Optional[str]], desired: List[str]) -> List[Operation]:
+    """
+    Operations turning the current YouTube order into the desired one
+
+    current: keys in YouTube playlist order (None = item not managed by sync)
+    desired: unique keys in Spotify order (only tracks found on YouTube)
+
+    Returns ('delete', key, None), ('insert', key, position) and
+    ('move', key, position) in the order they must be applied; positions
+    are absolute YouTube positions at the time of the call. Items that are
+    already in the right relative order (longest increasing subsequence)
+    are never moved, so a single moved track costs a single call.
+    """
+    wanted = set(desired)
+    operations: List[Operation] = [('delete', key, None)
+                                   for key in current if key is not None and key not in wanted]
+    items = [key for key in current if key is None or key in wanted]
+
+    desired_index = {key: index for index, key in enumerate(desired)}
+    stable = _stable_keys([key for key in items if key is not None], desired_index)
+
+    # Place every other key right after its desired predecessor
+    for index, key in enumerate(desired):
+        if key in stable:
+            continue
+        target = items.index(desired[index - 1]) + 1 if index else 0
+
+        if key in items:
+            position = items.index(key)
+            if position < target:
+                target -= 1
+            if position != target:
+                items.pop(position)
+                items.insert(target, key)
+                operations.append(('move', key, target))
+        else:
+            items.insert(target, key)
+            operations.append(('insert', key, target))
+
+    return operations
+
+
+class SyncStore:
+    """Persistent per-playlist sync state (JSON, atomic writes)"""
+
+    DEFAULT_PATH = "sync_state.json"
+
+    def __init__(self, path: str = None):
+        self.path = Path(path or os.getenv('SYNC_STATE_PATH', self.DEFAULT_PATH))
+        self._lock = threading.Lock()
+        self.playlists: Dict[str, Dict[str, Any]] = {}
+
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.playlists = json.load(f)
+
+    def get(self, spotify_playlist_id: str) -> Optional[Dict[str, Any]]:
+        return self.playlists.get(spotify_playlist_id)
+
+    def put(self, spotify_playlist_id: str, state: Dict[str, Any]) -> None:
+        """Store a playlist's state and write the file"""
+        with self._lock:
+            self.playlists[spotify_playlist_id] = state
+            tmp = self.path.with_suffix('.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self.playlists, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Quota Scheduler
+Spreads large transfers across days within the YouTube API daily quota
+
+- QuotaLedger: units spent per Pacific-time day (when YouTube resets quota),
+  fed by ApiMetrics with the units of every call actually made
+- QuotaScheduler: queue of pending playlists, worked through in order, each
+  finished before the next starts. Every day it transfers as many tracks as
+  the remaining budget allows, then sleeps until the next reset.
+"""
+
+import os
+import json
+import time
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python 3.8
+    from backports.zoneinfo import ZoneInfo
+
+from api_metrics import UNIT_COSTS
+from rate_limiter import classify_error
+
+# YouTube Data API quota resets at midnight Pacific Time
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+DAILY_LIMIT = 10000
+
+# Unit costs actually charged per call (see api_metrics.UNIT_COSTS)
+SEARCH_COST = UNIT_COSTS['search']
+CREATE_COST = UNIT_COSTS['playlists.insert']
+ADD_COST = UNIT_COSTS['playlistItems.insert']
+
+
+class QuotaLedger:
+    """Persistent record of quota units spent per Pacific-time day"""
+
+    DEFAULT_PATH = "quota_ledger.json"
+    SAVE_EVERY = 20  # records between writes
+
+    def __init__(self, path: str = None, daily_limit: int = None, parent: 'QuotaLedger' = None):
+        """
+        parent: Ledger of the whole Google Cloud project when this one is a
+                budget within it (one account in account_worker.py); units
+                are recorded in both and the tighter remainder applies
+        """
+        self.path = Path(path or os.getenv('QUOTA_LEDGER_PATH', self.DEFAULT_PATH))
+        self.daily_limit = daily_limit or int(os.getenv('QUOTA_DAILY_LIMIT', DAILY_LIMIT))
+        self.parent = parent
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self.days: Dict[str, int] = {}
+
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                self.days = json.load(f)
+
+    @staticmethod
+    def today() -> str:
+        """Current quota day (Pacific time) as YYYY-MM-DD"""
+        return datetime.now(QUOTA_TIMEZONE).date().isoformat()
+
+    @staticmethod
+    def seconds_until_reset() -> float:
+        """Seconds until the next Pacific-time midnight"""
+        now = datetime.now(QUOTA_TIMEZONE)
+        midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        return (midnight - now).total_seconds()
+
+    def spent(self, day: str = None) -> int:
+        return self.days.get(day or self.today(), 0)
+
+    def remaining(self) -> int:
+        remaining = max(0, self.daily_limit - self.spent())
+        return min(remaining, self.parent.remaining()) if self.parent else remaining
+
+    def record(self, units: int) -> None:
+        """Add units spent today (thread-safe)"""
+        with self._lock:
+            day = self.today()
+            self.days[day] = self.days.get(day, 0) + units
+            self._unsaved += 1
+            if self._unsaved >= self.SAVE_EVERY:
+                self._save()
+        if self.parent:
+            self.parent.record(units)
+
+    def mark_exhausted(self) -> None:
+        """The API reported quotaExceeded: nothing left for today"""
+        with self._lock:
+            self.days[self.today()] = max(self.spent(), self.daily_limit)
+            self._save()
+        if self.parent:
+            # quotaExceeded is the project's quota, not this budget's
+            self.parent.mark_exhausted()
+
+    def save(self) -> None:
+        with self._lock:
+            self._save()
+        if self.parent:
+            self.parent.save()
+
+    def _save(self) -> None:
+        """Atomic write (lock held); keeps the last 30 days"""
+        self.days = dict(sorted(self.days.items())[-30:])
+        # Per-writer temp name: other ledgers on the same file may save at the same time
+        tmp = self.path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(self.days, f, indent=2)
+        os.replace(tmp, self.path)
+        self._unsaved = 0
+
+
+class QuotaScheduler:
+    """
+    Works through a queue of playlists within the daily quota
+
+    The queue (schedule.json) is a list of {"id", "name"} entries. Partial
+    progress lives in each playlist's TransferJournal, so a day's slice
+    picks up exactly where the previous one stopped.
+    """
+
+    DEFAULT_PATH = "schedule.json"
+    RESET_MARGIN = 60  # seconds to wait after midnight before resuming
+    RETRY_DELAY = 300  # seconds to wait after a transient API error
+
+    def __init__(self, transfer, path: str = None):
+        self.transfer = transfer
+        self.ledger = transfer.quota_ledger
+        self.path = Path(path or os.getenv('SCHEDULE_PATH', self.DEFAULT_PATH))
+        self.queue: List[Dict[str, str]] = []
+        self.retry_soon = False
+
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                self.queue = json.load(f)
+
+    def _save(self) -> None:
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(self.queue, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def enqueue(self, playlist_id: str, name: str) -> None:
+        """Add a playlist to the end of the queue (ignored if already queued)"""
+        if any(job['id'] == playlist_id for job in self.queue):
+            return
+        self.queue.append({'id': playlist_id, 'name': name})
+        self._save()
+        print(f"   📅 Scheduled: {name}")
+
+    @staticmethod
+    def plan_tracks(state: Optional[Dict], budget: int) -> int:
+        """
+        How far into a playlist the budget reaches
+
+        Walks tracks in order, charging search + add for unsearched tracks
+        and add only for found-but-not-added ones. Returns the track index
+        limit (exclusive) for today's slice.
+        """
+        tracks = state['tracks']
+        resolved = state['resolved']
+        added = state['added']
+        spent = 0
+
+        for index in range(len(tracks)):
+            if index not in resolved:
+                cost = SEARCH_COST + ADD_COST
+            elif resolved[index] and index not in added:
+                cost = ADD_COST
+            else:
+                cost = 0
+
+            if spent + cost > budget:
+                return index
+            spent += cost
+
+        return len(tracks)
+
+    @staticmethod
+    def permanently_failed(state: Dict) -> bool:
+        """
+        True when all that keeps a transfer from finishing is inserts the API
+        rejected for good ('fatal' in the journal's failed records)
+
+        Throttled, transient and quota failures, unrecorded (not attempted)
+        inserts or an unfinished search pass clear up on a retry.
+        """
+        if not state['fetch_complete'] or len(state['resolved']) < len(state['tracks']):
+            return False
+        pending = [index for index, video_id in state['resolved'].items()
+                   if video_id and index not in state['added']]
+        return bool(pending) and all(state['failed'].get(index) == 'fatal' for index in pending)
+
+    def run_once(self) -> bool:
+        """
+        Spend today's remaining budget on the queue
+
+        Returns True when the whole queue is finished.
+
+        The quota running out mid-slice (quotaExceeded) marks the day as used
+        up; transient Spotify/YouTube errors (network, 5xx, rate limits) are
+        logged and set retry_soon so run() tries again after RETRY_DELAY
+        instead of at the reset. Journals keep all progress made before
+        either. Other errors propagate.
+
+        A playlist that is still not done after a slice covering all of its
+        tracks, with quota left over, is finished with a warning when its
+        remaining failures are all permanent (unavailable or rejected
+        videos), instead of being re-run every day and stalling the queue.
+        Any other leftover failure is retried after RETRY_DELAY.
+        """
+        self.retry_soon = False
+        try:
+            return self._work_queue()
+        except Exception as e:
+            kind = classify_error(e)
+            if kind == 'quota':
+                if self.ledger.remaining() >= ADD_COST:
+                    self.ledger.mark_exhausted()  # The API's quotaExceeded, not an account budget
+                print(f"   🛑 Daily quota exhausted ({str(e)[:80]}), "
+                      f"continuing after the reset")
+            elif kind in ('throttled', 'transient'):
+                self.ledger.save()
+                self.retry_soon = True
+                print(f"   ⚠️  Transient API error ({type(e).__name__}: {str(e)[:80]}), "
+                      f"retrying in {self.RETRY_DELAY // 60} min")
+            else:
+                raise
+        return False
+
+    def _work_queue(self) -> bool:
+        while self.queue:
+            job = self.queue[0]
+            journal = self.transfer.journal(job['id'])
+            budget = self.ledger.remaining()
+
+            if journal.exists():
+                state = journal.load()
+            else:
+                if budget < CREATE_COST + SEARCH_COST + ADD_COST:
+                    return False
+                state = self.transfer.start_journal(journal, job['id'], job['name'])
+                budget = self.ledger.remaining()
+
+            if not state['done']:
+                limit = self.plan_tracks(state, budget)
+                if limit == 0:
+                    return False
+
+                print(f"\n📅 Today's slice for '{job['name']}': tracks 1-{limit} "
+                      f"of {len(state['tracks'])} ({budget:,} units left)")
+                done = self.transfer.run_journal(journal, state, limit=limit)
+                self.ledger.save()
+                if not done:
+                    # Partial slice or quota ran out: continue after the next reset
+                    if limit < len(state['tracks']) or self.ledger.remaining() < ADD_COST:
+                        return False
+                    if not self.permanently_failed(state):
+                        print(f"   ⚠️  Some tracks of '{job['name']}' failed temporarily, "
+                              f"retrying in {self.RETRY_DELAY // 60} min")
+                        self.retry_soon = True
+                        return False
+                    print(f"   ⚠️  Some tracks of '{job['name']}' could not be added "
+                          f"(run --resume to retry them)")
+
+            self.queue.pop(0)
+            self._save()
+            print(f"   ✅ Finished scheduled playlist: {job['name']}")
+
+        return True
+
+    def run(self) -> None:
+        """Run unattended until the queue is empty, sleeping across quota resets"""
+        print(f"\n📅 Quota scheduler: {len(self.queue)} playlists queued, "
+              f"daily limit {self.ledger.daily_limit:,} units")
+
+        while not self.run_once():
+            if self.retry_soon:
+                time.sleep(self.RETRY_DELAY)
+                continue
+            wait = self.ledger.seconds_until_reset() + self.RESET_MARGIN
+            print(f"\n😴 Daily quota used ({self.ledger.spent():,} units). "
+                  f"Sleeping {wait / 3600:.1f}h until the Pacific-time reset...")
+            time.sleep(wait)
+
+        print("\n🎉 All scheduled playlists transferred!")
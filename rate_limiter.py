@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Rate Limiting
+Thread-safe token bucket shared by concurrent API workers
+
+- RateLimiter: fixed-rate token bucket
+- AdaptiveRateLimiter: slows down when throttled, speeds back up on success (AIMD)
+- call_with_retry: jittered exponential backoff honouring Retry-After, telling
+  quota exhaustion (not retried) apart from transient errors (retried)
+"""
+
+import re
+import time
+import random
+import socket
+import threading
+from typing import Callable, Optional, Any
+
+from api_metrics import is_http_error
+
+
+class QuotaExceededError(Exception):
+    """The daily API quota is used up: retrying today is pointless"""
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiter
+
+    - rate: sustained calls per second
+    - burst: maximum calls allowed back-to-back after an idle period
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a call is allowed"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+    def on_success(self) -> None:
+        """Hook for adaptive limiters (fixed rate: no-op)"""
+
+    def on_throttle(self) -> None:
+        """Hook for adaptive limiters (fixed rate: no-op)"""
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    """
+    Token bucket whose rate follows the observed error rate
+
+    Additive increase after every success (up to max_rate), multiplicative
+    decrease when the server throttles us (down to min_rate). Converges on
+    the highest sustained rate the API accepts. max_rate defaults to the
+    configured rate, so it is a ceiling that is never exceeded: throttling
+    backs off below it and successes recover back up to it.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, min_rate: float = None,
+                 max_rate: float = None, increase: float = None, decrease: float = 0.5):
+        super().__init__(rate, burst)
+        self.min_rate = min_rate or rate / 10
+        self.max_rate = max_rate or rate
+        self.increase = increase or rate / 50
+        self.decrease = decrease
+        self.throttled = 0
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self) -> None:
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self.throttled += 1
+
+
+QUOTA_REASONS = ('quotaExceeded', 'dailyLimitExceeded')
+RATE_LIMIT_REASONS = ('rateLimitExceeded', 'userRateLimitExceeded')
+TRANSIENT_STATUS = (409, 429, 500, 502, 503, 504)
+_HTTP_STATUS = re.compile(r'HTTP (\d{3})')
+
+
+def _status_of(error: Exception) -> Optional[int]:
+    """HTTP status of an error from googleapiclient, spotipy or ytmusicapi"""
+    if is_http_error(error):
+        return error.resp.status
+    status = getattr(error, 'http_status', None)  # spotipy.SpotifyException
+    if status:
+        return status
+    match = _HTTP_STATUS.search(str(error))  # ytmusicapi: "Server returned HTTP 429: ..."
+    return int(match.group(1)) if match else None
+
+
+def classify_error(error: Exception) -> str:
+    """
+    'quota'     - daily quota used up (stop until the reset)
+    'throttled' - rate limited (back off and slow down)
+    'transient' - server/network hiccup (back off and retry)
+    'fatal'     - anything else (do not retry)
+    """
+    if isinstance(error, QuotaExceededError):
+        return 'quota'
+
+    if is_http_error(error):
+        content = (error.content or b'').decode(errors='ignore')
+        if any(reason in content for reason in QUOTA_REASONS):
+            return 'quota'
+        if any(reason in content for reason in RATE_LIMIT_REASONS):
+            return 'throttled'
+
+    if isinstance(error, (ConnectionError, TimeoutError, socket.timeout)):
+        return 'transient'
+    if type(error).__name__ in ('ConnectionError', 'Timeout', 'ReadTimeout', 'ConnectTimeout'):
+        return 'transient'  # requests exceptions (spotipy, ytmusicapi)
+
+    status = _status_of(error)
+    if status == 429:
+        return 'throttled'
+    if status in TRANSIENT_STATUS:
+        return 'transient'
+    return 'fatal'
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Seconds the server asked us to wait (Retry-After header), if any"""
+    headers = None
+    if is_http_error(error):
+        headers = error.resp
+    elif getattr(error, 'headers', None):
+        headers = error.headers
+
+    if headers:
+        value = headers.get('retry-after') or headers.get('Retry-After')
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+    return None
+
+
+def backoff_delay(attempt: int, error: Exception = None, base: float = 1.0,
+                  cap: float = 60.0) -> float:
+    """Retry-After if given, else exponential backoff with full jitter"""
+    requested = retry_after(error) if error is not None else None
+    if requested is not None:
+        return min(requested, cap * 5)
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def call_with_retry(fn: Callable[..., Any], *args, limiter: RateLimiter = None,
+                    max_retries: int = 5, **kwargs) -> Any:
+    """
+    Call fn through the limiter, retrying throttled and transient failures
+
+    Raises QuotaExceededError when the quota is exhausted; fatal errors and
+    the last transient error are re-raised unchanged.
+    """
+    for attempt in range(max_retries + 1):
+        if limiter:
+            limiter.acquire()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            kind = classify_error(e)
+            if kind == 'quota':
+                raise QuotaExceededError(str(e)) from e
+            if kind == 'fatal' or attempt == max_retries:
+                raise
+            if kind == 'throttled' and limiter:
+                limiter.on_throttle()
+            time.sleep(backoff_delay(attempt, e))
+        else:
+            if limiter:
+                limiter.on_success()
+            return result
+
+
+class RateLimitedClient:
+    """
+    Proxy that routes every method call of a client through call_with_retry
+
+    Used for the Spotify client: spotify.playlist_tracks(...) etc. are paced
+    by the shared limiter and retried on 429/5xx.
+    """
+
+    def __init__(self, client: Any, limiter: RateLimiter, max_retries: int = 5):
+        self._client = client
+        self._limiter = limiter
+        self._max_retries = max_retries
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            return call_with_retry(attr, *args, limiter=self._limiter,
+                                   max_retries=self._max_retries, **kwargs)
+        return call
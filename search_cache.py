@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Persistent Search Cache
+SQLite-backed cache of YouTube Music search results shared across runs
+
+QUOTA OPTIMIZATION:
+- Results survive between processes (overlapping playlists are searched once)
+- "Not found" results are cached too, with a shorter TTL
+- Size-bounded: least recently used entries are evicted first
+- ISRC -> videoId index: tracks seen before are resolved with no search at all
+"""
+
+import os
+import time
+import sqlite3
+import threading
+import unicodedata
+from typing import Optional, Tuple
+
+
+class SearchCache:
+    """
+    Query -> videoId cache stored in a local SQLite database
+
+    Keys are normalized search queries. A stored video_id of NULL means the
+    search returned no results (negative cache entry). Safe to share between
+    threads (a single connection guarded by a lock).
+
+    The same database holds an ISRC index that grows with every resolved
+    track. ISRCs identify a recording, so these entries never expire.
+    """
+
+    DEFAULT_PATH = "search_cache.db"
+    DEFAULT_TTL = 30 * 24 * 3600           # 30 days for found tracks
+    DEFAULT_NEGATIVE_TTL = 7 * 24 * 3600   # 7 days for "not found"
+    DEFAULT_MAX_ENTRIES = 100000
+
+    def __init__(self, db_path: str = None, ttl: int = DEFAULT_TTL,
+                 negative_ttl: int = DEFAULT_NEGATIVE_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Open (or create) the cache database and drop expired entries"""
+        self.db_path = db_path or os.getenv('SEARCH_CACHE_PATH', self.DEFAULT_PATH)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.isrc_hits = 0
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS search_cache (
+                query      TEXT PRIMARY KEY,
+                video_id   TEXT,
+                created_at REAL NOT NULL,
+                last_used  REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_search_cache_last_used ON search_cache(last_used)"
+        )
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS isrc_index (
+                isrc       TEXT PRIMARY KEY,
+                video_id   TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+        self.purge_expired()
+        self._count = self.conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Normalize a search query into a cache key"""
+        query = unicodedata.normalize('NFKC', query).casefold()
+        return ' '.join(query.split())
+
+    def get(self, query: str) -> Tuple[bool, Optional[str]]:
+        """
+        Look up a query
+
+        Returns (found, video_id). found is False on a miss; on a hit
+        video_id may still be None for a cached "not found" result.
+        """
+        key = self.normalize_query(query)
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT video_id, created_at FROM search_cache WHERE query = ?", (key,)
+            ).fetchone()
+
+            now = time.time()
+            if row:
+                video_id, created_at = row
+                ttl = self.ttl if video_id else self.negative_ttl
+                if now - created_at <= ttl:
+                    self.conn.execute(
+                        "UPDATE search_cache SET last_used = ? WHERE query = ?", (now, key)
+                    )
+                    self.conn.commit()
+                    self.hits += 1
+                    return True, video_id
+
+            self.misses += 1
+            return False, None
+
+    def set(self, query: str, video_id: Optional[str]) -> None:
+        """Store a search result (None caches a "not found")"""
+        key = self.normalize_query(query)
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO search_cache (query, video_id, created_at, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, video_id, now, now)
+            )
+            self.conn.commit()
+            self._count += 1  # Approximate (replacements included), recounted on eviction
+            if self._count > self.max_entries:
+                self._evict()
+
+    def get_isrc(self, isrc: str) -> Optional[str]:
+        """videoId previously resolved for this ISRC, or None"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT video_id FROM isrc_index WHERE isrc = ?", (isrc.upper(),)
+            ).fetchone()
+            if row:
+                self.isrc_hits += 1
+                return row[0]
+        return None
+
+    def set_isrc(self, isrc: str, video_id: str) -> None:
+        """Remember the videoId a recording resolved to"""
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO isrc_index (isrc, video_id, updated_at) VALUES (?, ?, ?)",
+                (isrc.upper(), video_id, time.time())
+            )
+            self.conn.commit()
+
+    def _evict(self) -> None:
+        """Evict least recently used entries down to 90% of max_entries (lock held)"""
+        self._count = self.conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+        excess = self._count - int(self.max_entries * 0.9)
+        if excess <= 0:
+            return
+        self.conn.execute(
+            "DELETE FROM search_cache WHERE query IN "
+            "(SELECT query FROM search_cache ORDER BY last_used ASC LIMIT ?)",
+            (excess,)
+        )
+        self.conn.commit()
+        self._count -= excess
+
+    def purge_expired(self) -> int:
+        """Delete expired entries, returns number of rows removed"""
+        now = time.time()
+        cursor = self.conn.execute(
+            "DELETE FROM search_cache WHERE "
+            "(video_id IS NOT NULL AND created_at < ?) OR "
+            "(video_id IS NULL AND created_at < ?)",
+            (now - self.ttl, now - self.negative_ttl)
+        )
+        self.conn.commit()
+        return cursor.rowcount
+
+    @property
+    def hit_rate(self) -> float:
+        """Hit rate (0-100) for lookups made by this process"""
+        lookups = self.hits + self.misses
+        return (self.hits / lookups) * 100 if lookups else 0.0
+
+    def print_summary(self) -> None:
+        """Print hit statistics for this run"""
+        lookups = self.hits + self.misses
+        print(f"💾 Search cache: {self.hits}/{lookups} hits ({self.hit_rate:.1f}%), "
+              f"{self._count:,} entries in {self.db_path}")
+        if self.isrc_hits:
+            print(f"   🏷️  {self.isrc_hits} tracks resolved by ISRC (no search)")
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self.conn.close()
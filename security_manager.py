@@ -6,8 +6,10 @@ Enterprise-grade security for OAuth tokens and credentials
 
 import os
 import json
+import time
 import pickle
-from typing import Optional, Dict, Any
+import threading
+from typing import Optional, Dict, Any, Tuple
 from pathlib import Path
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
@@ -17,6 +19,28 @@ import keyring
 import base64
 import getpass
 
+import key_agent
+
+# Process-wide cache: the key is unlocked (keyring / PBKDF2 / agent) once per
+# process and decrypted files are parsed once, instead of once per manager.
+# Entries expire after KEY_CACHE_TTL seconds (0 disables the cache).
+DEFAULT_CACHE_TTL = 900
+_cache_lock = threading.Lock()
+_cached_key: Optional[Tuple[bytes, float]] = None  # (key, expires_at)
+_cached_files: Dict[str, Tuple[Tuple[int, int], Any, float]] = {}  # path -> (stat, data, expires_at)
+
+
+def _cache_ttl() -> float:
+    return float(os.getenv('KEY_CACHE_TTL', DEFAULT_CACHE_TTL))
+
+
+def clear_key_cache() -> None:
+    """Forget the cached key and decrypted credentials"""
+    global _cached_key
+    with _cache_lock:
+        _cached_key = None
+        _cached_files.clear()
+
 
 class SecureTokenManager:
     """
@@ -34,8 +58,26 @@ class SecureTokenManager:
     def __init__(self, token_file: str = "youtube_token.enc"):
         """Initialize secure token manager"""
         self.token_file = Path(token_file)
-        self.key = self._get_or_create_encryption_key()
+        self.key = self._cached_encryption_key()
         self.cipher = Fernet(self.key)
+    
+    def _cached_encryption_key(self) -> bytes:
+        """
+        Encryption key, unlocked at most once per process
+        
+        Order: process cache, running key agent (key_agent.py), then
+        keyring / password fallback.
+        """
+        global _cached_key
+        with _cache_lock:
+            if _cached_key and _cached_key[1] > time.monotonic():
+                return _cached_key[0]
+            
+            key = key_agent.fetch_key() or self._get_or_create_encryption_key()
+            ttl = _cache_ttl()
+            if ttl > 0:
+                _cached_key = (key, time.monotonic() + ttl)
+            return key
         
     def _get_or_create_encryption_key(self) -> bytes:
         """
@@ -102,6 +144,40 @@ class SecureTokenManager:
         key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
         return key
     
+    def read_encrypted(self, path: Path) -> Any:
+        """
+        Decrypt and parse a JSON file encrypted with this key
+        
+        Cached per process until the file changes or the TTL expires.
+        """
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cache_key = str(Path(path).resolve())
+        
+        with _cache_lock:
+            cached = _cached_files.get(cache_key)
+            if cached and cached[0] == signature and cached[2] > time.monotonic():
+                return json.loads(json.dumps(cached[1]))  # Copy: callers may mutate
+        
+        with open(path, 'rb') as f:
+            data = json.loads(self.cipher.decrypt(f.read()).decode())
+        
+        ttl = _cache_ttl()
+        if ttl > 0:
+            with _cache_lock:
+                _cached_files[cache_key] = (signature, data, time.monotonic() + ttl)
+        return json.loads(json.dumps(data))
+    
+    def write_encrypted(self, path: Path, data: Any) -> None:
+        """Encrypt data as JSON to path (0600) and drop its cache entry"""
+        encrypted_data = self.cipher.encrypt(json.dumps(data).encode())
+        with open(path, 'wb') as f:
+            f.write(encrypted_data)
+        os.chmod(path, 0o600)
+        
+        with _cache_lock:
+            _cached_files.pop(str(Path(path).resolve()), None)
+    
     def save_credentials(self, creds: Any) -> None:
         """
         Save credentials with encryption
@@ -121,18 +197,8 @@ class SecureTokenManager:
                 'expiry': creds.expiry.isoformat() if creds.expiry else None
             }
             
-            # Convert to JSON
-            json_data = json.dumps(creds_data).encode()
-            
-            # Encrypt
-            encrypted_data = self.cipher.encrypt(json_data)
-            
-            # Write to file
-            with open(self.token_file, 'wb') as f:
-                f.write(encrypted_data)
-            
-            # Set secure permissions (owner read/write only)
-            os.chmod(self.token_file, 0o600)
+            # Encrypt and write (owner read/write only)
+            self.write_encrypted(self.token_file, creds_data)
             
             print(f"✅ Token salvo com criptografia em {self.token_file}")
             
@@ -154,17 +220,8 @@ class SecureTokenManager:
                 print("⚠️  Aviso: Token file tem permissões inseguras!")
                 os.chmod(self.token_file, 0o600)
             
-            # Read encrypted data
-            with open(self.token_file, 'rb') as f:
-                encrypted_data = f.read()
-            
-            # Decrypt
-            decrypted_data = self.cipher.decrypt(encrypted_data)
-            
-            # Parse JSON
-            creds_data = json.loads(decrypted_data.decode())
-            
-            return creds_data
+            # Read, decrypt and parse (cached per process)
+            return self.read_encrypted(self.token_file)
             
         except Exception as e:
             print(f"❌ Erro ao carregar credenciais: {e}")
@@ -180,6 +237,8 @@ class SecureTokenManager:
                 f.write(os.urandom(file_size))
             
             self.token_file.unlink()
+            with _cache_lock:
+                _cached_files.pop(str(self.token_file.resolve()), None)
             print("✅ Credenciais deletadas com segurança")
     
     def validate_token_security(self) -> Dict[str, bool]:
@@ -228,13 +287,7 @@ class SecureHeadersManager:
     
     def save_headers(self, headers: Dict[str, str]) -> None:
         """Save headers with encryption"""
-        json_data = json.dumps(headers).encode()
-        encrypted_data = self.token_manager.cipher.encrypt(json_data)
-        
-        with open(self.headers_file, 'wb') as f:
-            f.write(encrypted_data)
-        
-        os.chmod(self.headers_file, 0o600)
+        self.token_manager.write_encrypted(self.headers_file, headers)
         print(f"✅ Headers salvos com criptografia")
     
     def load_headers(self) -> Optional[Dict[str, str]]:
@@ -253,19 +306,40 @@ class SecureHeadersManager:
             return None
         
         try:
-            with open(self.headers_file, 'rb') as f:
-                encrypted_data = f.read()
-            
-            decrypted_data = self.token_manager.cipher.decrypt(encrypted_data)
-            headers = json.loads(decrypted_data.decode())
-            
-            return headers
+            return self.token_manager.read_encrypted(self.headers_file)
             
         except Exception as e:
             print(f"❌ Erro ao carregar headers: {e}")
             return None
 
 
+def spotify_cache_handler(token_file: str = "spotify_token.enc"):
+    """
+    spotipy cache handler keeping the Spotify OAuth token encrypted
+    (instead of the plain .cache file), e.g. one per account
+    """
+    from spotipy.cache_handler import CacheHandler
+    
+    class EncryptedCacheHandler(CacheHandler):
+        def __init__(self):
+            self.token_manager = SecureTokenManager(token_file=str(token_file))
+            self.path = Path(token_file)
+        
+        def get_cached_token(self) -> Optional[Dict[str, Any]]:
+            if not self.path.exists():
+                return None
+            try:
+                return self.token_manager.read_encrypted(self.path)
+            except Exception as e:
+                print(f"❌ Erro ao carregar token do Spotify: {e}")
+                return None
+        
+        def save_token_to_cache(self, token_info: Dict[str, Any]) -> None:
+            self.token_manager.write_encrypted(self.path, token_info)
+    
+    return EncryptedCacheHandler()
+
+
 # Security audit function
 def run_security_audit() -> None:
     """
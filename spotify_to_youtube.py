@@ -9,37 +9,78 @@ SECURITY FEATURES:
 - Minimal OAuth scopes (principle of least privilege)
 - Secure file permissions (0600)
 - Token validation and revocation checks
+
+STARTUP:
+- spotipy, ytmusicapi, the Google client libraries and the cryptography
+  stack are imported on first use, and each client is created only when an
+  operation needs it (benchmarks/startup_benchmark.py tracks cold start)
 """
 
 import os
 import sys
-from typing import List, Dict, Optional
+import argparse
+import time
+import queue
+import threading
+from collections import Counter, deque, defaultdict
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+from typing import List, Dict, Optional, Callable, Iterable, Iterator, Tuple
 from datetime import datetime
+from pathlib import Path
 from dotenv import load_dotenv
-import spotipy
-from spotipy.oauth2 import SpotifyOAuth
-from ytmusicapi import YTMusic
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-from security_manager import SecureTokenManager, SecureHeadersManager
+from search_cache import SearchCache
+from rate_limiter import (AdaptiveRateLimiter, RateLimitedClient, QuotaExceededError,
+                          call_with_retry, classify_error, backoff_delay)
+from transfer_journal import TransferJournal
+from quota_scheduler import QuotaLedger, QuotaScheduler, SEARCH_COST, CREATE_COST, ADD_COST
+from api_metrics import ApiMetrics, is_http_error
+from match_scoring import rank_candidates, ReviewQueue
+from console_output import prefixed_stdout, with_label, current_label
+from playlist_sync import SyncStore, plan_sync, occurrence_keys
+from track_record import Track
+import event_log
 
 # Load environment variables
 load_dotenv()
 
+SPOTIFY_SCOPE = 'playlist-read-private playlist-read-collaborative'
+
 
 class YouTubeOAuthWrapper:
     """Wrapper to use YouTube API with OAuth (with encryption) and ytmusicapi"""
     
-    def __init__(self, token_file='youtube_token.enc'):
+    HTTP_TIMEOUT = 30  # seconds
+    BATCH_LIMIT = 50  # requests per HTTP batch
+    
+    def __init__(self, token_file='youtube_token.enc', metrics: ApiMetrics = None,
+                 search_limiter: AdaptiveRateLimiter = None,
+                 write_limiter: AdaptiveRateLimiter = None,
+                 headers_file: str = 'headers_auth.enc'):
+        """
+        search_limiter / write_limiter pace ytmusicapi searches and Data API
+        writes; throttled and transient failures are retried with backoff.
+        """
+        from security_manager import SecureTokenManager
+        
         self.token_file = token_file
+        self.headers_file = headers_file
         self.token_manager = SecureTokenManager(token_file=token_file)
+        self.metrics = metrics or ApiMetrics()
+        self.search_limiter = search_limiter
+        self.write_limiter = write_limiter
+        self._service = None
+        self._local = threading.local()
         self.creds = self._load_credentials()
         self.ytmusic = self._init_ytmusic()
         
     def _load_credentials(self):
         """Load and refresh OAuth credentials with security"""
+        from google.auth.transport.requests import Request
+        from google.oauth2.credentials import Credentials
+        from googleapiclient.errors import HttpError
+        
         creds_data = self.token_manager.load_credentials()
         
         if not creds_data:
@@ -67,8 +108,9 @@ class YouTubeOAuthWrapper:
                 
                 # Validate token wasn't revoked
                 try:
-                    test_service = build('youtube', 'v3', credentials=creds)
-                    test_service.channels().list(part='snippet', mine=True).execute()
+                    self._service = self._build_service(creds)
+                    with self.metrics.track('channels.list'):
+                        self._service.channels().list(part='snippet', mine=True).execute()
                 except HttpError as e:
                     if e.resp.status == 401:
                         print("❌ Token foi revogado! Execute: python3 setup_youtube_oauth.py")
@@ -81,9 +123,67 @@ class YouTubeOAuthWrapper:
         
         return creds
     
+    def _build_service(self, creds):
+        """
+        Build the YouTube Data API client
+        
+        PERFORMANCE:
+        - Static discovery document bundled with googleapiclient (no fetch at startup)
+        - One keep-alive HTTP connection per thread reused for every call
+        - AuthorizedHttp refreshes expired credentials in place (no rebuild)
+        """
+        from googleapiclient.discovery import build
+        
+        http = self._new_http(creds)
+        self._local.http = http
+        return build('youtube', 'v3', http=http, static_discovery=True, cache_discovery=False)
+    
+    def _new_http(self, creds):
+        import httplib2
+        from google_auth_httplib2 import AuthorizedHttp
+        return AuthorizedHttp(creds, http=httplib2.Http(timeout=self.HTTP_TIMEOUT))
+    
+    def _thread_http(self):
+        """Keep-alive connection of the calling thread (httplib2 is not thread-safe)"""
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = self._new_http(self.creds)
+            self._local.http = http
+        return http
+    
+    @property
+    def service(self):
+        """YouTube Data API client, built once and reused"""
+        if self._service is None:
+            self._service = self._build_service(self.creds)
+        return self._service
+    
+    def _execute(self, request, operation: str = None):
+        """
+        Execute an API request, persisting the token if it was refreshed
+        
+        If operation is given the call is recorded in self.metrics
+        (batches record their items individually).
+        """
+        token = self.creds.token
+        http = self._thread_http()
+        if operation:
+            with self.metrics.track(operation):
+                response = request.execute(http=http)
+        else:
+            response = request.execute(http=http)
+        
+        if self.creds.token != token:
+            self.token_manager.save_credentials(self.creds)
+        
+        return response
+    
     def _init_ytmusic(self):
         """Initialize ytmusicapi with secure headers (fallback for search)"""
-        headers_manager = SecureHeadersManager()
+        from ytmusicapi import YTMusic
+        from security_manager import SecureHeadersManager
+        
+        headers_manager = SecureHeadersManager(self.headers_file)
         headers = headers_manager.load_headers()
         
         if headers:
@@ -91,7 +191,7 @@ class YouTubeOAuthWrapper:
         
         # Try legacy unencrypted file
         legacy_file = 'headers_auth.json'
-        if os.path.exists(legacy_file):
+        if self.headers_file == 'headers_auth.enc' and os.path.exists(legacy_file):
             print("⚠️  Encontrado arquivo headers não criptografado, migrando...")
             import json
             with open(legacy_file, 'r') as f:
@@ -106,13 +206,16 @@ class YouTubeOAuthWrapper:
         """Search using ytmusicapi"""
         if not self.ytmusic:
             raise Exception("YTMusic not initialized. Run: python3 setup_youtube_headers.py")
-        return self.ytmusic.search(query, filter=filter, limit=limit)
+        
+        def attempt():
+            with self.metrics.track('search'):
+                return self.ytmusic.search(query, filter=filter, limit=limit)
+        
+        return call_with_retry(attempt, limiter=self.search_limiter)
     
     def create_playlist(self, title: str, description: str = "", privacy_status: str = "PRIVATE"):
         """Create playlist using OAuth"""
-        youtube = build('youtube', 'v3', credentials=self.creds)
-        
-        request = youtube.playlists().insert(
+        request = self.service.playlists().insert(
             part="snippet,status",
             body={
                 "snippet": {
@@ -124,39 +227,260 @@ class YouTubeOAuthWrapper:
                 }
             }
         )
-        response = request.execute()
+        response = call_with_retry(self._execute, request, 'playlists.insert',
+                                   limiter=self.write_limiter)
         return response['id']
     
-    def add_playlist_item(self, playlist_id: str, video_id: str):
-        """Add video to playlist using OAuth"""
-        youtube = build('youtube', 'v3', credentials=self.creds)
-        
-        request = youtube.playlistItems().insert(
-            part="snippet",
-            body={
-                "snippet": {
-                    "playlistId": playlist_id,
-                    "resourceId": {
-                        "kind": "youtube#video",
-                        "videoId": video_id
-                    }
-                }
+    @staticmethod
+    def _playlist_item_body(playlist_id: str, video_id: str, position: int = None) -> Dict:
+        snippet = {
+            "playlistId": playlist_id,
+            "resourceId": {
+                "kind": "youtube#video",
+                "videoId": video_id
             }
+        }
+        if position is not None:
+            snippet["position"] = position
+        return {"snippet": snippet}
+    
+    def _playlist_item_request(self, playlist_id: str, video_id: str, position: int = None):
+        """Build (without executing) a playlistItems.insert request"""
+        return self.service.playlistItems().insert(
+            part="snippet",
+            body=self._playlist_item_body(playlist_id, video_id, position)
         )
-        response = request.execute()
-        return response
+    
+    def add_playlist_item(self, playlist_id: str, video_id: str, position: int = None):
+        """Add video to playlist using OAuth (at position, or at the end)"""
+        return call_with_retry(self._execute,
+                               self._playlist_item_request(playlist_id, video_id, position),
+                               'playlistItems.insert', limiter=self.write_limiter)
+    
+    def move_playlist_item(self, item_id: str, playlist_id: str, video_id: str, position: int):
+        """Move a playlist item to a new position"""
+        body = self._playlist_item_body(playlist_id, video_id, position)
+        body["id"] = item_id
+        request = self.service.playlistItems().update(part="snippet", body=body)
+        return call_with_retry(self._execute, request, 'playlistItems.update',
+                               limiter=self.write_limiter)
+    
+    def delete_playlist_item(self, item_id: str) -> None:
+        """Remove an item from its playlist"""
+        request = self.service.playlistItems().delete(id=item_id)
+        call_with_retry(self._execute, request, 'playlistItems.delete', limiter=self.write_limiter)
+    
+    def list_playlist_items(self, playlist_id: str) -> List[Tuple[str, str]]:
+        """All (item_id, video_id) pairs of a playlist in order (1 unit per 50 items)"""
+        items = []
+        page_token = None
+        while True:
+            request = self.service.playlistItems().list(
+                part="snippet", playlistId=playlist_id, maxResults=50, pageToken=page_token,
+                fields="nextPageToken,items(id,snippet(resourceId(videoId)))"
+            )
+            response = call_with_retry(self._execute, request, 'playlistItems.list')
+            items.extend((item['id'], item['snippet']['resourceId']['videoId'])
+                         for item in response.get('items', []))
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return items
+    
+    def add_playlist_items(self, playlist_id: str, video_ids: List[str],
+                           max_retries: int = 3) -> List[Optional[Exception]]:
+        """
+        Add videos to playlist using HTTP batch requests
+        
+        PERFORMANCE:
+        - Up to BATCH_LIMIT inserts per HTTP round-trip, paced by write_limiter
+        - Items failing with a throttled/transient error (409/429/5xx) are
+          retried with jittered exponential backoff (or the server's
+          Retry-After); quotaExceeded is never retried, and stops the call:
+          items not sent yet are returned with a QuotaExceededError
+        
+        Note: the API may apply the inserts of one batch in any order, and
+        retried items land after the rest; callers that need the playlist
+        order check it afterwards (SpotifyToYouTubeTransfer._ensure_order).
+        Quota is unchanged (50 units per inserted item); each item is
+        recorded in self.metrics with the latency of its batch.
+        
+        Returns:
+            One entry per video_id: None if added, otherwise the last error
+        """
+        errors: Dict[int, Optional[Exception]] = {}
+        pending = list(range(len(video_ids)))
+        quota = []
+        
+        delay = 0.0
+        
+        for attempt in range(max_retries + 1):
+            if not pending:
+                break
+            if delay:
+                time.sleep(delay)
+            
+            retry = []
+            results = []
+            throttled = []
+            
+            def callback(request_id, response, exception):
+                index = int(request_id)
+                errors[index] = exception
+                results.append(exception)
+                if exception is not None:
+                    kind = classify_error(exception)
+                    if kind in ('throttled', 'transient'):
+                        retry.append(index)
+                    if kind == 'throttled':
+                        throttled.append(exception)
+                    if kind == 'quota':
+                        quota.append(exception)
+            
+            for start in range(0, len(pending), self.BATCH_LIMIT):
+                if quota:
+                    # Every further insert would be rejected too
+                    for index in pending[start:]:
+                        errors[index] = QuotaExceededError("not attempted: daily quota exhausted")
+                    break
+                chunk = pending[start:start + self.BATCH_LIMIT]
+                batch = self.service.new_batch_http_request(callback=callback)
+                for index in chunk:
+                    batch.add(self._playlist_item_request(playlist_id, video_ids[index]),
+                              request_id=str(index))
+                results.clear()
+                if self.write_limiter:
+                    self.write_limiter.acquire()
+                start_time = time.perf_counter()
+                try:
+                    self._execute(batch)
+                except Exception as e:
+                    # Whole batch rejected (auth failure, connection reset...): fail every item
+                    results[:] = [e] * len(chunk)
+                    for index in chunk:
+                        errors[index] = e
+                    kind = classify_error(e)
+                    if kind in ('throttled', 'transient'):
+                        retry.extend(chunk)
+                    if kind == 'throttled':
+                        throttled.append(e)
+                    if kind == 'quota':
+                        quota.append(e)
+                
+                latency = time.perf_counter() - start_time
+                for exception in results:
+                    # Inserts rejected for quota are not charged
+                    rejected = exception is not None and classify_error(exception) == 'quota'
+                    self.metrics.record('playlistItems.insert', latency, error=exception,
+                                        units=0 if rejected else None)
+            
+            # Adapt the write pace: slow down when throttled, speed up otherwise
+            if self.write_limiter:
+                if throttled:
+                    self.write_limiter.on_throttle()
+                else:
+                    self.write_limiter.on_success()
+            
+            if quota:
+                break
+            pending = sorted(set(retry))
+            delay = max((backoff_delay(attempt, errors[index]) for index in pending), default=0.0)
+        
+        return [errors.get(index) for index in range(len(video_ids))]
 
 
 class SpotifyToYouTubeTransfer:
     """Main class for transferring playlists from Spotify to YouTube Music"""
     
-    def __init__(self):
-        """Initialize the transfer tool with authentication"""
-        self.spotify = self._authenticate_spotify()
-        self.ytmusic = self._authenticate_youtube()
+    DEFAULT_SEARCH_WORKERS = 4
+    DEFAULT_SEARCH_RATE = 5.0  # searches per second across all workers
+    DEFAULT_MATCH_CANDIDATES = 5  # results scored per search
+    DEFAULT_MIN_CONFIDENCE = 0.6  # below this a match goes to the review queue
+    
+    DEFAULT_WRITE_RATE = 2.0  # playlist write requests per second
+    WRITE_LINGER = 1.0  # seconds a partial batch waits for more resolved tracks
+    WRITE_QUEUE_SIZE = 200  # resolved tracks waiting for the writer (back-pressure)
+    DEFAULT_SPOTIFY_RATE = 10.0  # Spotify Web API requests per second
+    
+    def __init__(self, search_workers: int = None, search_rate: float = None,
+                 playlist_workers: int = None, quota_ledger: QuotaLedger = None,
+                 data_dir: str = None, search_cache: SearchCache = None):
+        """
+        Initialize the transfer tool with authentication
+        
+        Args:
+            search_workers: Concurrent searches in flight (env: SEARCH_WORKERS)
+            search_rate: Max searches per second (env: SEARCH_RATE)
+            playlist_workers: Playlists transferred at once (env: PLAYLIST_WORKERS)
+            quota_ledger: Ledger shared with other transfers in this process
+                          that use the same Google Cloud project
+            data_dir: Per-account directory for credentials (youtube_token.enc,
+                      headers_auth.enc, spotify_token.enc), journals, sync
+                      state, review queue and metrics report (default: the
+                      usual files in the working directory)
+            search_cache: Cache shared with other transfers in this process
+                          (matches don't depend on the account)
+        """
+        self.data_dir = Path(data_dir) if data_dir else None
+        self.quota_ledger = quota_ledger or QuotaLedger()
+        self.metrics = ApiMetrics(ledger=self.quota_ledger)
+        self.search_workers = search_workers or int(
+            os.getenv('SEARCH_WORKERS', self.DEFAULT_SEARCH_WORKERS))
+        
+        # Shared adaptive limiters: back off when throttled, recover on success
+        self.search_limiter = AdaptiveRateLimiter(
+            search_rate or float(os.getenv('SEARCH_RATE', self.DEFAULT_SEARCH_RATE)),
+            burst=self.search_workers
+        )
+        self.write_limiter = AdaptiveRateLimiter(
+            float(os.getenv('WRITE_RATE', self.DEFAULT_WRITE_RATE)))
+        self.spotify_limiter = AdaptiveRateLimiter(
+            float(os.getenv('SPOTIFY_RATE', self.DEFAULT_SPOTIFY_RATE)), burst=5)
+        
+        # Clients are created on first use (see the spotify / ytmusic properties)
+        self._spotify = None
+        self._ytmusic = None
+        self._client_lock = threading.Lock()
+        self.search_cache = search_cache or SearchCache()
+        self.playlist_workers = playlist_workers or int(os.getenv('PLAYLIST_WORKERS', 1))
+        self._search_pool = None
+        self.match_candidates = int(os.getenv('MATCH_CANDIDATES', self.DEFAULT_MATCH_CANDIDATES))
+        self.min_confidence = float(os.getenv('MATCH_MIN_CONFIDENCE', self.DEFAULT_MIN_CONFIDENCE))
+        self.review_queue = ReviewQueue(self._data_path('review_queue.jsonl')) if data_dir else ReviewQueue()
+        if self.data_dir:
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+        # When a transfer exceeds today's quota: 'ask' (prompt), 'limit'
+        # (cut to what fits), 'ignore' (run until the API stops us) or 'fail'
+        self.quota_policy = 'ask'
+        
+    def _data_path(self, name: str) -> Optional[str]:
+        """Path of an account file in data_dir (None: use the default location)"""
+        return str(self.data_dir / name) if self.data_dir else None
+    
+    def journal(self, spotify_playlist_id: str) -> TransferJournal:
+        """Transfer journal of a playlist (in data_dir/journals with a data_dir)"""
+        return TransferJournal(spotify_playlist_id, directory=self._data_path('journals'))
+    
+    @property
+    def spotify(self) -> RateLimitedClient:
+        """Rate-limited Spotify client, authenticated on first use"""
+        with self._client_lock:
+            if self._spotify is None:
+                self._spotify = RateLimitedClient(self._authenticate_spotify(), self.spotify_limiter)
+            return self._spotify
+    
+    @property
+    def ytmusic(self) -> YouTubeOAuthWrapper:
+        """YouTube client, authenticated on first use"""
+        with self._client_lock:
+            if self._ytmusic is None:
+                self._ytmusic = self._authenticate_youtube()
+            return self._ytmusic
+    
+    def _authenticate_spotify(self):
+        """Authenticate with Spotify API (returns spotipy.Spotify)"""
+        import spotipy
+        from spotipy.oauth2 import SpotifyOAuth
         
-    def _authenticate_spotify(self) -> spotipy.Spotify:
-        """Authenticate with Spotify API"""
         client_id = os.getenv('SPOTIFY_CLIENT_ID')
         client_secret = os.getenv('SPOTIFY_CLIENT_SECRET')
         redirect_uri = os.getenv('SPOTIFY_REDIRECT_URI')
@@ -167,27 +491,56 @@ class SpotifyToYouTubeTransfer:
                 "SPOTIFY_CLIENT_SECRET, and SPOTIFY_REDIRECT_URI in .env file"
             )
         
+        cache_handler = None
+        if self.data_dir:
+            from security_manager import spotify_cache_handler
+            token_file = self.data_dir / 'spotify_token.enc'
+            cache_handler = spotify_cache_handler(token_file)
+            
+            # Without a usable token spotipy would prompt for the redirect URL
+            # with input() - from a worker thread, reading the job stream
+            token = cache_handler.get_cached_token()
+            if token is None or not set(SPOTIFY_SCOPE.split()) <= set(token.get('scope', '').split()):
+                print(f"\n❌ Token do Spotify ausente ou inválido: {token_file}")
+                print(f"\n🔐 Execute primeiro:")
+                print(f"  python3 account_worker.py --enroll {self.data_dir.name}")
+                sys.exit(1)
+        
         auth_manager = SpotifyOAuth(
             client_id=client_id,
             client_secret=client_secret,
             redirect_uri=redirect_uri,
-            scope='playlist-read-private playlist-read-collaborative'
+            scope=SPOTIFY_SCOPE,
+            cache_handler=cache_handler,
+            open_browser=self.data_dir is None
         )
         
-        return spotipy.Spotify(auth_manager=auth_manager)
+        # Retries are handled by the shared limiter (Retry-After aware), not urllib3
+        return spotipy.Spotify(auth_manager=auth_manager, retries=0, status_retries=0)
     
     def _authenticate_youtube(self):
         """Authenticate with YouTube Music API using secure OAuth with auto-refresh"""
-        token_file = 'youtube_token.enc'
+        token_file = self._data_path('youtube_token.enc') or 'youtube_token.enc'
         
         if not os.path.exists(token_file):
-            print(f"\n❌ Token criptografado não encontrado!")
+            print(f"\n❌ Token criptografado não encontrado: {token_file}")
             print(f"\n🔐 Execute primeiro:")
-            print(f"  python3 setup_youtube_oauth.py")
+            if self.data_dir:
+                print(f"  python3 account_worker.py --enroll {self.data_dir.name}")
+            else:
+                print(f"  python3 setup_youtube_oauth.py")
             sys.exit(1)
         
+        # Searches don't depend on the account: fall back to the shared headers
+        headers_file = self._data_path('headers_auth.enc')
+        if not headers_file or not os.path.exists(headers_file):
+            headers_file = 'headers_auth.enc'
+        
         try:
-            return YouTubeOAuthWrapper(token_file)
+            return YouTubeOAuthWrapper(token_file, metrics=self.metrics,
+                                       search_limiter=self.search_limiter,
+                                       write_limiter=self.write_limiter,
+                                       headers_file=headers_file)
         except Exception as e:
             print(f"❌ Erro na autenticação OAuth: {e}")
             print(f"\n🔐 Tente reconfigurar:")
@@ -209,72 +562,236 @@ class SpotifyToYouTubeTransfer:
         
         return playlists
     
-    def get_playlist_tracks(self, playlist_id: str) -> List[Dict]:
-        """Get all tracks from a Spotify playlist"""
-        tracks = []
-        results = self.spotify.playlist_tracks(playlist_id)
+    # Only the fields we use (no album images, available markets, etc.)
+    PLAYLIST_TRACK_FIELDS = ('items(track(id,name,duration_ms,external_ids(isrc),'
+                             'artists(name),album(name))),total')
+    PLAYLIST_PAGE_SIZE = 100
+    
+    def stream_playlist_tracks(self, playlist_id: str) -> Tuple[int, Iterator[Track]]:
+        """
+        Stream tracks from a Spotify playlist
         
-        while results:
-            for item in results['items']:
-                if item['track']:
-                    track = item['track']
-                    tracks.append({
-                        'name': track['name'],
-                        'artist': ', '.join([artist['name'] for artist in track['artists']]),
-                        'album': track['album']['name']
-                    })
-            
-            if results['next']:
-                results = self.spotify.next(results)
-            else:
-                results = None
+        PERFORMANCE:
+        - Requests only the needed fields (much smaller pages)
+        - Prefetches the next page while the current one is consumed
+        - Tracks are yielded as soon as their page arrives
+        
+        Returns:
+            (total items reported by Spotify, track iterator)
+        """
+        def fetch_page(offset: int) -> Dict:
+            start_time = time.perf_counter()
+            page = self.spotify.playlist_tracks(playlist_id, fields=self.PLAYLIST_TRACK_FIELDS,
+                                                limit=self.PLAYLIST_PAGE_SIZE, offset=offset)
+            page['latency_ms'] = round((time.perf_counter() - start_time) * 1000, 1)
+            return page
         
-        return tracks
+        first_page = fetch_page(0)
+        total = first_page['total']
+        
+        def generate(page: Dict) -> Iterator[Track]:
+            # The page is an argument (not a closure variable) so each raw
+            # page can be freed as soon as its tracks have been converted
+            offset = 0
+            with ThreadPoolExecutor(max_workers=1) as prefetcher:
+                while page:
+                    offset += self.PLAYLIST_PAGE_SIZE
+                    next_page = prefetcher.submit(fetch_page, offset) if offset < total else None
+                    
+                    for item in page['items']:
+                        track = item['track']
+                        if track:
+                            event_log.emit('track_fetched', playlist=playlist_id, track=track['id'],
+                                           page_latency_ms=page['latency_ms'])
+                            yield Track.from_spotify(track)
+                    
+                    page = next_page.result() if next_page else None
+        
+        return total, generate(first_page)
+    
+    def get_playlist_tracks(self, playlist_id: str) -> List[Track]:
+        """Get all tracks from a Spotify playlist"""
+        _, tracks = self.stream_playlist_tracks(playlist_id)
+        return list(tracks)
     
-    def search_youtube_track(self, track_name: str, artist: str) -> Optional[str]:
-        """Search for a track on YouTube Music with caching"""
+    def search_youtube_track(self, track_name: str, artist: str, duration_ms: int = None) -> Optional[str]:
+        """
+        Search for a track on YouTube Music with persistent caching
+        
+        The top match_candidates results of one search call are scored
+        (title, artists, duration) and the best one is used if its
+        confidence reaches min_confidence. Otherwise it goes to the
+        review queue and the track is treated as not found.
+        """
         query = f"{track_name} {artist}"
         
-        # Check cache first (avoid repeated searches)
-        cache_key = query.lower().strip()
-        if hasattr(self, '_search_cache') and cache_key in self._search_cache:
-            return self._search_cache[cache_key]
+        # Check cache first (avoid repeated searches, also across runs)
+        found, video_id = self.search_cache.get(query)
+        if found:
+            event_log.emit('cache_hit', source='search', query=query, video_id=video_id)
+            return video_id
         
+        start_time = time.perf_counter()
         try:
-            # Reduce limit from 5 to 1 to save quota (100 units → 100 units, but faster)
-            results = self.ytmusic.search(query, filter='songs', limit=1)
+            # One call, several candidates: same cost as limit=1
+            results = self.ytmusic.search(query, filter='songs', limit=self.match_candidates)
+            track = {'name': track_name, 'artist': artist, 'duration_ms': duration_ms}
+            ranked = rank_candidates(track, results[:self.match_candidates])
+            latency_ms = round((time.perf_counter() - start_time) * 1000, 1)
             
-            if results:
-                video_id = results[0]['videoId']
-                
-                # Cache the result
-                if not hasattr(self, '_search_cache'):
-                    self._search_cache = {}
-                self._search_cache[cache_key] = video_id
-                
-                return video_id
+            if ranked and ranked[0][0] < self.min_confidence:
+                # Not cached: a later run (or better metadata) may do better
+                self.review_queue.add(track, ranked)
+                event_log.emit('search_review', query=query, video_id=ranked[0][1]['videoId'],
+                               score=ranked[0][0], latency_ms=latency_ms)
+                return None
+            
+            video_id = ranked[0][1]['videoId'] if ranked else None
+            event_log.emit('search_hit' if video_id else 'search_miss', query=query,
+                           video_id=video_id, score=ranked[0][0] if ranked else None,
+                           latency_ms=latency_ms)
+            
+            # Cache the result, including "not found"
+            self.search_cache.set(query, video_id)
+            return video_id
             
         except Exception as e:
-            print(f"  ⚠️  Error searching for '{query}': {e}")
+            # Throttled/transient errors were already retried by the wrapper
+            print(f"  ⚠️  Error searching for '{query}': {self._describe_error(e)}")
+            event_log.emit('search_error', query=query, error=self._describe_error(e),
+                           latency_ms=round((time.perf_counter() - start_time) * 1000, 1))
         
         return None
     
-    def create_youtube_playlist(self, title: str, description: str = "") -> str:
+    def resolve_track(self, track: Track) -> Optional[str]:
+        """
+        Find the YouTube Music videoId for a Spotify track
+        
+        ISRC first: a recording resolved before (in any playlist, any run)
+        needs no search call. Otherwise search, and index the ISRC.
+        """
+        isrc = track.isrc
+        if isrc:
+            video_id = self.search_cache.get_isrc(isrc)
+            if video_id:
+                event_log.emit('cache_hit', source='isrc', isrc=isrc, video_id=video_id)
+                return video_id
+        
+        video_id = self.search_youtube_track(track.name, track.artist, track.duration_ms)
+        if video_id and isrc:
+            self.search_cache.set_isrc(isrc, video_id)
+        return video_id
+    
+    @property
+    def search_pool(self) -> ThreadPoolExecutor:
+        """Search workers shared by every playlist being transferred"""
+        if self._search_pool is None:
+            self._search_pool = ThreadPoolExecutor(max_workers=self.search_workers,
+                                                   thread_name_prefix='search')
+        return self._search_pool
+    
+    def close(self) -> None:
+        """Stop the search workers and save the quota ledger (clients are dropped)"""
+        if self._search_pool is not None:
+            self._search_pool.shutdown(wait=True)
+            self._search_pool = None
+        self.quota_ledger.save()
+        self._spotify = None
+        self._ytmusic = None
+
+    def search_tracks(self, tracks: Iterable[Track],
+                      on_result: Callable[[int, Optional[str]], None] = None,
+                      total: int = None) -> List[Optional[str]]:
+        """
+        Resolve tracks concurrently, keeping playlist order
+        
+        Up to search_workers searches are in flight at once (shared pool,
+        also across parallel playlists), paced by the shared rate limiter.
+        tracks may be a lazy iterator (e.g. streamed
+        from Spotify): searches start as soon as the first tracks arrive.
+        Progress is printed in playlist order and on_result(position,
+        video_id) is called for each track in order.
+        """
+        total = len(tracks) if total is None else total
+        window = self.search_workers * 4  # Bounded read-ahead
+        
+        video_ids = []
+        in_flight = deque()
+        
+        def collect_next() -> None:
+            track, future = in_flight.popleft()
+            video_id = future.result()
+            video_ids.append(video_id)
+            status = " ✓" if video_id else " ✗ Not found"
+            print(f"   [{len(video_ids)}/{max(total, len(video_ids))}] "
+                  f"{track.name} - {track.artist}{status}")
+            if on_result:
+                on_result(len(video_ids) - 1, video_id)
+        
+        resolve = self.resolve_track
+        if current_label():
+            resolve = with_label(resolve, current_label())
+        
+        for track in tracks:
+            in_flight.append((track, self.search_pool.submit(resolve, track)))
+            if len(in_flight) >= window:
+                collect_next()
+        while in_flight:
+            collect_next()
+        
+        return video_ids
+    
+    def create_youtube_playlist(self, title: str, description: str = "",
+                                privacy_status: str = "PRIVATE") -> str:
         """Create a new playlist on YouTube Music"""
-        playlist_id = self.ytmusic.create_playlist(
-            title=title,
-            description=description or f"Transferred from Spotify",
-            privacy_status="PRIVATE"
-        )
-        return playlist_id
+        try:
+            return self.ytmusic.create_playlist(
+                title=title,
+                description=description or f"Transferred from Spotify",
+                privacy_status=privacy_status
+            )
+        except QuotaExceededError:
+            self.quota_ledger.mark_exhausted()
+            raise
+    
+    @staticmethod
+    def _describe_error(error: Exception) -> str:
+        """Short, readable description of an API error"""
+        if is_http_error(error):
+            return f"HTTP {error.resp.status}: {error.reason}"
+        return str(error)[:80]
+    
+    @staticmethod
+    def _is_quota_error(error: Exception) -> bool:
+        """True if the API rejected the call because the daily quota is used up"""
+        return classify_error(error) == 'quota'
+    
+    def _budget_allows(self, items: int, cost: int = ADD_COST) -> int:
+        """
+        Items of a batch (of calls costing `cost` units each) the account's
+        quota budget still pays for
+        
+        Only budgets within a project ledger (account_worker.py) are
+        enforced here: the API never rejects a call for exceeding them.
+        """
+        if self.quota_ledger.parent is None:
+            return items
+        return min(items, self.quota_ledger.remaining() // cost)
     
-    def add_tracks_to_youtube_playlist(self, playlist_id: str, video_ids: List[str], batch_size: int = 50) -> int:
+    def _require_budget(self, cost: int = ADD_COST) -> None:
+        """Raise QuotaExceededError when the account budget can't pay for a write"""
+        if not self._budget_allows(1, cost):
+            raise QuotaExceededError("account quota budget used up")
+    
+    def add_tracks_to_youtube_playlist(self, playlist_id: str, video_ids: List[str], batch_size: int = 50,
+                                       on_result: Callable[[int, Optional[Exception]], None] = None) -> int:
         """
         Add tracks to a YouTube Music playlist in batches
         
         QUOTA OPTIMIZATION:
-        - Batch add reduces API calls
-        - Progress saved every batch
+        - Each batch is sent as one HTTP batch request (batch_size inserts)
+        - Failed items are retried and reported individually
+        - Progress saved every batch (on_result(position, error) per item)
         - Can resume on failure
         """
         added_count = 0
@@ -283,40 +800,154 @@ class SpotifyToYouTubeTransfer:
         
         print(f"\n📦 Adding {total} tracks in batches of {batch_size}...")
         
-        for i, video_id in enumerate(video_ids, 1):
+        for start in range(0, total, batch_size):
+            batch = video_ids[start:start + batch_size]
+            allowed = self._budget_allows(len(batch))
+            if allowed < len(batch):
+                print("  🛑 Account quota budget used up - stopping (resume after the Pacific-time reset)")
+                if not allowed:
+                    break
+                batch = batch[:allowed]
+            errors = self._add_batch(playlist_id, batch, range(start, start + len(batch)), on_result)
+            added_count += errors.count(None)
+            failed_count += len(errors) - errors.count(None)
+            
+            percentage = (added_count / total) * 100
+            print(f"   ✅ Progress: {added_count}/{total} tracks ({percentage:.1f}%)")
+            
+            if len(batch) < batch_size and start + len(batch) < total:
+                break  # Cut by the budget
+            if any(error is not None and self._is_quota_error(error) for error in errors):
+                self.quota_ledger.mark_exhausted()
+                print("  🛑 Daily quota exhausted - stopping (resume after the Pacific-time reset)")
+                break
+        
+        if failed_count:
+            print(f"  ⚠️  {failed_count} tracks could not be added")
+        
+        return added_count
+    
+    def _add_batch(self, playlist_id: str, video_ids: List[str], positions: Iterable[int],
+                   on_result: Callable[[int, Optional[Exception]], None] = None) -> List[Optional[Exception]]:
+        """Insert one batch, reporting each item by its position; returns the per-item errors"""
+        start_time = time.perf_counter()
+        try:
+            errors = self.ytmusic.add_playlist_items(playlist_id, video_ids)
+        except Exception as e:
+            errors = [e] * len(video_ids)
+        batch_latency_ms = round((time.perf_counter() - start_time) * 1000, 1)
+        
+        for position, video_id, error in zip(positions, video_ids, errors):
+            if on_result:
+                on_result(position, error)
+            event_log.emit('add_ok' if error is None else 'add_failed', playlist=playlist_id,
+                           video_id=video_id, position=position,
+                           batch_latency_ms=batch_latency_ms, units=ADD_COST,
+                           error=self._describe_error(error) if error else None)
+            if error is not None:
+                print(f"  ⚠️  Failed to add track {position + 1} ({video_id}): "
+                      f"{self._describe_error(error)}")
+        return errors
+    
+    def _ensure_order(self, journal: TransferJournal, state: Dict) -> bool:
+        """
+        Check that a journal's tracks stand in playlist order on YouTube and
+        move the misplaced ones back
+        
+        Inserts are appended in batches, which the API may apply in any
+        order, and failed tracks are added on a later retry, after their
+        successors. Once every track is in, one listing (1 unit per 50
+        items) finds them; only tracks outside the longest run already in
+        order are moved (50 units each). Items that are not the journal's
+        stay where they are.
+        
+        Returns True when the order is verified (recorded in the journal)
+        """
+        yt_playlist_id = state['yt_playlist_id']
+        resolved = state['resolved']
+        videos = [resolved[i] for i in sorted(state['added'])]
+        wanted = Counter(videos)
+        
+        # Keys by occurrence: two items of the same video are interchangeable
+        seen = Counter()
+        current = []
+        items = {}
+        for item_id, video_id in self.ytmusic.list_playlist_items(yt_playlist_id):
+            if seen[video_id] < wanted[video_id]:
+                key = f"{video_id}#{seen[video_id]}"
+                seen[video_id] += 1
+                items[key] = (item_id, video_id)
+                current.append(key)
+            else:
+                current.append(None)
+        # Tracks removed from YouTube by hand are left out
+        desired = [key for key in occurrence_keys(videos) if key in items]
+        
+        moves = [(key, position) for kind, key, position in plan_sync(current, desired)
+                 if kind == 'move']
+        if moves:
+            print(f"\n↕️  Restoring playlist order: moving {len(moves)} tracks "
+                  f"({len(moves) * ADD_COST:,} units)")
+        for key, position in moves:
+            if not self._budget_allows(1):
+                print("  🛑 Account quota budget used up - order restored on the next run")
+                return False
+            item_id, video_id = items[key]
             try:
-                self.ytmusic.add_playlist_item(playlist_id, video_id)
-                added_count += 1
-                
-                # Show progress every batch or at end
-                if i % batch_size == 0 or i == total:
-                    percentage = (added_count / total) * 100
-                    print(f"   ✅ Progress: {added_count}/{total} tracks ({percentage:.1f}%)")
-                    
+                self.ytmusic.move_playlist_item(item_id, yt_playlist_id, video_id, position)
             except Exception as e:
-                failed_count += 1
-                if failed_count <= 3:  # Only show first 3 errors
-                    print(f"  ⚠️  Failed to add track {i}: {str(e)[:50]}")
+                if self._is_quota_error(e):
+                    self.quota_ledger.mark_exhausted()
+                print(f"  ⚠️  Could not move {video_id}: {self._describe_error(e)} "
+                      f"(order restored on the next run)")
+                return False
         
-        if failed_count > 3:
-            print(f"  ⚠️  {failed_count - 3} more errors occurred...")
+        state['ordered'] = True
+        journal.record_ordered()
+        journal.flush()
+        return True
+    
+    def _finish_journal(self, journal: TransferJournal, state: Dict,
+                        started: float, units_before: int) -> bool:
+        """
+        End a run over a journal: once every found track is added and in
+        order, mark the transfer done. Returns True when it is.
+        """
+        resolved = state['resolved']
+        added = state['added']
+        done = (state['fetch_complete'] and len(resolved) == len(state['tracks'])
+                and all(i in added for i, video_id in resolved.items() if video_id))
+        if done and not state['ordered']:
+            done = self._ensure_order(journal, state)
+        self.quota_ledger.save()
         
-        return added_count
+        if done:
+            journal.complete()
+        else:
+            print(f"   💾 Progress saved to {journal.path} - run with --resume to continue")
+        
+        event_log.emit('playlist_done', playlist=state['spotify_playlist_id'],
+                       yt_playlist=state['yt_playlist_id'], done=done, tracks=len(state['tracks']),
+                       found=sum(1 for video_id in resolved.values() if video_id),
+                       added=len(added), elapsed_s=round(time.perf_counter() - started, 2),
+                       units=self.metrics.total_units() - units_before)
+        return done
     
     def estimate_quota_usage(self, num_tracks: int) -> Dict[str, int]:
         """
         Estimate YouTube API quota usage
         
-        YouTube API Quota Costs:
-        - search: 100 units per call
+        YouTube API Quota Costs (api_metrics.UNIT_COSTS):
+        - search: 0 units (ytmusicapi, not the Data API)
         - playlist.insert (create): 50 units
         - playlistItems.insert (add): 50 units per track
         
-        Daily limit: 10,000 units
+        Daily limit: 10,000 units (QUOTA_DAILY_LIMIT)
         """
-        search_cost = num_tracks * 100  # 100 units per search
-        create_cost = 50  # Create playlist
-        add_cost = num_tracks * 50  # 50 units per track added
+        daily_limit = self.quota_ledger.daily_limit
+        search_cost = num_tracks * SEARCH_COST
+        create_cost = CREATE_COST  # Create playlist
+        add_cost = num_tracks * ADD_COST  # Per track added
         total_cost = search_cost + create_cost + add_cost
         
         return {
@@ -324,93 +955,433 @@ class SpotifyToYouTubeTransfer:
             'create': create_cost,
             'add': add_cost,
             'total': total_cost,
-            'daily_limit': 10000,
-            'remaining': 10000 - total_cost,
-            'percentage': (total_cost / 10000) * 100
+            'daily_limit': daily_limit,
+            'remaining': daily_limit - total_cost,
+            'percentage': (total_cost / daily_limit) * 100
         }
     
-    def transfer_playlist(self, spotify_playlist_id: str, spotify_playlist_name: str, max_tracks: int = None) -> None:
+    def transfer_playlist(self, spotify_playlist_id: str, spotify_playlist_name: str, max_tracks: int = None,
+                          title: str = None, privacy_status: str = "PRIVATE",
+                          yt_playlist_id: str = None) -> bool:
         """
         Transfer a complete playlist from Spotify to YouTube Music
         
         Args:
             spotify_playlist_id: Spotify playlist ID
             spotify_playlist_name: Playlist name
-            max_tracks: Maximum number of tracks to transfer (quota limit)
+            max_tracks: Only transfer the first max_tracks tracks (a limit
+                        from quota_policy instead journals the whole
+                        playlist, so --resume can add the rest)
+            title: YouTube playlist title (default: the Spotify name)
+            privacy_status: PRIVATE, UNLISTED or PUBLIC
+            yt_playlist_id: Add to this existing YouTube playlist instead of
+                            creating one (tracks already in it are skipped)
+        
+        Returns:
+            True when the whole playlist is transferred
         """
         print(f"\n🎵 Transferring playlist: {spotify_playlist_name}")
         print("=" * 60)
         
-        # Get tracks from Spotify
+        # Stream tracks from Spotify (searching starts with the first page)
         print("📥 Fetching tracks from Spotify...")
-        tracks = self.get_playlist_tracks(spotify_playlist_id)
-        print(f"   Found {len(tracks)} tracks")
+        total, tracks = self.stream_playlist_tracks(spotify_playlist_id)
+        print(f"   Found {total} tracks")
+        
+        limit = self._apply_quota_policy(spotify_playlist_id, total, max_tracks)
+        
+        if max_tracks and total > max_tracks:
+            # The caller's limit: the transfer is the first max_tracks tracks
+            print(f"\n⚠️  Limiting transfer to {max_tracks} tracks")
+            tracks = islice(tracks, max_tracks)
+            total = max_tracks
+            limit = None
+        elif limit and total > limit:
+            # Quota slice: the whole playlist is journaled, --resume adds the rest
+            print(f"\n⚠️  Limiting today's transfer to {limit}/{total} tracks (quota protection)")
+        else:
+            limit = None
+        
+        yt_playlist_id, existing = self._open_target(
+            title or spotify_playlist_name, total, privacy_status, yt_playlist_id)
         
-        # Show quota estimation
-        quota = self.estimate_quota_usage(len(tracks))
+        journal = self.journal(spotify_playlist_id)
+        journal.start(spotify_playlist_name, yt_playlist_id, [], total=total, existing=existing)
+        return self.run_journal(journal, journal.load(), limit=limit, incoming=tracks)
+    
+    def _apply_quota_policy(self, spotify_playlist_id: str, total: int,
+                            max_tracks: Optional[int]) -> Optional[int]:
+        """
+        Show the quota estimate and apply quota_policy when the playlist
+        needs more than today's remaining quota
+        
+        Returns the track limit to use (max_tracks if one was given)
+        """
+        quota = self.estimate_quota_usage(total)
         print(f"\n📊 Estimated YouTube API Quota Usage:")
-        print(f"   Search: {quota['search']:,} units ({len(tracks)} tracks × 100)")
+        print(f"   Search: {quota['search']:,} units ({total} tracks × {SEARCH_COST})")
         print(f"   Create playlist: {quota['create']} units")
-        print(f"   Add tracks: {quota['add']:,} units ({len(tracks)} tracks × 50)")
+        print(f"   Add tracks: {quota['add']:,} units ({total} tracks × {ADD_COST})")
         print(f"   ─────────────────────────")
         print(f"   TOTAL: {quota['total']:,} units ({quota['percentage']:.1f}% of daily limit)")
         
-        if quota['total'] > 10000:
-            print(f"   ⚠️  WARNING: Exceeds daily quota limit!")
-            max_safe = (10000 - 50) // 150  # (limit - create) / (search + add)
-            print(f"   💡 Recommendation: Transfer max {max_safe} tracks per day")
+        remaining = self.quota_ledger.remaining()
+        if quota['total'] > remaining:
+            print(f"   ⚠️  WARNING: Exceeds today's remaining quota ({remaining:,} units)!")
+            max_safe = max(0, (remaining - CREATE_COST) // (SEARCH_COST + ADD_COST))
+            print(f"   💡 Recommendation: Transfer max {max_safe} tracks today")
+            print(f"   💡 Or spread it across days: --schedule {spotify_playlist_id}")
             
             if max_tracks is None:
-                response = input(f"\n   Limit to {max_safe} tracks? (s/n): ").strip().lower()
-                if response in ['s', 'sim', 'yes', 'y']:
+                if self.quota_policy == 'fail':
+                    raise QuotaExceededError(f"needs ~{quota['total']:,} units, "
+                                             f"{remaining:,} left today")
+                if self.quota_policy == 'limit':
+                    if max_safe == 0:
+                        raise QuotaExceededError("no quota left today")
                     max_tracks = max_safe
+                elif self.quota_policy == 'ask':
+                    response = input(f"\n   Limit to {max_safe} tracks? (s/n): ").strip().lower()
+                    if response in ['s', 'sim', 'yes', 'y']:
+                        max_tracks = max_safe
         
-        # Limit tracks if needed
-        if max_tracks and len(tracks) > max_tracks:
-            print(f"\n⚠️  Limiting transfer to {max_tracks} tracks (quota protection)")
-            tracks = tracks[:max_tracks]
+        return max_tracks
+    
+    def _open_target(self, title: str, track_count: int, privacy_status: str = "PRIVATE",
+                     yt_playlist_id: str = None) -> Tuple[str, List[str]]:
+        """
+        Create the YouTube Music playlist, or list the existing target
         
-        # Create YouTube Music playlist
+        Returns (playlist ID, videoIds already in it)
+        """
+        if yt_playlist_id:
+            print(f"\n📤 Adding to existing YouTube Music playlist {yt_playlist_id}...")
+            existing = [video_id for _, video_id in self.ytmusic.list_playlist_items(yt_playlist_id)]
+            print(f"   {len(existing)} items already in it")
+            return yt_playlist_id, existing
+        
+        # No empty playlist when not even its first track can be added
+        self._require_budget(CREATE_COST + ADD_COST)
         print(f"\n📤 Creating YouTube Music playlist...")
         yt_playlist_id = self.create_youtube_playlist(
-            title=spotify_playlist_name,
-            description=f"Transferred from Spotify - {len(tracks)} tracks"
+            title=title,
+            description=f"Transferred from Spotify - {track_count} tracks",
+            privacy_status=privacy_status
         )
         print(f"   Created playlist ID: {yt_playlist_id}")
+        return yt_playlist_id, []
+    
+    def start_journal(self, journal: TransferJournal, spotify_playlist_id: str,
+                      spotify_playlist_name: str, tracks: List[Track] = None,
+                      title: str = None, privacy_status: str = "PRIVATE",
+                      yt_playlist_id: str = None) -> Dict:
+        """
+        Create (or open) the YouTube Music playlist and start a transfer journal
         
-        # Search and add tracks
-        print("\n🔍 Searching for tracks on YouTube Music...")
-        video_ids = []
-        found_count = 0
+        Returns the initial transfer state (see TransferJournal.load)
+        """
+        if tracks is None:
+            print(f"\n📥 Fetching tracks from Spotify: {spotify_playlist_name}")
+            tracks = self.get_playlist_tracks(spotify_playlist_id)
+            print(f"   Found {len(tracks)} tracks")
         
-        for i, track in enumerate(tracks, 1):
-            print(f"   [{i}/{len(tracks)}] {track['name']} - {track['artist']}", end="")
-            video_id = self.search_youtube_track(track['name'], track['artist'])
-            
-            if video_id:
-                video_ids.append(video_id)
-                found_count += 1
-                print(" ✓")
-            else:
-                print(" ✗ Not found")
+        yt_playlist_id, existing = self._open_target(
+            title or spotify_playlist_name, len(tracks), privacy_status, yt_playlist_id)
+        
+        journal.start(spotify_playlist_name, yt_playlist_id, tracks, existing=existing)
+        return journal.load()
+    
+    @staticmethod
+    def _track_key(track: Track) -> str:
+        """Identity of a track across playlists (local files have no Spotify ID)"""
+        return track.id or f"local:{track.name}|{track.artist}"
+    
+    def _quota_slices(self, plan: List[Tuple[Dict, List[Track]]], remaining: int) -> Dict[str, int]:
+        """
+        Tracks of each planned playlist that fit in the remaining quota
+        
+        The budget goes to the playlists in order, each paying for its new
+        target playlist and then as many tracks as fit (as _apply_quota_policy
+        does for one playlist); 0 means the playlist is not started today.
+        """
+        limits = {}
+        for playlist, tracks in plan:
+            create = 0 if playlist.get('target') else CREATE_COST
+            fits = max(0, (remaining - create) // (SEARCH_COST + ADD_COST))
+            limits[playlist['id']] = min(len(tracks), fits)
+            if limits[playlist['id']]:
+                remaining -= create + limits[playlist['id']] * (SEARCH_COST + ADD_COST)
+        return limits
+    
+    def transfer_playlists(self, playlists: List[Dict], parallel: int = None) -> Dict[str, object]:
+        """
+        Transfer several playlists, resolving each unique track only once
+        
+        Each playlist is a dict with 'id' and 'name' and optionally
+        'max_tracks', 'title', 'privacy' and 'target' (existing YouTube
+        playlist ID), as in batch job files.
+        
+        Planning phase: fetch every playlist first and build a global table
+        of unique tracks keyed by Spotify track ID. The table is resolved in
+        one concurrent pass, then each playlist is assembled from it.
+        
+        With parallel > 1 several playlists are fetched and written at once
+        over the shared, rate-limited search and write limiters. Output is
+        prefixed per playlist and one playlist failing does not stop others.
+        
+        Returns:
+            {playlist ID: True (done), False (unfinished) or the exception}
+        """
+        parallel = parallel or self.playlist_workers
+        failures: Dict[str, Exception] = {}
+        results: Dict[str, object] = {}
+        
+        print(f"\n🗺️  Planning transfer of {len(playlists)} playlists...")
+        plan = []
+        unique: Dict[str, Track] = {}
+        
+        with ThreadPoolExecutor(max_workers=parallel) as pool:
+            fetches = [(playlist, pool.submit(self.get_playlist_tracks, playlist['id']))
+                       for playlist in playlists]
+            for playlist, future in fetches:
+                try:
+                    tracks = future.result()
+                except Exception as e:
+                    print(f"   ❌ Could not fetch '{playlist['name']}': {e}")
+                    failures[playlist['name']] = e
+                    results[playlist['id']] = e
+                    continue
+                if playlist.get('max_tracks'):
+                    tracks = tracks[:playlist['max_tracks']]
+                plan.append((playlist, tracks))
+        
+        total = sum(len(tracks) for _, tracks in plan)
+        quota = self.estimate_quota_usage(total)
+        add_units = quota['add'] + quota['create'] * sum(1 for playlist, _ in plan
+                                                         if not playlist.get('target'))
+        remaining = self.quota_ledger.remaining()
+        limits = {playlist['id']: len(tracks) for playlist, tracks in plan}
+        if add_units > remaining:
+            print(f"   ⚠️  WARNING: Adding needs ~{add_units:,} units, {remaining:,} left today")
+            print(f"   💡 Stopped transfers can be continued with --resume (or use --schedule all)")
+            if self.quota_policy == 'fail':
+                raise QuotaExceededError(f"needs ~{add_units:,} units, {remaining:,} left today")
+            slices = self._quota_slices(plan, remaining)
+            if self.quota_policy == 'limit':
+                limits = slices
+            elif self.quota_policy == 'ask':
+                fits = sum(slices.values())
+                print(f"   💡 Recommendation: Transfer {fits} of {total} tracks today")
+                response = input(f"\n   Limit to {fits} tracks? (s/n): ").strip().lower()
+                if response in ['s', 'sim', 'yes', 'y']:
+                    limits = slices
+            for playlist, tracks in plan:
+                if 0 < limits[playlist['id']] < len(tracks):
+                    print(f"   ⚠️  Limiting transfer of '{playlist['name']}' to "
+                          f"{limits[playlist['id']]}/{len(tracks)} tracks (quota protection)")
         
-        # Add all found tracks to the playlist
-        if video_ids:
-            print(f"\n➕ Adding {len(video_ids)} tracks to YouTube Music playlist...")
-            added_count = self.add_tracks_to_youtube_playlist(yt_playlist_id, video_ids)
+        # Playlists nothing fits for today are not started (no empty target playlists)
+        for playlist, tracks in plan:
+            if limits[playlist['id']] == 0 and tracks:
+                print(f"   🛑 Not started today: {playlist['name']} (no quota left)")
+                results[playlist['id']] = QuotaExceededError("no quota left today")
+        plan = [(playlist, tracks) for playlist, tracks in plan if playlist['id'] not in results]
+        
+        for playlist, tracks in plan:
+            for track in tracks[:limits[playlist['id']]]:
+                unique.setdefault(self._track_key(track), track)
+        
+        total = sum(limits[playlist['id']] for playlist, _ in plan)
+        print(f"   {total} tracks, {len(unique)} unique "
+              f"({total - len(unique)} shared between playlists, searched once)")
+        
+        print(f"\n🔍 Resolving {len(unique)} unique tracks ({self.search_workers} workers)...")
+        keys = list(unique)
+        resolved = dict(zip(keys, self.search_tracks([unique[key] for key in keys])))
+        
+        def assemble(playlist: Dict, tracks: List[Track]) -> bool:
+            self._require_budget()  # Stop the job once the account budget is used up
+            print(f"\n🎵 Transferring playlist: {playlist['name']}")
+            print("=" * 60)
+            journal = self.journal(playlist['id'])
+            state = self.start_journal(journal, playlist['id'], playlist['name'], tracks,
+                                       title=playlist.get('title'),
+                                       privacy_status=playlist.get('privacy', 'PRIVATE'),
+                                       yt_playlist_id=playlist.get('target'))
+            
+            # Tracks past the quota slice stay unresolved in the journal (--resume)
+            limit = limits[playlist['id']]
+            for index, track in enumerate(tracks[:limit]):
+                video_id = resolved[self._track_key(track)]
+                state['resolved'][index] = video_id
+                journal.record_resolved(index, video_id)
+            journal.flush()
             
-            if added_count > 0:
-                print(f"\n✅ Successfully added {added_count}/{len(video_ids)} tracks to the playlist!")
+            return self.run_journal(journal, state, limit=limit)
+        
+        if parallel > 1:
+            print(f"\n🚀 Writing {len(plan)} playlists, {parallel} at a time...")
+        
+        with prefixed_stdout() if parallel > 1 else nullcontext():
+            with ThreadPoolExecutor(max_workers=parallel) as pool:
+                futures = {
+                    pool.submit(with_label(assemble, playlist['name'][:24]), playlist, tracks): playlist
+                    for playlist, tracks in plan
+                }
+                for future in as_completed(futures):
+                    playlist = futures[future]
+                    try:
+                        results[playlist['id']] = future.result()
+                    except QuotaExceededError as e:
+                        print(f"🛑 Playlist '{playlist['name']}' stopped: {e}")
+                        results[playlist['id']] = e
+                    except Exception as e:
+                        print(f"❌ Playlist '{playlist['name']}' failed: {e}")
+                        failures[playlist['name']] = e
+                        results[playlist['id']] = e
+        
+        if failures:
+            print(f"\n⚠️  {len(failures)}/{len(playlists)} playlists failed:")
+            for name, error in failures.items():
+                print(f"   - {name}: {str(error)[:80]}")
+            print("   💡 Run with --resume to retry the ones that started")
+        
+        return results
+    
+    def _complete_fetch(self, journal: TransferJournal, state: Dict) -> None:
+        """Finish a track fetch that was interrupted mid-stream"""
+        print("📥 Track list incomplete in journal, fetching the rest from Spotify...")
+        tracks = self.get_playlist_tracks(state['spotify_playlist_id'])[:state['total']]
+        for track in tracks[len(state['tracks']):]:
+            state['tracks'].append(track)
+            journal.record_track(track)
+        journal.record_fetched()
+        journal.flush()
+        state['fetch_complete'] = True
+    
+    def run_journal(self, journal: TransferJournal, state: Dict, limit: int = None,
+                    incoming: Iterator[Track] = None) -> bool:
+        """
+        Search and add the tracks a journal has not completed yet
+        
+        Fetch, search and write overlap: a writer thread adds tracks in
+        playlist order while later tracks are still being searched.
+        
+        Args:
+            state: Transfer state from TransferJournal.load (updated in place)
+            limit: Only work on the first `limit` tracks (quota slice)
+            incoming: Tracks still being streamed from Spotify; each one is
+                      journaled and (within limit) searched as it arrives
+        
+        Returns:
+            True when the whole playlist is transferred
+        """
+        tracks = state['tracks']
+        resolved = state['resolved']
+        units_before = self.metrics.total_units()
+        started = time.perf_counter()
+        
+        if incoming is None and not state['fetch_complete']:
+            self._complete_fetch(journal, state)
+        cap = limit
+        limit = len(tracks) if cap is None else min(cap, len(tracks))
+        
+        # Search tracks not resolved yet (known ones first, then streamed ones)
+        pending = [i for i in range(limit) if i not in resolved]
+        to_search = len(pending)
+        if incoming is not None:
+            streamed = state['total'] if cap is None else min(cap, state['total'])
+            to_search += max(0, streamed - len(tracks))
+        
+        def pending_tracks() -> Iterator[Track]:
+            for i in list(pending):
+                yield tracks[i]
+            if incoming is not None:
+                for track in incoming:
+                    index = len(tracks)
+                    tracks.append(track)
+                    journal.record_track(track)
+                    # Past the quota slice tracks are only journaled (searched on --resume)
+                    if cap is None or index < cap:
+                        pending.append(index)
+                        yield track
+                journal.record_fetched()
+                state['fetch_complete'] = True
+        
+        # Pipeline: resolved tracks go (in playlist order) to the writer
+        # thread, so adding starts with the first search results
+        writer = PlaylistWriter(self, journal, state)
+        progress = {'released': 0}
+        
+        def release(until: int) -> None:
+            """Hand resolved tracks before index `until` to the writer, in order"""
+            for i in range(progress['released'], until):
+                video_id = resolved.get(i)
+                if video_id:
+                    writer.submit(i, video_id)
+            progress['released'] = max(progress['released'], until)
+        
+        try:
+            if to_search > 0:
+                print(f"\n🔍 Searching for tracks on YouTube Music ({self.search_workers} workers, "
+                      f"adding as they are found)...")
                 
-                # Show final quota usage
-                actual_quota = self.estimate_quota_usage(added_count)
-                print(f"\n📊 Actual Quota Used: {actual_quota['total']:,} units")
-            else:
-                print(f"\n❌ Failed to add tracks to the playlist")
+                def on_resolved(position: int, video_id: Optional[str]) -> None:
+                    resolved[pending[position]] = video_id
+                    journal.record_resolved(pending[position], video_id)
+                    release(pending[position] + 1)
+                
+                self.search_tracks(pending_tracks(), on_result=on_resolved, total=to_search)
+                if incoming is not None:
+                    limit = len(tracks) if cap is None else min(cap, len(tracks))
+            release(limit)
+        finally:
+            writer.close()
+        
+        if writer.added > 0:
+            print(f"\n✅ Successfully added {writer.added}/{writer.queued} tracks to the playlist!")
+            
+            # Show measured quota usage
+            print(f"\n📊 Actual Quota Used: {self.metrics.total_units() - units_before:,} units")
+        elif writer.queued:
+            print(f"\n❌ Failed to add tracks to the playlist")
+        elif any(resolved.values()):
+            print("\n✅ All found tracks are already in the playlist")
         else:
             print("\n❌ No tracks found on YouTube Music")
         
+        done = self._finish_journal(journal, state, started, units_before)
         print("\n" + "=" * 60)
+        return done
+    
+    def resume_transfer(self, journal: TransferJournal) -> bool:
+        """Resume an interrupted transfer from its journal (no re-listing, no re-searching)"""
+        self._require_budget()
+        state = journal.load()
+        
+        print(f"\n🔁 Resuming playlist: {state['playlist_name']}")
+        print("=" * 60)
+        print(f"   {len(state['resolved'])}/{len(state['tracks'])} tracks searched, "
+              f"{len(state['added'])} already added")
+        
+        return self.run_journal(journal, state)
+    
+    def pending_journals(self) -> List[TransferJournal]:
+        """Journals of unfinished transfers, oldest first"""
+        return TransferJournal.pending(self._data_path('journals'))
+    
+    def resume_transfers(self) -> None:
+        """Resume every unfinished transfer journal, oldest first"""
+        journals = self.pending_journals()
+        
+        if not journals:
+            print("✅ No interrupted transfers to resume")
+            return
+        
+        for journal in journals:
+            self.resume_transfer(journal)
+        
+        self.print_run_summary()
     
     def interactive_transfer(self) -> None:
         """Interactive mode to select and transfer playlists"""
@@ -447,8 +1418,7 @@ class SpotifyToYouTubeTransfer:
         if choice == 'all':
             confirm = input(f"\n⚠️  Transfer all {len(playlists)} playlists? (yes/no): ").strip().lower()
             if confirm == 'yes':
-                for playlist in playlists:
-                    self.transfer_playlist(playlist['id'], playlist['name'])
+                self.transfer_playlists(playlists)
             else:
                 print("❌ Transfer cancelled")
         else:
@@ -461,13 +1431,385 @@ class SpotifyToYouTubeTransfer:
                     print("❌ Invalid playlist number!")
             except ValueError:
                 print("❌ Invalid input!")
+        
+        self.print_run_summary()
+    
+    def print_run_summary(self, report_path: str = None) -> None:
+        """Print cache and API usage for this run and write the JSON metrics report"""
+        self.search_cache.print_summary()
+        if self.review_queue.count:
+            print(f"🔎 {self.review_queue.count} low-confidence matches queued for review "
+                  f"in {self.review_queue.path}")
+        self.metrics.print_summary()
+        
+        report_path = (report_path or self._data_path('metrics_report.json')
+                       or os.getenv('METRICS_REPORT', 'metrics_report.json'))
+        extra = {
+            'search_cache': {
+                'hits': self.search_cache.hits,
+                'misses': self.search_cache.misses,
+                'hit_rate': round(self.search_cache.hit_rate, 1)
+            },
+            'quota_spent_today': self.quota_ledger.spent()
+        }
+        self.metrics.write_report(report_path, extra=extra)
+        event_log.emit('run_summary', **self.metrics.summary(), **extra)
+        print(f"   📝 Metrics report: {report_path}")
+    
+    def schedule_transfers(self, playlist_ids: List[str]) -> None:
+        """
+        Queue playlists and transfer them unattended across days
+        
+        Args:
+            playlist_ids: Spotify playlist IDs, or ['all'] for every playlist.
+                          Empty list runs the existing queue.
+        """
+        scheduler = QuotaScheduler(self)
+        
+        if playlist_ids == ['all']:
+            for playlist in self.get_spotify_playlists():
+                scheduler.enqueue(playlist['id'], playlist['name'])
+        else:
+            for playlist_id in playlist_ids:
+                playlist = self.spotify.playlist(playlist_id, fields='name')
+                scheduler.enqueue(playlist_id, playlist['name'])
+        
+        scheduler.run()
+        self.print_run_summary()
+    
+    def sync_playlists(self, playlist_ids: List[str]) -> Dict[str, object]:
+        """
+        Incrementally sync playlists to YouTube Music
+        
+        Playlists whose Spotify snapshot_id is unchanged since the last sync
+        are skipped (the playlist listing already carries snapshot_id, so a
+        nightly sync of an unchanged library costs only that listing).
+        
+        Args:
+            playlist_ids: Spotify playlist IDs; empty list syncs every playlist
+        
+        Returns:
+            {playlist ID: True (in sync), False (first transfer unfinished)
+            or the exception}; playlists not reached after the quota ran
+            out are missing
+        """
+        store = SyncStore(self._data_path('sync_state.json'))
+        
+        if playlist_ids:
+            playlists = [self.spotify.playlist(playlist_id, fields='id,name,snapshot_id')
+                         for playlist_id in playlist_ids]
+        else:
+            print("\n📋 Fetching your Spotify playlists...")
+            playlists = self.get_spotify_playlists()
+        
+        unchanged = 0
+        failures = []
+        results: Dict[str, object] = {}
+        for playlist in playlists:
+            state = store.get(playlist['id'])
+            if state and state['snapshot_id'] == playlist['snapshot_id']:
+                unchanged += 1
+                results[playlist['id']] = True
+                continue
+            
+            try:
+                results[playlist['id']] = self.sync_playlist(store, playlist)
+            except QuotaExceededError as e:
+                if self._budget_allows(1):
+                    self.quota_ledger.mark_exhausted()  # The API's quotaExceeded, not the account budget
+                results[playlist['id']] = e
+                print("  🛑 Daily quota exhausted - run --sync again after the Pacific-time reset")
+                break
+            except Exception as e:
+                print(f"  ❌ Sync failed for '{playlist['name']}': {self._describe_error(e)}")
+                failures.append(playlist['name'])
+                results[playlist['id']] = e
+        
+        print(f"\n🔄 Sync finished: {unchanged}/{len(playlists)} playlists unchanged")
+        if failures:
+            print(f"   ⚠️  Failed: {', '.join(failures)}")
+        self.print_run_summary()
+        return results
+    
+    def sync_playlist(self, store: SyncStore, playlist: Dict) -> bool:
+        """
+        Apply the changes of one Spotify playlist to its YouTube playlist
+        
+        Only new tracks are searched, and only the deletes, inserts and
+        moves computed by plan_sync are sent. Progress is stored after
+        every call; the new snapshot_id only once all changes are applied.
+        Returns False if the playlist's first transfer is not finished yet.
+        """
+        print(f"\n🔄 Syncing playlist: {playlist['name']}")
+        print("=" * 60)
+        
+        state = store.get(playlist['id']) or self._adopt_playlist(playlist)
+        if state is None:
+            return False
+        
+        tracks = self.get_playlist_tracks(playlist['id'])
+        keys = occurrence_keys([self._track_key(track) for track in tracks])
+        items = state['items']
+        entries = {item['key']: item for item in items if item['key']}
+        video_ids = {key: item['video_id'] for key, item in entries.items()}
+        
+        new = [(key, track) for key, track in zip(keys, tracks) if key not in video_ids]
+        if new:
+            print(f"\n🔍 Searching {len(new)} new tracks...")
+            found = self.search_tracks([track for _, track in new], total=len(new))
+            video_ids.update(zip([key for key, _ in new], found))
+        
+        desired = [key for key in keys if video_ids.get(key)]
+        operations = plan_sync([item['key'] for item in items], desired)
+        counts = {kind: sum(1 for op in operations if op[0] == kind)
+                  for kind in ('insert', 'delete', 'move')}
+        print(f"   ➕ {counts['insert']} to add, ➖ {counts['delete']} to remove, "
+              f"↕️  {counts['move']} to move ({len(operations) * ADD_COST:,} units)")
+        
+        try:
+            for kind, key, position in operations:
+                self._require_budget()
+                if kind == 'delete':
+                    entry = entries.pop(key)
+                    try:
+                        self.ytmusic.delete_playlist_item(entry['item_id'])
+                    except Exception as e:
+                        if not (is_http_error(e) and e.resp.status == 404):
+                            raise  # 404: already removed on YouTube
+                    items.remove(entry)
+                elif kind == 'insert':
+                    response = self.ytmusic.add_playlist_item(
+                        state['yt_playlist_id'], video_ids[key], position)
+                    entry = {'key': key, 'video_id': video_ids[key], 'item_id': response['id']}
+                    entries[key] = entry
+                    items.insert(position, entry)
+                else:
+                    entry = entries[key]
+                    self.ytmusic.move_playlist_item(
+                        entry['item_id'], state['yt_playlist_id'], entry['video_id'], position)
+                    items.remove(entry)
+                    items.insert(position, entry)
+            
+            state['snapshot_id'] = playlist['snapshot_id']
+            print("   ✅ Up to date")
+            return True
+        finally:
+            state['name'] = playlist['name']
+            store.put(playlist['id'], state)
+    
+    def _adopt_playlist(self, playlist: Dict) -> Optional[Dict]:
+        """
+        First sync of a playlist: transfer it (or reuse its finished
+        transfer journal) and map the journal's tracks to the items of the
+        YouTube playlist. Returns the initial sync state, or None if the
+        transfer did not finish yet.
+        """
+        journal = self.journal(playlist['id'])
+        if journal.exists():
+            state = journal.load()
+        else:
+            state = self.start_journal(journal, playlist['id'], playlist['name'])
+        
+        if not state['done'] and not self.run_journal(journal, state):
+            print("   ⏸️  Transfer not finished - it will be synced once complete")
+            return None
+        
+        # Match journal tracks to playlist items by videoId, in order
+        item_ids = defaultdict(deque)
+        yt_items = self.ytmusic.list_playlist_items(state['yt_playlist_id'])
+        for item_id, video_id in yt_items:
+            item_ids[video_id].append(item_id)
+        
+        keys = occurrence_keys([self._track_key(track) for track in state['tracks']])
+        key_of = {}
+        for index, key in enumerate(keys):
+            video_id = state['resolved'].get(index)
+            if video_id and item_ids[video_id]:
+                key_of[item_ids[video_id].popleft()] = key
+        
+        return {
+            'name': playlist['name'],
+            'snapshot_id': None,
+            'yt_playlist_id': state['yt_playlist_id'],
+            'items': [{'key': key_of.get(item_id), 'video_id': video_id, 'item_id': item_id}
+                      for item_id, video_id in yt_items]
+        }
+
+
+class PlaylistWriter:
+    """
+    Writer thread of one journaled transfer (run_journal and AsyncTransfer)
+    
+    Resolved tracks are submitted in playlist order and appended in HTTP
+    batches of up to BATCH_LIMIT, or whatever arrived within WRITE_LINGER
+    of a batch's first track. The queue is bounded, so a writer that falls
+    behind holds the searches back instead of letting them pile up.
+    
+    Writing stops when the account budget is used up, on quotaExceeded, or
+    on an unexpected error (re-raised by close()); tracks submitted after
+    that are drained and left for --resume. The order of the added tracks
+    is checked once the transfer is complete (_finish_journal).
+    """
+    
+    def __init__(self, transfer: SpotifyToYouTubeTransfer, journal: TransferJournal, state: Dict):
+        self.transfer = transfer
+        self.journal = journal
+        self.state = state
+        self.queued = 0
+        self.added = 0
+        self.error: Optional[Exception] = None
+        self._existing = Counter(state['existing'])
+        self._queue = queue.Queue(maxsize=transfer.WRITE_QUEUE_SIZE)
+        self._stopped = False
+        
+        label = current_label()
+        self._thread = threading.Thread(target=with_label(self._run, label) if label else self._run,
+                                        name='playlist-writer', daemon=True)
+        self._thread.start()
+    
+    def submit(self, index: int, video_id: str) -> None:
+        """Hand over a resolved track (blocks while the queue is full)"""
+        added = self.state['added']
+        if self._existing[video_id] > 0:
+            # Already in an existing target playlist: count as added, don't insert again
+            # (matched in track order, so every run pairs the same tracks)
+            self._existing[video_id] -= 1
+            if index not in added:
+                added.add(index)
+                self.state['ordered'] = False
+                self.journal.record_added(index)
+        elif index not in added:
+            self.queued += 1
+            self._queue.put((index, video_id))
+    
+    def close(self) -> None:
+        """Wait for the submitted tracks to be written; re-raises a writer error"""
+        self._queue.put(None)
+        self._thread.join()
+        self.journal.flush()
+        if self.error is not None:
+            raise self.error
+    
+    def _batches(self) -> Iterator[List[Tuple[int, str]]]:
+        """Batches from the queue (closed with None)"""
+        batch_size = YouTubeOAuthWrapper.BATCH_LIMIT
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.transfer.WRITE_LINGER
+            while len(batch) < batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    yield batch
+                    return
+                batch.append(item)
+            yield batch
+    
+    def _on_result(self, index: int, error: Optional[Exception]) -> None:
+        if error is None:
+            self.state['added'].add(index)
+            self.state['failed'].pop(index, None)
+            self.state['ordered'] = False
+            self.journal.record_added(index)
+        else:
+            kind = classify_error(error)
+            self.state['failed'][index] = kind
+            self.journal.record_failed(index, self.transfer._describe_error(error), kind)
+    
+    def _run(self) -> None:
+        transfer = self.transfer
+        for batch in self._batches():
+            if self._stopped:
+                continue  # Keep draining so the searches never block on a full queue
+            allowed = transfer._budget_allows(len(batch))
+            if allowed < len(batch):
+                print("  🛑 Account quota budget used up - stopping (resume after the Pacific-time reset)")
+                self._stopped = True
+                batch = batch[:allowed]
+                if not batch:
+                    continue
+            try:
+                errors = transfer._add_batch(self.state['yt_playlist_id'],
+                                             [video_id for _, video_id in batch],
+                                             [index for index, _ in batch], on_result=self._on_result)
+                self.journal.flush()
+            except Exception as e:
+                self.error = e
+                self._stopped = True
+                continue
+            self.added += errors.count(None)
+            print(f"   ✅ Added {self.added}/{self.queued} tracks found so far")
+            if any(error is not None and transfer._is_quota_error(error) for error in errors):
+                transfer.quota_ledger.mark_exhausted()
+                print("  🛑 Daily quota exhausted - stopping (resume after the Pacific-time reset)")
+                self._stopped = True
+
+
+def run_job(path: str) -> int:
+    """Run a batch job file headlessly and return the exit status"""
+    from batch_jobs import BatchJob, JobError, EXIT_ERROR, EXIT_INVALID_JOB
+    
+    try:
+        job = BatchJob.load(path)
+    except JobError as e:
+        print(f"❌ Invalid job file: {e}")
+        return EXIT_INVALID_JOB
+    
+    try:
+        transfer = SpotifyToYouTubeTransfer(**job.transfer_options())
+        return job.run(transfer)
+    except KeyboardInterrupt:
+        print("\n\n👋 Transfer cancelled")
+        return EXIT_ERROR
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        return EXIT_ERROR
 
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="Transfer playlists from Spotify to YouTube Music")
+    parser.add_argument('--resume', action='store_true',
+                        help="resume interrupted transfers from their journals")
+    parser.add_argument('--schedule', nargs='*', metavar='PLAYLIST_ID',
+                        help="queue playlists ('all' for every playlist) and transfer them "
+                             "unattended within the daily quota; no IDs runs the existing queue")
+    parser.add_argument('--sync', nargs='*', metavar='PLAYLIST_ID',
+                        help="incrementally sync playlists (no IDs: every playlist); "
+                             "unchanged playlists are skipped")
+    parser.add_argument('--job', metavar='FILE',
+                        help="run a batch job file (JSON/YAML) without prompts; "
+                             "exit status: 0 done, 2 invalid job, 3 partial, 4 quota exhausted")
+    parser.add_argument('--output', choices=('text', 'json'), default='text',
+                        help="json: JSON-lines events on stdout, progress text on stderr")
+    parser.add_argument('--parallel', type=int, metavar='N',
+                        help="transfer up to N playlists at once in 'all' mode (env: PLAYLIST_WORKERS)")
+    args = parser.parse_args()
+    
+    with event_log.json_output() if args.output == 'json' else nullcontext():
+        run(args)
+
+
+def run(args: argparse.Namespace) -> None:
+    """Dispatch the parsed command line"""
+    if args.job:
+        sys.exit(run_job(args.job))
+    
     try:
-        transfer = SpotifyToYouTubeTransfer()
-        transfer.interactive_transfer()
+        transfer = SpotifyToYouTubeTransfer(playlist_workers=args.parallel)
+        if args.schedule is not None:
+            transfer.schedule_transfers(args.schedule)
+        elif args.sync is not None:
+            transfer.sync_playlists(args.sync)
+        elif args.resume:
+            transfer.resume_transfers()
+        else:
+            transfer.interactive_transfer()
     except KeyboardInterrupt:
         print("\n\n👋 Transfer cancelled by user")
         sys.exit(0)
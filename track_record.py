@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Track Record
+Compact in-memory representation of a Spotify track
+
+A playlist of 100k tracks used to be 100k dicts (plus the raw Spotify
+items they came from). Track uses __slots__ (no per-instance __dict__) and
+interns the artist and album strings, which repeat a lot in real
+libraries, so each distinct artist/album is stored once.
+
+Track still supports read access like the dicts it replaces
+(track['name'], track.get('isrc'), dict(track)), and to_dict() is what
+the transfer journal writes, so journals stay compatible.
+"""
+
+from sys import intern
+from typing import Dict, Iterator, Optional, Any
+
+
+class Track:
+    """One Spotify track: id, name, artist (joined), album, isrc, duration_ms"""
+
+    __slots__ = ('id', 'name', 'artist', 'album', 'isrc', 'duration_ms')
+
+    def __init__(self, id: Optional[str], name: str, artist: str, album: str = None,
+                 isrc: str = None, duration_ms: int = None):
+        self.id = id
+        self.name = name
+        self.artist = intern(artist) if artist else artist
+        self.album = intern(album) if album else album
+        self.isrc = isrc
+        self.duration_ms = duration_ms
+
+    @classmethod
+    def from_spotify(cls, track: Dict[str, Any]) -> 'Track':
+        """Build from a Spotify API track object (local files have no ID)"""
+        return cls(
+            track['id'],
+            track['name'],
+            ', '.join([artist['name'] for artist in track['artists']]),
+            (track.get('album') or {}).get('name'),
+            (track.get('external_ids') or {}).get('isrc'),
+            track.get('duration_ms')
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Track':
+        """Build from a dict as written by to_dict() (or older journals)"""
+        return cls(data.get('id'), data['name'], data['artist'], data.get('album'),
+                   data.get('isrc'), data.get('duration_ms'))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    # Read-only mapping access, for code written against dict tracks
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def keys(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"Track({self.id!r}, {self.name!r}, {self.artist!r})"
+
+
+def encode(value: Any) -> Dict[str, Any]:
+    """json.dumps default= hook: Track → dict, one at a time while encoding"""
+    if isinstance(value, Track):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Transfer Journal
+Durable, append-only record of a playlist transfer used to resume it
+
+Each transfer writes journals/<spotify_playlist_id>.jsonl, one JSON record
+per line:
+- start:    playlist name, target YouTube playlist ID and the track list
+            (or the expected track count when tracks are streamed in), plus
+            the videoIds already in the target when it existed before
+- track:    a streamed track, appended to the track list
+- fetched:  all streamed tracks have been recorded
+- resolved: search result for a track (videoId or null for "not found")
+- added:    track was inserted into the YouTube playlist
+- failed:   insert failed, with the error and its kind (rate_limiter.classify_error:
+            'fatal' failures are permanent, the others clear up on a retry)
+- ordered:  the added tracks were checked to stand in playlist order
+            (any later 'added' record needs a new check)
+- done:     transfer finished
+
+Records are buffered and flushed (with fsync) in batches, so a crash loses
+at most one batch and the resumed run redoes only that. Records may be
+appended from several threads (searches and the pipelined writer).
+"""
+
+import os
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+import track_record
+from track_record import Track
+
+
+class TransferJournal:
+    """Append-only JSON Lines journal for one playlist transfer"""
+
+    DEFAULT_DIR = "journals"
+    FLUSH_EVERY = 25  # records per fsync
+
+    def __init__(self, spotify_playlist_id: str, directory: str = None,
+                 flush_every: int = FLUSH_EVERY):
+        self.spotify_playlist_id = spotify_playlist_id
+        self.directory = Path(directory or os.getenv('JOURNAL_DIR', self.DEFAULT_DIR))
+        self.path = self.directory / f"{spotify_playlist_id}.jsonl"
+        self.flush_every = flush_every
+        self._buffer: List[str] = []
+        self._lock = threading.RLock()
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, default=track_record.encode)
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.flush_every:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write buffered records and fsync them to disk"""
+        with self._lock:
+            if not self._buffer:
+                return
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(self._buffer) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self._buffer = []
+
+    def start(self, playlist_name: str, yt_playlist_id: str, tracks: List[Track],
+              total: int = None, existing: List[str] = None) -> None:
+        """
+        Begin a new journal (replaces any previous one for this playlist)
+
+        If total is given, tracks are streamed in later with record_track()
+        and the fetch is complete once record_fetched() is called.
+        existing: videoIds already in an existing target playlist (not re-added)
+        """
+        self.directory.mkdir(exist_ok=True)
+        self.path.unlink(missing_ok=True)
+        self._buffer = []
+        self._append({
+            'type': 'start',
+            'spotify_playlist_id': self.spotify_playlist_id,
+            'playlist_name': playlist_name,
+            'yt_playlist_id': yt_playlist_id,
+            'tracks': tracks,
+            'total': total,
+            'existing': existing or []
+        })
+        self.flush()
+
+    def record_track(self, track: Track) -> None:
+        self._append({'type': 'track', 'track': track})
+
+    def record_fetched(self) -> None:
+        self._append({'type': 'fetched'})
+
+    def record_resolved(self, index: int, video_id: Optional[str]) -> None:
+        self._append({'type': 'resolved', 'index': index, 'video_id': video_id})
+
+    def record_added(self, index: int) -> None:
+        self._append({'type': 'added', 'index': index})
+
+    def record_failed(self, index: int, error: str, kind: str = 'fatal') -> None:
+        self._append({'type': 'failed', 'index': index, 'error': error, 'kind': kind})
+
+    def record_ordered(self) -> None:
+        self._append({'type': 'ordered'})
+
+    def complete(self) -> None:
+        self._append({'type': 'done'})
+        self.flush()
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Replay the journal into the current transfer state
+
+        Returns dict with spotify_playlist_id, playlist_name, yt_playlist_id,
+        tracks (Track records), total, fetch_complete, resolved ({index: video_id}),
+        added (set of indexes), failed ({index: error kind} of inserts that
+        failed and were not added since), existing (videoIds already in the target),
+        ordered (no track added since the last order check) and done.
+        A truncated last line (crash mid-write) is ignored.
+        """
+        state = {
+            'spotify_playlist_id': self.spotify_playlist_id,
+            'playlist_name': None,
+            'yt_playlist_id': None,
+            'tracks': [],
+            'total': 0,
+            'fetch_complete': True,
+            'resolved': {},
+            'added': set(),
+            'failed': {},
+            'existing': [],
+            'ordered': True,
+            'done': False
+        }
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+
+                kind = record['type']
+                if kind == 'start':
+                    state['playlist_name'] = record['playlist_name']
+                    state['yt_playlist_id'] = record['yt_playlist_id']
+                    state['tracks'] = [Track.from_dict(track) for track in record['tracks']]
+                    state['total'] = record.get('total') or len(state['tracks'])
+                    state['fetch_complete'] = record.get('total') is None
+                    state['existing'] = record.get('existing', [])
+                elif kind == 'track':
+                    state['tracks'].append(Track.from_dict(record['track']))
+                elif kind == 'fetched':
+                    state['fetch_complete'] = True
+                elif kind == 'resolved':
+                    state['resolved'][record['index']] = record['video_id']
+                elif kind == 'added':
+                    state['added'].add(record['index'])
+                    state['failed'].pop(record['index'], None)
+                    state['ordered'] = False
+                elif kind == 'failed':
+                    # Journals written before kinds were recorded: treat as permanent
+                    state['failed'][record['index']] = record.get('kind', 'fatal')
+                elif kind == 'ordered':
+                    state['ordered'] = True
+                elif kind == 'done':
+                    state['done'] = True
+
+        return state
+
+    @classmethod
+    def pending(cls, directory: str = None) -> List['TransferJournal']:
+        """All journals in directory whose transfer has not finished"""
+        directory = Path(directory or os.getenv('JOURNAL_DIR', cls.DEFAULT_DIR))
+        if not directory.exists():
+            return []
+
+        journals = []
+        for path in sorted(directory.glob('*.jsonl'), key=lambda p: p.stat().st_mtime):
+            journal = cls(path.stem, directory=str(directory))
+            if not journal.load()['done']:
+                journals.append(journal)
+        return journals